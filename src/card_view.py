@@ -31,7 +31,7 @@ CardView class
 #
 # -------------------------------------------------------------------------
 import pickle
-import time
+from collections import OrderedDict
 
 # -------------------------------------------------------------------------
 #
@@ -48,7 +48,7 @@ from gi.repository import GObject, Gtk
 from gramps.gen.config import config as global_config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.db.dummydb import DummyDb
-from gramps.gen.errors import WindowActiveError
+from gramps.gen.errors import HandleError, WindowActiveError
 from gramps.gen.utils.db import navigation_label
 from gramps.gui.display import display_url
 
@@ -58,9 +58,14 @@ from gramps.gui.display import display_url
 #
 # -------------------------------------------------------------------------
 from global_navigation import GlobalNavigationView
-from view.common.common_classes import GrampsContext, GrampsState
+from view.common.common_classes import (
+    GrampsContext,
+    GrampsState,
+    PageDependencies,
+)
 from view.common.common_const import PAGE_LABELS
-from view.common.common_utils import get_initial_object
+from view.common.common_prefetch import prefetch_page
+from view.common.common_utils import count_widgets, get_initial_object
 from view.config.config_const import HELP_VIEW
 from view.config.config_profile import ProfileManager
 from view.config.config_templates import (
@@ -68,7 +73,11 @@ from view.config.config_templates import (
     EditTemplateOptions,
     build_templates_panel,
 )
+from view.services.service_cards import CardPoolService
+from view.services.service_changes import ChangeHistoryService
 from view.services.service_images import ImagesService
+from view.services.service_profiler import ProfilerService
+from view.services.service_signals import SignalCoalescerService
 from view.services.service_statistics import StatisticsService
 from view.services.service_windows import WindowService
 from view.actions import action_handler
@@ -76,6 +85,10 @@ from view.views.view_builder import view_builder
 
 _ = glocale.translation.sgettext
 
+# Changed objects above which they are not searched for references to
+# pages, which are then all treated as affected
+REFERENCE_CHECK_LIMIT = 500
+
 
 # -------------------------------------------------------------------------
 #
@@ -113,21 +126,28 @@ class CardView(GlobalNavigationView):
 
         self.current_view = None
         self.current_context = None
+        self.page_cache = OrderedDict()
 
         self.defer_refresh = False
         self.defer_refresh_id = None
         self.config_request = None
         self.additional_uis.append(self.additional_ui)
         dbstate.connect("database-changed", self._handle_db_change)
-        uistate.connect("nameformat-changed", self.build_tree)
-        uistate.connect("placeformat-changed", self.build_tree)
-        uistate.connect("font-changed", self.build_tree)
+        uistate.connect("nameformat-changed", self._reset_pages)
+        uistate.connect("placeformat-changed", self._reset_pages)
+        uistate.connect("font-changed", self._reset_pages)
         self.first_action_group = None
         self.second_action_group = None
         self.second_action_group_sensitive = False
         self.image_service = ImagesService()
+        self.profiler = ProfilerService(self.grstate)
+        self.card_pool = CardPoolService()
+        SignalCoalescerService(self.grstate).connect(
+            "changes-flushed", self.refresh_changes
+        )
         if global_config.get("interface.cardview.enable-statistics-dashboard"):
             StatisticsService(self.grstate)
+            ChangeHistoryService(self.grstate)
 
     def _load_config(self):
         """
@@ -195,27 +215,95 @@ class CardView(GlobalNavigationView):
         Mark current page dirty.
         """
         self.dirty_redraw_trigger = True
+        self.clear_page_cache()
 
     def _connect_db_signals(self):
         """
-        Register the callbacks we need.
+        Register the callbacks we need. Object changes arrive in batches
+        from the signal coalescer.
         """
-        for obj_type in [
-            "person",
-            "family",
-            "event",
-            "place",
-            "source",
-            "citation",
-            "media",
-            "repository",
-            "note",
-            "tag",
-        ]:
-            for suffix in ["-add", "-update", "-delete", "-rebuild"]:
-                key = "%s%s" % (obj_type, suffix)
-                self.callman.add_db_signal(key, self.build_tree)
-        self.callman.add_db_signal("home-person-changed", self.build_tree)
+        self.callman.add_db_signal("home-person-changed", self._reset_pages)
+
+    def refresh_changes(self, changes):
+        """
+        Refresh only the groups on the page that depend on a batch of
+        changed objects. The whole page is rebuilt if the page itself
+        depends on one, if a changed object now refers to the page object as
+        it may belong in a group it was not in before, or if a group can not
+        be refreshed in place because the page layout would change. Cached
+        pages and kept cards that depend on any of them are dropped.
+        """
+        self.grstate.clear_render_cache()
+        dependencies = self.grstate.dependencies
+        if not self.page_cache and not self.active:
+            self.card_pool.clear(self.grstate)
+            self.dirty = True
+            return None
+        referenced = self._get_referenced_handles(changes)
+        self.card_pool.evict(changes, referenced)
+        for (key, entry) in list(self.page_cache.items()):
+            if is_page_affected(entry[0], entry[2], changes, referenced):
+                self._drop_cached_page(key)
+        if not self.active:
+            if (
+                dependencies is None
+                or not self.current_context
+                or is_page_affected(
+                    self.current_context, dependencies, changes, referenced
+                )
+            ):
+                self.dirty = True
+            return None
+        if self.dirty or dependencies is None or not self.current_context:
+            return self._redraw_page()
+        page_handle = self.current_context.primary_obj.obj.handle
+        if referenced is None or page_handle in referenced:
+            return self._redraw_page()
+        refreshes = []
+        for (dummy_obj_type, action, handles) in changes:
+            if action == "rebuild":
+                return self._redraw_page()
+            group_refreshes = dependencies.get_refreshes(handles)
+            if group_refreshes is None:
+                return self._redraw_page()
+            for refresh in group_refreshes:
+                if refresh not in refreshes:
+                    refreshes.append(refresh)
+        for refresh in refreshes:
+            if not refresh():
+                return self._redraw_page()
+        return None
+
+    def _get_referenced_handles(self, changes):
+        """
+        Return the handles referred to by the added and updated objects, or
+        None if there are too many to check.
+        """
+        total = sum(
+            [
+                len(handles)
+                for (dummy_obj_type, action, handles) in changes
+                if action in ["add", "update"]
+            ]
+        )
+        if total > REFERENCE_CHECK_LIMIT:
+            return None
+        referenced = set()
+        for (obj_type, action, handles) in changes:
+            if action not in ["add", "update"]:
+                continue
+            query_method = self.dbstate.db.method(
+                "get_%s_from_handle", obj_type
+            )
+            for handle in handles:
+                try:
+                    obj = query_method(handle)
+                except HandleError:
+                    continue
+                if obj:
+                    references = obj.get_referenced_handles_recursively()
+                    referenced.update([y for (x, y) in references])
+        return referenced
 
     def navigation_type(self):
         """
@@ -247,7 +335,10 @@ class CardView(GlobalNavigationView):
         """
         self._config.load()
         self._config_view.save()
-        if not refresh_only:
+        self.card_pool.clear(self.grstate)
+        if refresh_only:
+            self._config_view.compile()
+        else:
             self._load_config()
         if defer_refresh:
             self._defer_config_refresh()
@@ -299,7 +390,7 @@ class CardView(GlobalNavigationView):
             self.defer_refresh = False
             return True
         self.defer_refresh = False
-        self.build_tree()
+        self._reset_pages()
         if self.defer_refresh_id:
             GObject.source_remove(self.defer_refresh_id)
             self.defer_refresh_id = None
@@ -359,6 +450,7 @@ class CardView(GlobalNavigationView):
         if self.active:
             self.bookmarks.redraw()
         WindowService().close_all_windows()
+        self.clear_page_cache()
         self.current_context = None
         self._init_methods()
         self.history.clear()
@@ -389,10 +481,80 @@ class CardView(GlobalNavigationView):
         else:
             self.change_object(handle)
 
+    def _reset_pages(self, *_dummy_args):
+        """
+        Drop the cached pages and redraw as the display of all pages may
+        have changed.
+        """
+        self.clear_page_cache()
+        self.build_tree()
+
+    def clear_page_cache(self):
+        """
+        Drop all the cached pages and kept cards.
+        """
+        for key in list(self.page_cache):
+            self._drop_cached_page(key)
+        self.card_pool.clear(self.grstate)
+
+    def _drop_cached_page(self, key, recycle=False):
+        """
+        Drop a cached page, or recycle it so its cards may be reused.
+        """
+        (dummy_context, view, dummy_dependencies, dummy_widgets) = (
+            self.page_cache.pop(key)
+        )
+        if recycle:
+            self.card_pool.recycle(view)
+        else:
+            view.destroy()
+
+    def _cache_current_page(self, page_context):
+        """
+        Keep the current page for back and forward navigation, unless it is
+        being replaced by a fresh render of itself or is out of date, then
+        drop the least recently used pages beyond the page and widget
+        budgets.
+        """
+        size = self._config_view.get("display.page-cache-size")
+        dependencies = self.grstate.dependencies
+        if (
+            not size
+            or dependencies is None
+            or not self.current_context
+            or self.current_context.page_location == page_context.page_location
+        ):
+            return
+        children = self.current_view.get_children()
+        if not children:
+            return
+        view = children[0]
+        view.stop_stream()
+        self.current_view.remove(view)
+        self.page_cache[self.current_context.page_location] = (
+            self.current_context,
+            view,
+            dependencies,
+            count_widgets(view),
+        )
+        budget = self._config_view.get("display.page-cache-widgets")
+        while self.page_cache and (
+            len(self.page_cache) > size
+            or sum([entry[3] for entry in self.page_cache.values()]) > budget
+        ):
+            self._drop_cached_page(next(iter(self.page_cache)), recycle=True)
+
     def build_tree(self, *_dummy_args):
         """
         Perform redraw to populate tree.
         """
+        self._redraw_page()
+        WindowService().refresh_all_windows()
+
+    def _redraw_page(self):
+        """
+        Mark the page dirty and redraw it if the view is active.
+        """
         self.dirty = True
         if self.active:
             active_object = self.history.present()
@@ -400,18 +562,16 @@ class CardView(GlobalNavigationView):
                 self.change_object(active_object)
             else:
                 self.change_object(None)
-        WindowService().refresh_all_windows()
 
     def _clear_current_view(self):
         """
         Clear view for object change.
         """
-        list(
-            map(
-                self.current_view.remove,
-                self.current_view.get_children(),
-            )
-        )
+        self.grstate.set_dependencies(None)
+        for view in self.current_view.get_children():
+            view.stop_stream()
+            self.current_view.remove(view)
+            self.card_pool.recycle(view)
         if not self.dbstate.is_open():
             self.uistate.status.pop(self.uistate.status_id)
             self.uistate.status.push(
@@ -464,28 +624,40 @@ class CardView(GlobalNavigationView):
         """
         if page_context.primary_obj.obj_type != self.navigation_type():
             return self.change_category(page_context.primary_obj.obj_type)
-        start = time.time()
-
+        self._cache_current_page(page_context)
+        cached = self.page_cache.pop(page_context.page_location, None)
+        self.profiler.begin_page(page_context, cached=bool(cached))
         self._clear_current_view()
-        view = view_builder(self.grstate, page_context)
+        if cached:
+            (page_context, view, dependencies, dummy_widgets) = cached
+            self.grstate.set_dependencies(dependencies)
+        else:
+            dependencies = PageDependencies()
+            dependencies.record_handle(page_context.primary_obj.obj.handle)
+            self.grstate.set_dependencies(dependencies)
+            started = self.grstate.begin_render()
+            try:
+                if not self._config_view.get("general.render-budget"):
+                    prefetch_page(self.grstate, page_context)
+                view = view_builder(self.grstate, page_context)
+            finally:
+                if started:
+                    self.grstate.end_render()
+            dependencies.close_scope()
         self.current_view.pack_start(view, True, True, 0)
         self.post_render_page()
+        view.start_stream()
 
         if page_context.primary_obj.obj_type != "Tag":
             self.set_bookmarks(page_context.primary_obj.obj_type)
             self.bookmarks.redraw()
             self.uimanager.update_menu()
-            print(
-                "render_page: {} {}".format(
-                    page_context.primary_obj.obj.gramps_id,
-                    time.time() - start,
-                )
-            )
         else:
             self.bookmarks.undisplay()
         self.current_context = page_context
         self._set_status_bar(page_context)
         self.dirty = False
+        self.profiler.end_page()
 
     def _set_status_bar(self, page_context):
         """
@@ -716,3 +888,19 @@ class CardView(GlobalNavigationView):
                     "commit_%s", active.obj_type
                 )
                 commit_method(active.obj, trans)
+
+
+def is_page_affected(page_context, dependencies, changes, referenced):
+    """
+    Check if a page depends on any of a batch of changed objects, or if any
+    of them now refer to the page object. If the referenced handles are not
+    known the page is assumed to be affected.
+    """
+    if referenced is None:
+        return True
+    if page_context.primary_obj.obj.handle in referenced:
+        return True
+    for (dummy_obj_type, action, handles) in changes:
+        if action == "rebuild" or dependencies.get_refreshes(handles) != []:
+            return True
+    return False
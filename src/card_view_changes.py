@@ -46,7 +46,7 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 # -------------------------------------------------------------------------
 from card_view import CardView
 from view.common.common_classes import GrampsContext
-from view.services.service_statistics import StatisticsService
+from view.services.service_changes import ChangeHistoryService
 from view.services.service_windows import WindowService
 from view.views.view_builder import view_builder
 
@@ -72,7 +72,7 @@ class ChangesCardView(CardView):
             uistate,
             nav_group,
         )
-        self.statistics_service = StatisticsService(self.grstate)
+        self.change_service = ChangeHistoryService(self.grstate)
 
     def set_active(self):
         CardView.set_active(self)
@@ -108,7 +108,7 @@ class ChangesCardView(CardView):
         <property name="icon-name">view-refresh</property>
         <property name="action-name">win.ViewRefresh</property>
         <property name="tooltip_text" translatable="yes">"""
-        + """Refresh statistics</property>
+        + """Refresh change history</property>
         <property name="label" translatable="yes">Refresh</property>
         <property name="use-underline">True</property>
       </object>
@@ -138,13 +138,13 @@ class ChangesCardView(CardView):
         Define page specific actions.
         """
         CardView.define_actions(self)
-        self._add_action("ViewRefresh", self.refresh_statistics)
+        self._add_action("ViewRefresh", self.refresh_history)
 
-    def refresh_statistics(self, *_dummy_args):
+    def refresh_history(self, *_dummy_args):
         """
-        Rebuild statistics.
+        Rebuild change history.
         """
-        self.statistics_service.recalculate_data()
+        self.change_service.recalculate_data()
 
     def build_tree(self, *_dummy_args):
         """
@@ -0,0 +1,38 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2021-2022  Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+register(
+    GRAMPLET,
+    id="render_profile",
+    name=_("Card View Render Profile"),
+    description=_(
+        "Shows where the time went in the last pages the card views rendered."
+    ),
+    version="0.9",
+    gramps_target_version="5.1",
+    status=STABLE,
+    fname="render_profile.py",
+    height=300,
+    expand=True,
+    gramplet="RenderProfileGramplet",
+    gramplet_title=_("Render Profile"),
+    authors=["Christopher Horn"],
+    authors_email=["https://gramps-project.org"],
+)
@@ -0,0 +1,180 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Render profile gramplet.
+"""
+
+# ------------------------------------------------------------------------
+#
+# GTK Modules
+#
+# ------------------------------------------------------------------------
+from gi.repository import Gtk
+
+# ------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# ------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.plug import Gramplet
+
+# ------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# ------------------------------------------------------------------------
+from view.services.service_profiler import ProfilerService
+
+_ = glocale.translation.sgettext
+
+CATEGORY_LABELS = {
+    "group": _("Groups"),
+    "card": _("Cards"),
+    "field": _("Fields"),
+    "status": _("Status Indicators"),
+}
+
+
+# ------------------------------------------------------------------------
+#
+# RenderProfileGramplet Class
+#
+# ------------------------------------------------------------------------
+class RenderProfileGramplet(Gramplet):
+    """
+    Shows the recorded page renders, newest first, with the time taken by
+    each group, card class, field and status indicator slowest first.
+    """
+
+    def init(self):
+        """
+        Build the gramplet.
+        """
+        self.profiler = ProfilerService()
+        self.gui.WIDGET = self.build_gui()
+        self.gui.get_container_widget().remove(self.gui.textview)
+        self.gui.get_container_widget().add(self.gui.WIDGET)
+        self.gui.WIDGET.show_all()
+        self.connect(self.profiler, "profile-updated", self.update)
+
+    def build_gui(self):
+        """
+        Build the tree of renders and the buttons.
+        """
+        vbox = Gtk.VBox(spacing=3)
+        self.model = Gtk.TreeStore(str, str, str, str)
+        view = Gtk.TreeView(model=self.model)
+        for (index, title) in enumerate(
+            [_("Page"), _("Count"), _("Milliseconds"), _("Fetches")]
+        ):
+            column = Gtk.TreeViewColumn(
+                title, Gtk.CellRendererText(), text=index
+            )
+            column.set_resizable(True)
+            view.append_column(column)
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.add(view)
+        vbox.pack_start(scrolled, True, True, 0)
+
+        hbox = Gtk.HBox(spacing=3)
+        clear = Gtk.Button(label=_("Clear"))
+        clear.connect("clicked", self.clear_renders)
+        hbox.pack_start(clear, False, False, 0)
+        save = Gtk.Button(label=_("Save as JSON"))
+        save.connect("clicked", self.save_renders)
+        hbox.pack_start(save, False, False, 0)
+        vbox.pack_start(hbox, False, False, 0)
+        return vbox
+
+    def main(self):
+        """
+        Load the recorded renders.
+        """
+        self.model.clear()
+        for render in reversed(self.profiler.get_renders()):
+            label = render["page"]
+            if render["cached"]:
+                label = "%s %s" % (label, _("(cached)"))
+            fetches = _("%s, %s database reads") % (
+                render["fetches"],
+                render["database_reads"],
+            )
+            node = self.model.append(
+                None,
+                [label, "", format_ms(render["duration"]), fetches],
+            )
+            for (category, timings) in render["timings"].items():
+                if not timings:
+                    continue
+                total = sum([item["seconds"] for item in timings.values()])
+                category_node = self.model.append(
+                    node,
+                    [CATEGORY_LABELS[category], "", format_ms(total), ""],
+                )
+                for (name, timing) in sorted(
+                    timings.items(),
+                    key=lambda x: x[1]["seconds"],
+                    reverse=True,
+                ):
+                    self.model.append(
+                        category_node,
+                        [
+                            name,
+                            str(timing["count"]),
+                            format_ms(timing["seconds"]),
+                            "",
+                        ],
+                    )
+
+    def clear_renders(self, *_dummy_args):
+        """
+        Drop the recorded renders.
+        """
+        self.profiler.clear()
+
+    def save_renders(self, *_dummy_args):
+        """
+        Save the recorded renders to a JSON file.
+        """
+        dialog = Gtk.FileChooserDialog(
+            title=_("Save Render Profile"),
+            transient_for=self.uistate.window,
+            action=Gtk.FileChooserAction.SAVE,
+        )
+        dialog.add_buttons(
+            _("_Cancel"),
+            Gtk.ResponseType.CANCEL,
+            _("_Save"),
+            Gtk.ResponseType.OK,
+        )
+        dialog.set_do_overwrite_confirmation(True)
+        dialog.set_current_name("render-profile.json")
+        if dialog.run() == Gtk.ResponseType.OK:
+            self.profiler.dump(dialog.get_filename())
+        dialog.destroy()
+
+
+def format_ms(seconds):
+    """
+    Return a time in seconds formatted as milliseconds.
+    """
+    return "%.1f" % (seconds * 1000)
@@ -51,6 +51,9 @@ _TEMPLATE = (
     ######################################################################
     ("display.max-page-windows", 1),
     ("display.max-group-windows", 1),
+    ("display.page-cache-size", 10),
+    ("display.page-cache-widgets", 30000),
+    ("display.card-pool-size", 100),
     ("display.pin-header", False),
     ("display.focal-object-highlight", False),
     ("display.focal-object-color", ["#bbe68a", "#304918"]),
@@ -81,11 +84,16 @@ _TEMPLATE = (
     ("general.zotero-enabled", True),
     ("general.zotero-enabled-notes", False),
     ("general.references-max-per-group", 200),
+    ("general.signal-latency", 500),
+    ("general.virtual-list-threshold", 100),
+    ("general.render-budget", 10),
+    ("general.render-profiling", False),
     ######################################################################
     ## Dashboard Options
     ######################################################################
     ("dashboard.concurrent-threshold", 50000),
     ("dashboard.summarize-all-events", False),
+    ("dashboard.raw-scan", True),
     ######################################################################
     ## Menu Options
     ######################################################################
@@ -1325,7 +1333,8 @@ _TEMPLATE = (
     ("layout.statistics.scrolled", False),
     (
         "layout.statistics.groups",
-        "stats-person,stats-family,stats-child,stats-association,stats-event,"
+        "stats-person,stats-family,stats-child,stats-birthyear,stats-lifespan,"
+        "stats-marriageage,stats-familysize,stats-association,stats-event,"
         "stats-ldsordperson,stats-ldsordfamily,stats-participant,stats-place,"
         "stats-media,stats-note,stats-tag,stats-bookmark,stats-repository,"
         "stats-source,stats-citation,stats-uncited,stats-privacy",
@@ -1336,6 +1345,14 @@ _TEMPLATE = (
     ("layout.statistics.stats-family.append", True),
     ("layout.statistics.stats-child.visible", True),
     ("layout.statistics.stats-child.append", True),
+    ("layout.statistics.stats-birthyear.visible", True),
+    ("layout.statistics.stats-birthyear.append", True),
+    ("layout.statistics.stats-lifespan.visible", True),
+    ("layout.statistics.stats-lifespan.append", True),
+    ("layout.statistics.stats-marriageage.visible", True),
+    ("layout.statistics.stats-marriageage.append", True),
+    ("layout.statistics.stats-familysize.visible", True),
+    ("layout.statistics.stats-familysize.append", True),
     ("layout.statistics.stats-association.visible", True),
     ("layout.statistics.stats-association.append", False),
     ("layout.statistics.stats-event.visible", True),
@@ -46,7 +46,11 @@ from gramps.gui.utils import open_file_with_default_application
 # ------------------------------------------------------------------------
 from ..common.common_classes import GrampsConfig, GrampsObject, GrampsOptions
 from ..common.common_const import BUTTON_PRIMARY, BUTTON_SECONDARY
-from ..common.common_utils import button_pressed, button_released
+from ..common.common_utils import (
+    button_pressed,
+    button_released,
+    set_style,
+)
 from ..services.service_images import images_service
 from ..cards import MediaRefCard
 
@@ -119,11 +123,7 @@ class MediaBarGroup(Gtk.Box, GrampsConfig):
         """
         card = Gtk.Frame(shadow_type=Gtk.ShadowType.NONE)
         if css:
-            provider = Gtk.CssProvider()
-            provider.load_from_data(css)
-            context = card.get_style_context()
-            context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-            context.add_class("frame")
+            set_style(card, css, extra_class="frame")
 
         if vertical:
             window = Gtk.ScrolledWindow(hexpand=False, vexpand=True)
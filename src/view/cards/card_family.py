@@ -194,8 +194,6 @@ class FamilyCard(PrimaryCard):
         """
         Build full uncompact layout.
         """
-        size_groups = self.groptions.size_groups
-
         if self.groptions.vertical_orientation:
             vcontent.pack_start(self.partner1, True, True, 0)
             vcontent.pack_start(self.eventbox, True, True, 0)
@@ -205,12 +203,10 @@ class FamilyCard(PrimaryCard):
             partners = Gtk.HBox(hexpand=True, spacing=3)
             vcontent.pack_start(partners, True, True, 0)
             group.add_widget(self.partner1)
-            if "partner1" in size_groups:
-                size_groups["partner1"].add_widget(self.partner1)
+            self.add_size_group_widget("partner1", self.partner1)
             partners.pack_start(self.partner1, True, True, 0)
             group.add_widget(self.partner2)
-            if "partner2" in size_groups:
-                size_groups["partner2"].add_widget(self.partner2)
+            self.add_size_group_widget("partner2", self.partner2)
             partners.pack_start(self.partner2, True, True, 0)
             vcontent.pack_start(self.eventbox, True, True, 0)
 
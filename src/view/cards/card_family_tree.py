@@ -58,7 +58,7 @@ from gramps.gui.editors import EditNote
 from .card_generic import GenericCard
 from .card_widgets import CardGrid
 from ..common.common_strings import NONE
-from ..common.common_utils import format_address, TextLink
+from ..common.common_utils import format_address, set_style, TextLink
 
 _ = GRAMPS_LOCALE.translation.sgettext
 
@@ -77,12 +77,25 @@ class FamilyTreeCard(GenericCard):
         GenericCard.__init__(self, grstate, groptions, None)
         self.title = _("Family Tree Summary")
         self.build_layout()
-        grstate.dbstate.db.connect("home-person-changed", self.load_layout)
+        self.db = grstate.dbstate.db
+        self.db_callback_id = self.db.connect(
+            "home-person-changed", self.load_layout
+        )
         self.person_history = self.grstate.uistate.get_history("Person")
-        self.person_history.connect("active-changed", self.load_layout)
+        self.history_callback_id = self.person_history.connect(
+            "active-changed", self.load_layout
+        )
+        self.connect("destroy", self.cb_destroy)
         self.load_layout()
         self.set_css_style()
 
+    def cb_destroy(self, *_dummy_args):
+        """
+        Disconnect from the tree and history so the card can be freed.
+        """
+        self.db.disconnect(self.db_callback_id)
+        self.person_history.disconnect(self.history_callback_id)
+
     def load_layout(self, *args):
         """
         Load the layout.
@@ -206,15 +219,12 @@ class FamilyTreeCard(GenericCard):
         """
         border = self.grstate.config.get("display.border-width")
         color = self.get_color_css()
-        css = "".join(
-            (".frame { border-width: ", str(border), "px; ", color, " }")
+        self.style_class = set_style(
+            self.frame,
+            "border-width: %spx; %s" % (border, color),
+            self.style_class,
+            extra_class="frame",
         )
-        css = css.encode("utf-8")
-        provider = Gtk.CssProvider()
-        provider.load_from_data(css)
-        context = self.frame.get_style_context()
-        context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-        context.add_class("frame")
 
     def build_context_menu(self, _dummy_obj, event):
         """
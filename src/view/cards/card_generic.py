@@ -67,7 +67,11 @@ from ..common.common_const import (
     BUTTON_PRIMARY,
     BUTTON_SECONDARY,
 )
-from ..common.common_utils import button_pressed, button_released
+from ..common.common_utils import (
+    button_pressed,
+    button_released,
+    set_style,
+)
 from ..menus.menu_bookmarks import build_bookmarks_menu
 from ..menus.menu_config import build_config_menu
 from ..menus.menu_templates import build_templates_menu
@@ -95,6 +99,7 @@ class GenericCard(CardView):
         self.focus = None
         self.dnd_drop_targets = []
         self.css = ""
+        self.style_class = None
         self.init_layout()
         self.eventbox.connect("button-press-event", self.cb_button_pressed)
         self.eventbox.connect("button-release-event", self.cb_button_released)
@@ -147,22 +152,20 @@ class GenericCard(CardView):
         color = self.get_color_css()
         self.css = "".join(
             (
-                ".frame { border: solid; border-radius: 5px; border-width: ",
+                "border: solid; border-radius: 5px; border-width: ",
                 str(border),
                 "px; ",
                 color,
-                " }",
             )
-        ).encode("utf-8")
-        provider = Gtk.CssProvider()
-        provider.load_from_data(self.css)
-        context = self.frame.get_style_context()
-        context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-        context.add_class("frame")
+        )
+        style_class = set_style(
+            self.frame, self.css, self.style_class, extra_class="frame"
+        )
         if self.groptions.ref_mode in [2, 4]:
-            context = self.ref_frame.get_style_context()
-            context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-            context.add_class("frame")
+            set_style(
+                self.ref_frame, self.css, self.style_class, extra_class="frame"
+            )
+        self.style_class = style_class
 
     def get_color_css(self):
         """
@@ -176,6 +179,6 @@ class GenericCard(CardView):
 
     def get_css_style(self):
         """
-        Return css style string.
+        Return the css rules for the frame.
         """
         return self.css
@@ -141,10 +141,7 @@ class MediaCard(ReferenceCard):
             self.widgets["body"].pack_start(
                 self.widgets["age"], expand=False, fill=False, padding=0
             )
-            if "age" in self.groptions.size_groups:
-                self.groptions.size_groups["age"].add_widget(
-                    self.widgets["age"]
-                )
+            self.add_size_group_widget("age", self.widgets["age"])
         hcontent = Gtk.HBox(hexpand=False)
         self.widgets["body"].pack_start(
             hcontent, expand=True, fill=True, padding=0
@@ -156,8 +153,7 @@ class MediaCard(ReferenceCard):
             )
 
         fact_block = Gtk.VBox(halign=Gtk.Align.START, hexpand=True)
-        if "data" in self.groptions.size_groups:
-            self.groptions.size_groups["data"].add_widget(fact_block)
+        self.add_size_group_widget("data", fact_block)
         fact_block.pack_start(
             self.widgets["title"], expand=True, fill=True, padding=0
         )
@@ -181,10 +177,7 @@ class MediaCard(ReferenceCard):
         hcontent.pack_start(fact_block, expand=True, fill=True, padding=0)
 
         attribute_block = Gtk.VBox(halign=Gtk.Align.END, hexpand=False)
-        if "attributes" in self.groptions.size_groups:
-            self.groptions.size_groups["attributes"].add_widget(
-                attribute_block
-            )
+        self.add_size_group_widget("attributes", attribute_block)
         attribute_block.pack_start(
             self.widgets["id"], expand=False, fill=False, padding=0
         )
@@ -67,7 +67,11 @@ from ..common.common_const import (
     BUTTON_PRIMARY,
     BUTTON_SECONDARY,
 )
-from ..common.common_utils import button_pressed, button_released
+from ..common.common_utils import (
+    button_pressed,
+    button_released,
+    set_style,
+)
 from ..menus.menu_bookmarks import build_bookmarks_menu
 from ..menus.menu_config import build_config_menu
 from ..menus.menu_templates import build_templates_menu
@@ -96,10 +100,14 @@ class ObjectCard(CardView):
             self.reference = None
         CardView.__init__(self, grstate, groptions)
         self.primary = GrampsObject(primary_obj)
+        grstate.record_dependency(self.primary.obj)
+        if self.reference_base:
+            grstate.record_dependency(self.reference_base.obj)
         self.secondary = None
         self.focus = self.primary
         self.dnd_drop_targets = []
         self.css = ""
+        self.style_class = None
         if not groptions.bar_mode:
             self.init_layout()
         self.eventbox.connect("button-press-event", self.cb_button_pressed)
@@ -401,22 +409,20 @@ class ObjectCard(CardView):
         color = self.get_color_css()
         self.css = "".join(
             (
-                ".frame { border: solid; border-radius: 5px; border-width: ",
+                "border: solid; border-radius: 5px; border-width: ",
                 str(border),
                 "px; ",
                 color,
-                " }",
             )
-        ).encode("utf-8")
-        provider = Gtk.CssProvider()
-        provider.load_from_data(self.css)
-        context = self.frame.get_style_context()
-        context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-        context.add_class("frame")
+        )
+        style_class = set_style(
+            self.frame, self.css, self.style_class, extra_class="frame"
+        )
         if self.groptions.ref_mode in [2, 4]:
-            context = self.ref_frame.get_style_context()
-            context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-            context.add_class("frame")
+            set_style(
+                self.ref_frame, self.css, self.style_class, extra_class="frame"
+            )
+        self.style_class = style_class
 
     def get_color_css(self):
         """
@@ -430,6 +436,6 @@ class ObjectCard(CardView):
 
     def get_css_style(self):
         """
-        Return css style string.
+        Return the css rules for the frame.
         """
         return self.css
@@ -267,9 +267,7 @@ class PersonCard(ReferenceCard):
             )
         )
         if self.groptions.backlink:
-            family = self.grstate.dbstate.db.get_family_from_handle(
-                self.groptions.backlink
-            )
+            family = self.grstate.fetch("Family", self.groptions.backlink)
             add_person_menu_options(
                 self.grstate, context_menu, self.primary, family, self.context
             )
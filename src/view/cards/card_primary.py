@@ -132,8 +132,7 @@ class PrimaryCard(ObjectCard):
         )
         image.load(size, crop)
         self.widgets["image"].add(image)
-        if "image" in self.groptions.size_groups:
-            self.groptions.size_groups["image"].add_widget(image)
+        self.add_size_group_widget("image", image)
 
     def load_grid(self, grid_key, option_prefix, args=None):
         """
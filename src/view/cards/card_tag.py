@@ -46,8 +46,10 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # ------------------------------------------------------------------------
 from ..actions import action_handler
+from ..common.common_utils import set_style
 from ..menus.menu_utils import menu_item, new_menu, show_menu
 from .card_object import ObjectCard
+from .card_utils import get_tag_css
 
 _ = glocale.translation.sgettext
 
@@ -81,20 +83,7 @@ class TagCard(ObjectCard):
         self.widgets["title"].set_spacing(6)
         self.widgets["title"].pack_start(image, False, False, 0)
 
-        css = "".join(
-            (
-                ".image { margin: 0px; padding: 0px; background-image: none; ",
-                "background-color: ",
-                tag.color[:7],
-                "; }",
-            )
-        )
-        css = css.encode("utf-8")
-        provider = Gtk.CssProvider()
-        provider.load_from_data(css)
-        context = image.get_style_context()
-        context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-        context.add_class("image")
+        set_style(image, get_tag_css(tag), extra_class="image")
 
         label = Gtk.Label(use_markup=True, label="<b>%s</b>" % tag.name)
         self.widgets["title"].pack_start(label, False, False, 0)
@@ -125,12 +114,9 @@ class TagCard(ObjectCard):
         """
         border = self.grstate.config.get("display.border-width")
         color = self.get_color_css()
-        css = "".join(
-            (".frame { border-width: ", str(border), "px; ", color, " }")
+        self.style_class = set_style(
+            self.frame,
+            "border-width: %spx; %s" % (border, color),
+            self.style_class,
+            extra_class="frame",
         )
-        css = css.encode("utf-8")
-        provider = Gtk.CssProvider()
-        provider.load_from_data(css)
-        context = self.frame.get_style_context()
-        context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-        context.add_class("frame")
@@ -48,6 +48,7 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 # Plugin Modules
 #
 # ------------------------------------------------------------------------
+from ..common.common_utils import set_style
 from .card_generic import GenericCard
 
 _ = glocale.translation.sgettext
@@ -128,12 +129,9 @@ class TextCard(GenericCard):
         """
         border = self.grstate.config.get("display.border-width")
         color = self.get_color_css()
-        css = "".join(
-            (".frame { border-width: ", str(border), "px; ", color, " }")
+        self.style_class = set_style(
+            self.frame,
+            "border-width: %spx; %s" % (border, color),
+            self.style_class,
+            extra_class="frame",
         )
-        css = css.encode("utf-8")
-        provider = Gtk.CssProvider()
-        provider.load_from_data(css)
-        context = self.frame.get_style_context()
-        context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-        context.add_class("frame")
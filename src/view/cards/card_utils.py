@@ -49,7 +49,12 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 # Plugin Modules
 #
 # ------------------------------------------------------------------------
-from ..common.common_utils import get_bookmarks, pack_icon, prepare_markup
+from ..common.common_utils import (
+    get_bookmarks,
+    pack_icon,
+    prepare_markup,
+    set_style,
+)
 
 _ = glocale.translation.sgettext
 
@@ -60,21 +65,22 @@ def get_tag_icon(tag, size=Gtk.IconSize.SMALL_TOOLBAR):
     """
     icon = Gtk.Image()
     icon.set_from_icon_name("gramps-tag", size)
-    css = "".join(
+    set_style(icon, get_tag_css(tag), extra_class="image")
+    return icon
+
+
+def get_tag_css(tag):
+    """
+    Return the css rules for a colored tag icon.
+    """
+    return "".join(
         (
-            ".image { margin: 0px; padding: 0px; background-image: none; ",
+            "margin: 0px; padding: 0px; background-image: none; ",
             "background-color: ",
             tag.color[:7],
-            "; }",
+            ";",
         )
     )
-    css = css.encode("utf-8")
-    provider = Gtk.CssProvider()
-    provider.load_from_data(css)
-    context = icon.get_style_context()
-    context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-    context.add_class("image")
-    return icon
 
 
 def load_metadata(widget, grstate, groptions, grobject, gramps_id=None):
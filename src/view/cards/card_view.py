@@ -31,6 +31,8 @@ CardView class for managing the card widgets and layout.
 # GTK Modules
 #
 # ------------------------------------------------------------------------
+from functools import wraps
+
 from gi.repository import Gtk
 
 # ------------------------------------------------------------------------
@@ -46,6 +48,7 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # ------------------------------------------------------------------------
 from ..common.common_classes import GrampsConfig
+from ..services.service_profiler import ProfilerService
 from .card_widgets import CardGrid, CardIcons
 
 _ = glocale.translation.sgettext
@@ -61,6 +64,14 @@ class CardView(Gtk.VBox, GrampsConfig):
     A simple class to encapsulate the widget layout for a Gramps card.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        Time the construction of the cards of each class when profiling.
+        """
+        super().__init_subclass__(**kwargs)
+        if "__init__" in cls.__dict__:
+            cls.__init__ = profile_init(cls.__init__)
+
     def __init__(self, grstate, groptions):
         Gtk.VBox.__init__(self, hexpand=True, vexpand=False)
         GrampsConfig.__init__(self, grstate, groptions)
@@ -69,6 +80,7 @@ class CardView(Gtk.VBox, GrampsConfig):
             "body": Gtk.HBox(vexpand=False, hexpand=True, margin=3)
         }
         self.eventbox = Gtk.EventBox()
+        self.size_group_widgets = []
 
         self.ref_frame = None
         self.ref_widgets = {}
@@ -166,8 +178,7 @@ class CardView(Gtk.VBox, GrampsConfig):
             halign=justify, valign=Gtk.Align.START
         )
         ref_body = Gtk.VBox(hexpand=False, halign=justify, margin=3)
-        if "ref" in self.groptions.size_groups:
-            self.groptions.size_groups["ref"].add_widget(ref_body)
+        self.add_size_group_widget("ref", ref_body)
         ref_body.pack_start(self.ref_widgets["id"], False, False, 0)
         ref_body.pack_start(self.ref_widgets["body"], True, True, 0)
         ref_body.pack_end(self.ref_widgets["icons"], False, False, 0)
@@ -190,14 +201,10 @@ class CardView(Gtk.VBox, GrampsConfig):
         ref_body = Gtk.HBox(hexpand=True, margin=3)
 
         ref_widgets["body"] = Gtk.HBox(halign=Gtk.Align.START)
-        if "data" in self.groptions.size_groups:
-            self.groptions.size_groups["data"].add_widget(ref_widgets["body"])
+        self.add_size_group_widget("data", ref_widgets["body"])
         ref_body.pack_start(ref_widgets["body"], True, True, 0)
         attribute_block = Gtk.VBox(hexpand=False)
-        if "attributes" in self.groptions.size_groups:
-            self.groptions.size_groups["attributes"].add_widget(
-                attribute_block
-            )
+        self.add_size_group_widget("attributes", attribute_block)
         attribute_block.pack_start(ref_widgets["id"], False, False, 0)
         attribute_block.pack_end(ref_widgets["icons"], False, False, 0)
         ref_body.pack_end(attribute_block, False, False, 0)
@@ -225,20 +232,17 @@ class CardView(Gtk.VBox, GrampsConfig):
         Construct framework for default layout.
         """
         widgets = self.widgets
-        size_groups = self.groptions.size_groups
 
         if "age" in widgets:
             widgets["body"].pack_start(widgets["age"], False, False, 0)
-            if "age" in size_groups:
-                size_groups["age"].add_widget(widgets["age"])
+            self.add_size_group_widget("age", widgets["age"])
 
         image_mode = self.get_option("image-mode")
         if image_mode and image_mode in [3, 4]:
             widgets["body"].pack_start(widgets["image"], False, False, 3)
 
         fact_block = Gtk.VBox(hexpand=True)
-        if "data" in size_groups:
-            size_groups["data"].add_widget(fact_block)
+        self.add_size_group_widget("data", fact_block)
         widgets["body"].pack_start(fact_block, True, True, 0)
         fact_block.pack_start(widgets["title"], False, False, 0)
         fact_section = Gtk.HBox(hexpand=True, valign=Gtk.Align.START)
@@ -249,11 +253,77 @@ class CardView(Gtk.VBox, GrampsConfig):
         fact_block.pack_end(widgets["icons"], False, False, 0)
 
         attribute_block = Gtk.VBox(halign=Gtk.Align.END, hexpand=False)
-        if "attributes" in size_groups:
-            size_groups["attributes"].add_widget(attribute_block)
+        self.add_size_group_widget("attributes", attribute_block)
         widgets["body"].pack_start(attribute_block, False, False, 0)
         attribute_block.pack_start(widgets["id"], False, False, 0)
         attribute_block.pack_start(widgets["attributes"], True, True, 0)
 
         if image_mode in [1, 2]:
             widgets["body"].pack_end(widgets["image"], False, False, 3)
+
+    def add_size_group_widget(self, key, widget):
+        """
+        Add a widget to a size group of the card options if there is one,
+        remembering it so the card can be moved to another group.
+        """
+        size_groups = self.groptions.size_groups
+        if key in size_groups:
+            size_groups[key].add_widget(widget)
+            self.size_group_widgets.append((key, widget))
+
+    def release_card(self):
+        """
+        Remove the card widgets from the size groups of the group the card
+        was shown in and clear any pointer state, so it can be kept for
+        reuse.
+        """
+        size_groups = self.groptions.size_groups
+        for (key, widget) in self.size_group_widgets:
+            size_groups[key].remove_widget(widget)
+        reset_state(self)
+
+    def rebind_card(self, groptions):
+        """
+        Bind a released card to the options of the group it is reused in.
+        """
+        widgets = self.size_group_widgets
+        self.size_group_widgets = []
+        self.groptions = groptions
+        for (key, widget) in widgets:
+            self.add_size_group_widget(key, widget)
+
+
+def reset_state(widget):
+    """
+    Clear the pointer state left on a widget tree.
+    """
+    widget.unset_state_flags(Gtk.StateFlags.PRELIGHT | Gtk.StateFlags.ACTIVE)
+    if isinstance(widget, Gtk.Container):
+        for child in widget.get_children():
+            reset_state(child)
+
+
+def profile_init(init):
+    """
+    Wrap a card constructor so the time taken to build a card is recorded
+    under its class, less the time taken by any cards built inside it.
+    Constructors of the base classes it calls are not recorded separately.
+    """
+
+    @wraps(init)
+    def profiled_init(self, *args, **kwargs):
+        profiler = getattr(ProfilerService, "instance", None)
+        if (
+            profiler is None
+            or profiler.current is None
+            or type(self).__init__ is not profiled_init
+        ):
+            return init(self, *args, **kwargs)
+        start = profiler.start_nested()
+        try:
+            init(self, *args, **kwargs)
+        finally:
+            profiler.stop_nested(start, "card", type(self).__name__)
+        return None
+
+    return profiled_init
@@ -548,6 +548,97 @@ class GrampsContext:
             self.secondary_obj = GrampsObject(new_secondary_obj)
 
 
+# ------------------------------------------------------------------------
+#
+# PageDependencies Class
+#
+# ------------------------------------------------------------------------
+class PageDependencies:
+    """
+    A simple class to track the handles the parts of a rendered page depend
+    on so a database change need only refresh the groups it affects.
+
+    Handles are recorded while a scope is open, for the page itself while it
+    is rendered and for a group while it is built. The referenced handles of
+    each card object are recorded as well as the handle as they are often
+    shown on the card.
+    """
+
+    __slots__ = ("page", "groups", "scope")
+
+    def __init__(self):
+        self.page = set()
+        self.groups = {}
+        self.scope = self.page
+
+    def record(self, obj):
+        """
+        Record the handle of an object and those it references.
+        """
+        if self.scope is None:
+            return
+        handle = getattr(obj, "handle", None)
+        if handle:
+            self.scope.add(handle)
+        if hasattr(obj, "get_referenced_handles_recursively"):
+            self.scope.update(
+                [y for (x, y) in obj.get_referenced_handles_recursively()]
+            )
+
+    def record_handle(self, handle):
+        """
+        Record an object handle.
+        """
+        if self.scope is not None and handle:
+            self.scope.add(handle)
+
+    def record_handles(self, handles):
+        """
+        Record a set of object handles.
+        """
+        if self.scope is not None:
+            self.scope.update(handles)
+
+    def open_scope(self, scope=None):
+        """
+        Open a new scope for a group, or reopen one to record more handles
+        in, returning the scope it replaces.
+        """
+        previous = self.scope
+        self.scope = set() if scope is None else scope
+        return previous
+
+    def close_scope(self, previous=None):
+        """
+        Close the current scope, restoring the previous one, and return the
+        handles recorded. Nothing is recorded while there is no scope.
+        """
+        handles = self.scope
+        self.scope = previous
+        return handles
+
+    def add_group(self, group, handles, refresh):
+        """
+        Add a group with the handles it depends on and the callable that
+        refreshes it, which returns False if it could not.
+        """
+        self.groups[group] = (handles, refresh)
+
+    def get_refreshes(self, handles):
+        """
+        Return the refresh callables for the groups depending on any of the
+        handles, or None if the page itself depends on one of them.
+        """
+        handles = set(handles)
+        if handles & self.page:
+            return None
+        return [
+            refresh
+            for (group_handles, refresh) in list(self.groups.values())
+            if handles & group_handles
+        ]
+
+
 # ------------------------------------------------------------------------
 #
 # GrampsState Class
@@ -566,6 +657,12 @@ class GrampsState:
         "page_type",
         "methods",
         "templates",
+        "dependencies",
+        "render_cache",
+        "cache_hits",
+        "cache_misses",
+        "fetch_count",
+        "render_generation",
     )
 
     def __init__(self, dbstate, uistate, callbacks, config):
@@ -577,6 +674,12 @@ class GrampsState:
         if callbacks:
             self.methods = callbacks.get("methods")
         self.templates = None
+        self.dependencies = None
+        self.render_cache = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.fetch_count = 0
+        self.render_generation = 0
 
     def set_templates(self, templates):
         """
@@ -596,14 +699,75 @@ class GrampsState:
         """
         self.page_type = page_type
 
-    def fetch(self, obj_type, obj_handle):
+    def set_dependencies(self, dependencies):
         """
-        Fetches an object from the database.
+        Set the dependencies of the page being rendered.
+        """
+        self.dependencies = dependencies
+
+    def record_dependency(self, obj):
         """
+        Record an object the page being rendered depends on.
+        """
+        if self.dependencies is not None:
+            self.dependencies.record(obj)
+
+    def begin_render(self, cache=None):
+        """
+        Start a render pass, during which fetched objects are cached so each
+        is read from the database once. A pass resumed later can pass in
+        the cache it kept. Returns False if a pass was already underway, in
+        which case the caller must not end it.
+        """
+        if self.render_cache is not None:
+            return False
+        self.render_cache = {} if cache is None else cache
+        return True
+
+    def end_render(self):
+        """
+        End a render pass and drop the cached objects.
+        """
+        self.render_cache = None
+
+    def clear_render_cache(self):
+        """
+        Drop the cached objects as they may have changed. Caches kept
+        outside the current pass are stale once the generation changes.
+        """
+        self.render_generation += 1
+        if self.render_cache:
+            self.render_cache.clear()
+
+    def get_cache_statistics(self):
+        """
+        Return the render cache hit and miss counts.
+        """
+        return self.cache_hits, self.cache_misses
+
+    def fetch(self, obj_type, obj_handle):
+        """
+        Fetches an object from the database, or from the render cache if
+        it was already fetched during the current render pass.
+        """
+        self.fetch_count += 1
+        if self.dependencies is not None:
+            self.dependencies.record_handle(obj_handle)
+        cache = self.render_cache
+        if cache is not None:
+            key = (obj_type, obj_handle)
+            obj = cache.get(key)
+            if obj is not None:
+                self.cache_hits += 1
+                return obj
+            self.cache_misses += 1
         try:
-            return self.methods[obj_type](obj_handle)
+            obj = self.methods[obj_type](obj_handle)
         except HandleError:
             return None
+        if cache is not None and obj is not None:
+            cache[key] = obj
+        return obj
 
     def fetch_page_context(self):
         """
@@ -786,13 +950,14 @@ class GrampsConfig:
         Fetches an option in the card configuration name space.
         """
         if key[:5] in ["activ", "group"]:
-            option = key
-        else:
-            option = "%s.%s" % (self.groptions.option_space, key)
-        try:
-            return get_config_option(self.grstate.config, option, full=full)
-        except AttributeError:
-            return False
+            try:
+                return get_config_option(self.grstate.config, key, full=full)
+            except AttributeError:
+                return False
+        options = self.grstate.config.get_space(self.groptions.option_space)
+        if full:
+            return options.get(key, False)
+        return options.get_compound(key)
 
     def get_label(self, data, left=True, italic=False):
         """
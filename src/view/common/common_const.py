@@ -199,6 +199,10 @@ GROUP_LABELS = {
     "stats-person": _("People"),
     "stats-family": _("Families"),
     "stats-child": _("Children"),
+    "stats-birthyear": _("Birth Years"),
+    "stats-lifespan": _("Lifespans"),
+    "stats-marriageage": _("Ages at Marriage"),
+    "stats-familysize": _("Children per Family"),
     "stats-association": _("Associations"),
     "stats-event": _("Events"),
     "stats-ldsordperson": _("Person Ordinances"),
@@ -0,0 +1,294 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Bulk prefetching of the objects a page will show
+
+Most of the objects the groups on a page fetch can be predicted from the
+page object and the configured groups: the families, people, events,
+citations and so on it refers to, and the objects their cards show in turn
+such as spouses, vital events, places and tags. These are collected one
+level at a time and read with a single query per object type and level
+into the render cache, so the scattered lookups made while the cards are
+built are answered without going back to the database.
+
+Batched reads go straight to the tables, so they are only made on the
+SQLite DB-API backend with a schema known to store the objects as pickled
+blobs. Other databases, such as the proxies, are left to the usual
+lookups.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import pickle
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.errors import HandleError
+from gramps.gen.lib import (
+    Citation,
+    Event,
+    Family,
+    Media,
+    Note,
+    Person,
+    Place,
+    Repository,
+    Source,
+    Tag,
+)
+from gramps.plugins.db.dbapi.dbapi import DBAPI
+
+OBJECT_CLASSES = {
+    "Person": Person,
+    "Family": Family,
+    "Event": Event,
+    "Place": Place,
+    "Source": Source,
+    "Citation": Citation,
+    "Repository": Repository,
+    "Media": Media,
+    "Note": Note,
+    "Tag": Tag,
+}
+
+# Levels of objects followed from the page object, for example spouse
+# families, then their children, then the vital events of the children,
+# then the places of those events.
+PREFETCH_DEPTH = 4
+
+# Most objects prefetched for one page
+PREFETCH_LIMIT = 5000
+
+# Most handles in one query, kept under the SQLite variable limit
+BATCH_SIZE = 500
+
+# Schema versions storing the objects as pickled blobs
+BATCH_SCHEMA_VERSIONS = (20,)
+
+# The objects a group shows for the object it belongs to, as the object
+# type, the attribute holding them and whether it holds references.
+GROUP_HANDLES = {
+    "paternal": ("Family", "parent_family_list", False),
+    "maternal": ("Family", "parent_family_list", False),
+    "parent": ("Family", "parent_family_list", False),
+    "spouse": ("Family", "family_list", False),
+    "child": ("Person", "child_ref_list", True),
+    "event": ("Event", "event_ref_list", True),
+    "timeline": ("Event", "event_ref_list", True),
+    "association": ("Person", "person_ref_list", True),
+    "citation": ("Citation", "citation_list", False),
+    "note": ("Note", "note_list", False),
+    "media": ("Media", "media_list", True),
+    "repository": ("Repository", "reporef_list", True),
+}
+
+# The objects the card for an object shows, as for the groups.
+CARD_HANDLES = {
+    "Person": [("Tag", "tag_list", False)],
+    "Family": [
+        ("Person", "father_handle", None),
+        ("Person", "mother_handle", None),
+        ("Person", "child_ref_list", True),
+        ("Event", "event_ref_list", True),
+        ("Tag", "tag_list", False),
+    ],
+    "Event": [("Place", "place", None), ("Tag", "tag_list", False)],
+    "Citation": [
+        ("Source", "source_handle", None),
+        ("Tag", "tag_list", False),
+    ],
+}
+
+
+def get_handles(obj, attribute, is_ref):
+    """
+    Return the handles held in an object attribute. A reference flag of
+    None means the attribute holds a single handle.
+    """
+    value = getattr(obj, attribute, None)
+    if not value:
+        return []
+    if is_ref is None:
+        return [value]
+    if is_ref:
+        return [ref.ref for ref in value]
+    return value
+
+
+def get_card_handles(obj_type, obj):
+    """
+    Return the object types and handles the card for an object shows.
+    """
+    handles = []
+    for (handle_type, attribute, is_ref) in CARD_HANDLES.get(
+        obj_type, [("Tag", "tag_list", False)]
+    ):
+        for handle in get_handles(obj, attribute, is_ref):
+            handles.append((handle_type, handle))
+    if obj_type == "Person":
+        for event_ref in (obj.get_birth_ref(), obj.get_death_ref()):
+            if event_ref:
+                handles.append(("Event", event_ref.ref))
+    return handles
+
+
+def get_prefetch_groups(config, space):
+    """
+    Return the groups that are built when the page is rendered. On a
+    tabbed page only the first one is, the others waiting until shown.
+    """
+    groups = [
+        group
+        for group in config.get("%s.groups" % space).split(",")
+        if config.get("%s.%s.visible" % (space, group))
+    ]
+    if config.get("%s.tabbed" % space):
+        return groups[:1]
+    return groups
+
+
+def can_prefetch(page_context):
+    """
+    Return True if the objects for a page can be planned.
+    """
+    primary = page_context.primary_obj
+    return (
+        primary.obj_type in OBJECT_CLASSES
+        and primary.obj_type != "Tag"
+        and page_context.page_type == primary.obj_type
+    )
+
+
+def plan_page(config, page_context):
+    """
+    Return the object types and handles the page object and the groups on
+    the page refer to directly.
+    """
+    primary = page_context.primary_obj
+    obj_type = primary.obj_type
+    handles = get_card_handles(obj_type, primary.obj)
+    if obj_type == "Person":
+        for handle in primary.obj.parent_family_list:
+            handles.append(("Family", handle))
+    space = "layout.%s" % page_context.page_type.lower()
+    for group in get_prefetch_groups(config, space):
+        if group in GROUP_HANDLES:
+            (handle_type, attribute, is_ref) = GROUP_HANDLES[group]
+            for handle in get_handles(primary.obj, attribute, is_ref):
+                handles.append((handle_type, handle))
+    return handles
+
+
+def can_read_batches(db):
+    """
+    Return True if objects can be read from the database in batches.
+    """
+    return (
+        isinstance(db, DBAPI)
+        and db.__class__.__name__ == "SQLite"
+        and db.get_schema_version() in BATCH_SCHEMA_VERSIONS
+    )
+
+
+def read_objects(db, obj_type, handles, batched=None):
+    """
+    Read the objects for a list of handles in batches if possible, else
+    one at a time.
+    """
+    if batched is None:
+        batched = can_read_batches(db)
+    if not batched:
+        objects = []
+        get_object = db.method("get_%s_from_handle", obj_type)
+        for handle in handles:
+            try:
+                objects.append(get_object(handle))
+            except HandleError:
+                pass
+        return objects
+    obj_class = OBJECT_CLASSES[obj_type]
+    objects = []
+    for index in range(0, len(handles), BATCH_SIZE):
+        batch = handles[index : index + BATCH_SIZE]
+        db.dbapi.execute(
+            "SELECT blob_data FROM %s WHERE handle IN (%s)"
+            % (obj_type.lower(), ",".join(["?"] * len(batch))),
+            batch,
+        )
+        for row in db.dbapi.fetchall():
+            objects.append(obj_class.create(pickle.loads(row[0])))
+    return objects
+
+
+def prefetch_objects(db, handles, cache):
+    """
+    Read the objects for the handles into a cache, and then a level at a
+    time the objects their cards show. Returns the number of objects read.
+    This only touches the database it is given so it may be run in a
+    thread with a connection of its own.
+    """
+    total = 0
+    batched = can_read_batches(db)
+    for dummy_level in range(PREFETCH_DEPTH):
+        wanted = {}
+        for (obj_type, handle) in handles:
+            if handle and (obj_type, handle) not in cache:
+                wanted.setdefault(obj_type, set()).add(handle)
+        handles = []
+        for (obj_type, type_handles) in wanted.items():
+            type_handles = list(type_handles)[: PREFETCH_LIMIT - total]
+            if not type_handles:
+                break
+            total += len(type_handles)
+            for obj in read_objects(
+                db, obj_type, type_handles, batched=batched
+            ):
+                cache[(obj_type, obj.handle)] = obj
+                handles.extend(get_card_handles(obj_type, obj))
+        if not handles or total >= PREFETCH_LIMIT:
+            break
+    return total
+
+
+def prefetch_page(grstate, page_context):
+    """
+    Read the objects a page is expected to show into the render cache.
+    Returns the number of objects read.
+    """
+    cache = grstate.render_cache
+    db = grstate.dbstate.db
+    if (
+        cache is None
+        or not can_read_batches(db)
+        or not can_prefetch(page_context)
+    ):
+        return 0
+    primary = page_context.primary_obj
+    cache[(primary.obj_type, primary.obj.handle)] = primary.obj
+    return prefetch_objects(
+        db, plan_page(grstate.config, page_context), cache
+    )
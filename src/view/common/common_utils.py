@@ -68,6 +68,9 @@ from .timeline import RELATIVES
 
 _ = glocale.translation.sgettext
 
+# Style classes installed for each distinct set of CSS rules
+STYLE_CLASSES = {}
+
 
 # ------------------------------------------------------------------------
 #
@@ -520,6 +523,42 @@ def make_scrollable(widget, hexpand=False, vexpand=True):
     return scroll
 
 
+def replace_widget(old_widget, new_widget):
+    """
+    Replace a widget with another in the same place in its container.
+    """
+    parent = old_widget.get_parent()
+    if isinstance(parent, Gtk.Notebook):
+        page = parent.page_num(old_widget)
+        label = parent.get_tab_label(old_widget)
+        parent.remove_page(page)
+        parent.insert_page(new_widget, label, page)
+    elif isinstance(parent, Gtk.Box):
+        position = parent.child_get_property(old_widget, "position")
+        packing = parent.query_child_packing(old_widget)
+        parent.remove(old_widget)
+        if packing[3] == Gtk.PackType.END:
+            parent.pack_end(new_widget, packing[0], packing[1], packing[2])
+        else:
+            parent.pack_start(new_widget, packing[0], packing[1], packing[2])
+        parent.reorder_child(new_widget, position)
+    elif parent is not None:
+        parent.remove(old_widget)
+        parent.add(new_widget)
+    new_widget.show_all()
+
+
+def count_widgets(widget):
+    """
+    Return the number of widgets in a widget tree.
+    """
+    count = 1
+    if isinstance(widget, Gtk.Container):
+        for child in widget.get_children():
+            count = count + count_widgets(child)
+    return count
+
+
 def set_dnd_css(row, top):
     """
     Set custom CSS for the drag and drop view.
@@ -540,6 +579,44 @@ def set_dnd_css(row, top):
     return provider
 
 
+def get_style_class(rules):
+    """
+    Return the name of a style class applying a set of CSS rules. A single
+    provider is installed on the screen for each distinct set of rules the
+    first time it is asked for, so widgets sharing a style only need the
+    class instead of parsing the same rules with a provider of their own.
+    """
+    style_class = STYLE_CLASSES.get(rules)
+    if style_class is None:
+        style_class = "cardview-style-%s" % len(STYLE_CLASSES)
+        provider = Gtk.CssProvider()
+        provider.load_from_data(
+            (".%s { %s }" % (style_class, rules)).encode("utf-8")
+        )
+        Gtk.StyleContext.add_provider_for_screen(
+            Gdk.Screen.get_default(),
+            provider,
+            Gtk.STYLE_PROVIDER_PRIORITY_USER,
+        )
+        STYLE_CLASSES[rules] = style_class
+    return style_class
+
+
+def set_style(widget, rules, style_class=None, extra_class=None):
+    """
+    Apply a set of CSS rules to a widget, replacing the style class given
+    if one was applied before, and return the style class.
+    """
+    context = widget.get_style_context()
+    if style_class:
+        context.remove_class(style_class)
+    style_class = get_style_class(rules)
+    context.add_class(style_class)
+    if extra_class:
+        context.add_class(extra_class)
+    return style_class
+
+
 def describe_object(db, obj):
     """
     Return description string for a Gramps object.
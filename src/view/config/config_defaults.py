@@ -77,6 +77,9 @@ VIEWDEFAULTS = (
     ######################################################################
     ("display.max-page-windows", 4),
     ("display.max-group-windows", 4),
+    ("display.page-cache-size", 10),
+    ("display.page-cache-widgets", 30000),
+    ("display.card-pool-size", 100),
     ("display.pin-header", True),
     ("display.focal-object-highlight", False),
     ("display.focal-object-color", ["#bbe68a", "#304918"]),
@@ -107,11 +110,16 @@ VIEWDEFAULTS = (
     ("general.zotero-enabled", True),
     ("general.zotero-enabled-notes", False),
     ("general.references-max-per-group", 200),
+    ("general.signal-latency", 500),
+    ("general.virtual-list-threshold", 100),
+    ("general.render-budget", 10),
+    ("general.render-profiling", False),
     ######################################################################
     ## Dashboard Options
     ######################################################################
     ("dashboard.concurrent-threshold", 50000),
     ("dashboard.summarize-all-events", True),
+    ("dashboard.raw-scan", True),
     ######################################################################
     ## Menu Options
     ######################################################################
@@ -1351,7 +1359,8 @@ VIEWDEFAULTS = (
     ("layout.statistics.scrolled", False),
     (
         "layout.statistics.groups",
-        "stats-person,stats-family,stats-child,stats-association,stats-event,"
+        "stats-person,stats-family,stats-child,stats-birthyear,stats-lifespan,"
+        "stats-marriageage,stats-familysize,stats-association,stats-event,"
         "stats-ldsordperson,stats-ldsordfamily,stats-participant,stats-place,"
         "stats-media,stats-note,stats-tag,stats-bookmark,stats-repository,"
         "stats-source,stats-citation,stats-uncited,stats-privacy",
@@ -1362,6 +1371,14 @@ VIEWDEFAULTS = (
     ("layout.statistics.stats-family.append", True),
     ("layout.statistics.stats-child.visible", True),
     ("layout.statistics.stats-child.append", True),
+    ("layout.statistics.stats-birthyear.visible", True),
+    ("layout.statistics.stats-birthyear.append", True),
+    ("layout.statistics.stats-lifespan.visible", True),
+    ("layout.statistics.stats-lifespan.append", True),
+    ("layout.statistics.stats-marriageage.visible", True),
+    ("layout.statistics.stats-marriageage.append", True),
+    ("layout.statistics.stats-familysize.visible", True),
+    ("layout.statistics.stats-familysize.append", True),
     ("layout.statistics.stats-association.visible", True),
     ("layout.statistics.stats-association.append", False),
     ("layout.statistics.stats-event.visible", True),
@@ -111,6 +111,27 @@ def build_display_grid(configdialog, grstate, *_dummy_args):
         "display.max-group-windows",
         (1, 12),
     )
+    configdialog.add_spinner(
+        grid,
+        _("Number of recently viewed pages kept for back and forward"),
+        3,
+        "display.page-cache-size",
+        (0, 50),
+    )
+    configdialog.add_spinner(
+        grid,
+        _("Maximum number of widgets in the recently viewed pages kept"),
+        4,
+        "display.page-cache-widgets",
+        (1000, 500000),
+    )
+    configdialog.add_spinner(
+        grid,
+        _("Number of cards of each kind kept for reuse on later pages"),
+        5,
+        "display.card-pool-size",
+        (0, 1000),
+    )
     configdialog.add_text(grid, _("Display Options"), 10, bold=True)
     configdialog.add_checkbox(
         grid,
@@ -255,6 +276,12 @@ def build_dashboard_grid(configdialog, grstate, *_dummy_args):
         4,
         "dashboard.summarize-all-events",
     )
+    configdialog.add_checkbox(
+        grid,
+        _("Collect data from serialized objects (requires restart)"),
+        5,
+        "dashboard.raw-scan",
+    )
     return add_config_buttons(
         configdialog, grstate, "dashboard", grid, HELP_CONFIG_DASHBOARD
     )
@@ -334,7 +361,7 @@ def build_general_grid(configdialog, grstate, *_dummy_args):
         ),
         21,
         "general.references-max-per-group",
-        (1, 5000),
+        (1, 100000),
     )
     configdialog.add_checkbox(
         grid,
@@ -342,6 +369,43 @@ def build_general_grid(configdialog, grstate, *_dummy_args):
         22,
         "general.enable-warnings",
     )
+    configdialog.add_spinner(
+        grid,
+        _(
+            "Maximum delay in milliseconds before applying database "
+            "changes (requires restart)"
+        ),
+        23,
+        "general.signal-latency",
+        (0, 5000),
+    )
+    configdialog.add_spinner(
+        grid,
+        _(
+            "Number of cards in a group above which only the cards in "
+            "view are built, or 0 to always build all of them"
+        ),
+        24,
+        "general.virtual-list-threshold",
+        (0, 10000),
+    )
+    configdialog.add_spinner(
+        grid,
+        _(
+            "Milliseconds spent building groups between screen updates "
+            "once the page header is shown, or 0 to build the whole page "
+            "at once"
+        ),
+        25,
+        "general.render-budget",
+        (0, 1000),
+    )
+    configdialog.add_checkbox(
+        grid,
+        _("Record render timings for the render profile gramplet"),
+        26,
+        "general.render-profiling",
+    )
     return add_config_buttons(
         configdialog, grstate, "general", grid, HELP_CONFIG_GENERAL
     )
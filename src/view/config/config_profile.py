@@ -42,6 +42,7 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 from ..services.service_templates import TemplatesService
+from .config_snapshot import ConfigSnapshot
 
 _ = glocale.translation.sgettext
 
@@ -98,9 +99,9 @@ class ProfileManager:
 
     def get_active_options(self):
         """
-        Return configuration manager object.
+        Return a compiled snapshot of the active configuration manager.
         """
         self._load_active_template()
         if self.db_options:
-            return self.db_options
-        return self.user_options
+            return ConfigSnapshot(self.db_options)
+        return ConfigSnapshot(self.user_options)
@@ -0,0 +1,191 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+ConfigSnapshot and OptionSpace
+
+Cards and groups read their options many thousands of times while a page
+is built, and each read through the configuration manager splits the key
+and validates the section and setting. The snapshot compiles the active
+options into a flat dictionary once when they are loaded, and hands out
+an option space for each of the card and group name spaces so the keys
+need not be formatted either.
+
+The snapshot stands in for the configuration manager it wraps. Changes
+made through it are written through to the manager and the snapshot, and
+reload_config compiles it afresh to pick up anything changed behind its
+back such as an edited template.
+"""
+
+
+# -------------------------------------------------------------------------
+#
+# OptionSpace Class
+#
+# -------------------------------------------------------------------------
+class OptionSpace:
+    """
+    The compiled options under one option space such as "active.person".
+
+    Options are read by name, as an attribute with the dashes in the name
+    written as underscores, or by a tuple of name parts:
+
+        options["image-mode"]
+        options.image_mode
+        options["event", "visible"]
+    """
+
+    __slots__ = ("space", "options", "compound")
+
+    def __init__(self, space, options):
+        self.space = space
+        self.options = options
+        self.compound = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            key = ".".join([str(part) for part in key])
+        return self.options[key]
+
+    def __getattr__(self, name):
+        try:
+            return self.options[name.replace("_", "-")]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __contains__(self, key):
+        return key in self.options
+
+    def get(self, key, default=None):
+        """
+        Return an option, or the default if not found.
+        """
+        return self.options.get(key, default)
+
+    def get_compound(self, key):
+        """
+        Return the parts of a compound "type:value" option.
+        """
+        try:
+            return self.compound[key]
+        except KeyError:
+            pass
+        value = self.options.get(key)
+        if value:
+            parts = tuple(value.split(":"))
+        else:
+            parts = ("", "")
+        self.compound[key] = parts
+        return parts
+
+
+# -------------------------------------------------------------------------
+#
+# ConfigSnapshot Class
+#
+# -------------------------------------------------------------------------
+class ConfigSnapshot:
+    """
+    A compiled snapshot of a configuration manager. Anything other than
+    reading and writing options is passed on to the manager.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.options = {}
+        self.spaces = {}
+        self.compile()
+
+    def __getattr__(self, name):
+        return getattr(self.config, name)
+
+    def compile(self):
+        """
+        Compile the options from the configuration manager.
+        """
+        config = self.config
+        options = {}
+        for section in config.get_sections():
+            for setting in config.get_section_settings(section):
+                key = "%s.%s" % (section, setting)
+                options[key] = config.get(key)
+        self.options = options
+        self.spaces = {}
+
+    def get(self, key):
+        """
+        Return an option.
+        """
+        try:
+            return self.options[key]
+        except KeyError:
+            return self.config.get(key)
+
+    def get_space(self, space):
+        """
+        Return the options under an option space.
+        """
+        try:
+            return self.spaces[space]
+        except KeyError:
+            pass
+        prefix = "%s." % space
+        start = len(prefix)
+        options = OptionSpace(
+            space,
+            {
+                key[start:]: value
+                for (key, value) in self.options.items()
+                if key.startswith(prefix)
+            },
+        )
+        self.spaces[space] = options
+        return options
+
+    def set(self, key, value):
+        """
+        Set an option, updating the snapshot.
+        """
+        self.config.set(key, value)
+        self.options[key] = self.config.get(key)
+        for space in list(self.spaces):
+            if key.startswith("%s." % space):
+                del self.spaces[space]
+
+    def register(self, key, default):
+        """
+        Register an option, updating the snapshot.
+        """
+        self.config.register(key, default)
+        self.compile()
+
+    def reset(self, key=None):
+        """
+        Reset options to their defaults, updating the snapshot.
+        """
+        self.config.reset(key)
+        self.compile()
+
+    def load(self, filename=None, oldstyle=False):
+        """
+        Load options from a file, updating the snapshot.
+        """
+        self.config.load(filename=filename, oldstyle=oldstyle)
+        self.compile()
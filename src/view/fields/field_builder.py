@@ -28,6 +28,7 @@ User customizable field factory and builder functions.
 #
 # -------------------------------------------------------------------------
 from ..services.service_fields import FieldCalculatorService
+from ..services.service_profiler import ProfilerService
 from .field_base import (
     get_attribute_field,
     get_event_field,
@@ -69,5 +70,11 @@ def field_builder(grstate, obj, field_type, field_value, args):
     if field_value != "None":
         field = field_factory(field_type, field_value)
         if field:
-            return field(grstate, obj, field_value, args)
+            profiler = ProfilerService()
+            start = profiler.start()
+            result = field(grstate, obj, field_value, args)
+            profiler.stop(
+                start, "field", "%s: %s" % (field_type, field_value)
+            )
+            return result
     return []
@@ -44,6 +44,8 @@ from gramps.gen.lib import Family, Person
 # ------------------------------------------------------------------------
 from ..common.common_classes import GrampsOptions
 from ..cards import FamilyCard
+from ..services.service_cards import CardPoolService
+from ..services.service_profiler import ProfilerService
 from .group_children import ChildrenCardGroup
 from .group_const import GENERIC_GROUPS, STATISTICS_GROUPS
 from .group_events import EventsCardGroup
@@ -53,11 +55,28 @@ from .group_statistics import StatisticsCardGroup
 
 _ = glocale.translation.sgettext
 
+# Groups holding a card for each item in a list on the object
+COUNTED_GROUPS = {
+    "address": "address_list",
+    "attribute": "attribute_list",
+    "ldsord": "lds_ord_list",
+}
+
+# Groups holding a card for each item in a list on the object up to a
+# maximum, unless an option changing the items shown is set
+LIMITED_GROUPS = {
+    "citation": ("citation_list", "include-indirect"),
+    "media": ("media_list", "filter-non-photos"),
+    "note": ("note_list", "include-child-objects"),
+}
+
 
 def group_builder(grstate, group_type, obj, args):
     """
     Generate and return group for a given object.
     """
+    profiler = ProfilerService()
+    start = profiler.start()
     if group_type in GENERIC_GROUPS:
         group = build_simple_group(grstate, group_type, obj, args)
     elif group_type in STATISTICS_GROUPS:
@@ -74,9 +93,37 @@ def group_builder(grstate, group_type, obj, args):
         group = get_references_group(grstate, obj, args)
     else:
         group = None
+    profiler.stop(start, "group", group_type)
     return group
 
 
+def get_group_count(grstate, group_type, obj):
+    """
+    Return the number of items a group will hold for an object if it can be
+    found without building the group, otherwise None.
+    """
+    if obj is None:
+        return None
+    if group_type in COUNTED_GROUPS:
+        return len(getattr(obj, COUNTED_GROUPS[group_type], None) or [])
+    if group_type in LIMITED_GROUPS:
+        (list_name, option) = LIMITED_GROUPS[group_type]
+        items = getattr(obj, list_name, None)
+        options = grstate.config.get_space("group.%s" % group_type)
+        if items is None or options[option]:
+            return None
+        return min(len(items), options["max-per-group"])
+    if group_type == "event":
+        if isinstance(obj, Family):
+            return len(obj.event_ref_list)
+        if isinstance(obj, Person):
+            total = len(obj.event_ref_list)
+            for handle in obj.family_list:
+                total += len(grstate.fetch("Family", handle).event_ref_list)
+            return total
+    return None
+
+
 def build_simple_group(grstate, group_type, obj, args):
     """
     Generate and return a simple group for a given object.
@@ -197,7 +244,8 @@ def get_family_unit(grstate, family, args, context="family", relation=None):
     groptions.set_relation(relation)
     if "title" in args and args["title"]:
         groptions.title = args["title"]
-    couple = FamilyCard(
+    couple = CardPoolService().get_card(
+        FamilyCard,
         grstate,
         groptions,
         family,
@@ -210,7 +258,10 @@ def get_family_unit(grstate, family, args, context="family", relation=None):
         person=relation,
     )
     if children and len(children) > 0:
-        couple.pack_start(children, expand=False, fill=False, padding=0)
+        unit = Gtk.VBox(hexpand=True)
+        unit.pack_start(couple, expand=False, fill=True, padding=0)
+        unit.pack_start(children, expand=False, fill=False, padding=0)
+        return unit
     return couple
 
 
@@ -327,18 +378,18 @@ def prepare_reference_items(obj_types, obj_list):
     """
     total = 0
     tuple_list = []
-    handle_cache = []
+    handle_cache = set()
     if not obj_types:
         for item in obj_list:
             if item[1] not in handle_cache:
                 tuple_list.append(item)
-                handle_cache.append(item[1])
+                handle_cache.add(item[1])
                 total = total + 1
     else:
         for obj_type, handle in obj_list:
             if obj_type in obj_types and handle not in handle_cache:
                 tuple_list.append((obj_type, handle))
-                handle_cache.append(handle)
+                handle_cache.add(handle)
                 total = total + 1
     del handle_cache
     tuple_list.sort(key=lambda x: x[0])
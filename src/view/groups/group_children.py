@@ -40,6 +40,7 @@ from gramps.gui.editors import EditChildRef
 #
 # ------------------------------------------------------------------------
 from ..cards import ChildRefCard
+from ..services.service_cards import CardPoolService
 from .group_list import CardGroupList
 
 _ = glocale.translation.sgettext
@@ -67,6 +68,7 @@ class ChildrenCardGroup(CardGroupList):
             grstate.config.get("%s.reference-mode" % groptions.option_space)
         )
 
+        card_pool = CardPoolService()
         child_number = 0
         number_children = self.grstate.config.get(
             "%s.number-children" % groptions.option_space
@@ -75,7 +77,8 @@ class ChildrenCardGroup(CardGroupList):
             if number_children:
                 child_number = child_number + 1
                 groptions.set_number(child_number)
-            profile = ChildRefCard(
+            profile = card_pool.get_card(
+                ChildRefCard,
                 grstate,
                 groptions,
                 family,
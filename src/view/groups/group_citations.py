@@ -22,6 +22,13 @@
 CitationsCardGroup
 """
 
+# ------------------------------------------------------------------------
+#
+# Python Modules
+#
+# ------------------------------------------------------------------------
+from functools import partial
+
 # ------------------------------------------------------------------------
 #
 # Gramps Modules
@@ -70,10 +77,16 @@ class CitationsCardGroup(CardGroupList):
 
             for citation, references, ref_type, ref_desc in citation_list:
                 reference = (references, ref_type, ref_desc)
-                card = CitationCard(
-                    grstate, groptions, citation, reference=reference
+                self.add_card_builder(
+                    partial(
+                        CitationCard,
+                        grstate,
+                        groptions,
+                        citation,
+                        reference=reference,
+                    )
                 )
-                self.add_card(card)
+        self.build_cards()
         self.show_all()
 
     def save_new_object(self, handle, insert_row):
@@ -156,13 +156,17 @@ GENERIC_GROUPS = {
 
 STATISTICS_GROUPS = {
     "stats-association": _("Associations"),
+    "stats-birthyear": _("Birth Years"),
     "stats-bookmark": _("Bookmarks"),
     "stats-child": _("Children"),
     "stats-citation": _("Citations"),
     "stats-event": _("Events"),
     "stats-family": _("Families"),
+    "stats-familysize": _("Children per Family"),
     "stats-ldsordfamily": _("Family Ordinances"),
     "stats-ldsordperson": _("Person Ordinances"),
+    "stats-lifespan": _("Lifespans"),
+    "stats-marriageage": _("Ages at Marriage"),
     "stats-media": _("Media"),
     "stats-note": _("Notes"),
     "stats-participant": _("Participants"),
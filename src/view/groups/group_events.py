@@ -38,6 +38,7 @@ from gramps.gui.editors import EditEventRef
 #
 # ------------------------------------------------------------------------
 from ..cards import EventRefCard
+from ..services.service_cards import CardPoolService
 from .group_list import CardGroupList
 
 _ = glocale.translation.sgettext
@@ -70,8 +71,10 @@ class EventsCardGroup(CardGroupList):
         )
         groptions.set_relation(obj)
 
+        card_pool = CardPoolService()
         for event_ref in obj.event_ref_list:
-            card = EventRefCard(
+            card = card_pool.get_card(
+                EventRefCard,
                 grstate,
                 groptions,
                 obj,
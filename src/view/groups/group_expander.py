@@ -108,3 +108,59 @@ class CardGroupExpander(Gtk.Expander):
                         child.hide()
                     self.hidden = True
         return True
+
+
+# ------------------------------------------------------------------------
+#
+# LazyCardGroup Class
+#
+# ------------------------------------------------------------------------
+class LazyCardGroup(Gtk.VBox):
+    """
+    A placeholder for a group that is built the first time the placeholder
+    is shown, so groups on tabs that are never selected cost nothing, or
+    when the view streaming the groups in gets to it. If the group turns
+    out to be empty the placeholder is hidden, along with the containers
+    it was packed in that hold nothing else shown, up to the one marked
+    as the group container.
+    """
+
+    def __init__(self, builder, count=None, on_map=True):
+        Gtk.VBox.__init__(self, vexpand=False, hexpand=True)
+        self.builder = builder
+        self.count = count
+        self.map_id = None
+        if on_map:
+            self.map_id = self.connect("map", self.build_group)
+
+    def build_group(self, *_dummy_args):
+        """
+        Build the group and add it.
+        """
+        if self.map_id:
+            self.disconnect(self.map_id)
+            self.map_id = None
+        if not self.builder:
+            return
+        group = self.builder()
+        self.builder = None
+        if group:
+            self.pack_start(group, False, False, 0)
+            group.show_all()
+        else:
+            self.hide_empty()
+
+    def hide_empty(self):
+        """
+        Hide the placeholder and the containers left empty without it.
+        """
+        widget = self
+        while widget and not getattr(widget, "group_container", False):
+            widget.hide()
+            widget.set_no_show_all(True)
+            parent = widget.get_parent()
+            if parent is None or any(
+                child.get_visible() for child in parent.get_children()
+            ):
+                break
+            widget = parent
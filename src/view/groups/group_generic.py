@@ -22,6 +22,13 @@
 GenericCardGroup
 """
 
+# ------------------------------------------------------------------------
+#
+# Python Modules
+#
+# ------------------------------------------------------------------------
+from functools import partial
+
 # ------------------------------------------------------------------------
 #
 # GTK Modules
@@ -98,7 +105,15 @@ class GenericCardGroup(CardGroupList):
             group_space = "group.%s" % obj_type.lower()
             group_groptions = GrampsOptions(group_space, size_groups=groups)
             group_groptions.set_age_base(groptions.age_base)
-            obj = self.fetch(obj_type, obj_handle)
-            card = CARD_MAP[obj_type](grstate, group_groptions, obj)
-            self.add_card(card)
+            self.add_card_builder(
+                partial(self.build_card, obj_type, obj_handle, group_groptions)
+            )
+        self.build_cards()
         self.show_all()
+
+    def build_card(self, obj_type, obj_handle, groptions):
+        """
+        Build the card for an object.
+        """
+        obj = self.fetch(obj_type, obj_handle)
+        return CARD_MAP[obj_type](self.grstate, groptions, obj)
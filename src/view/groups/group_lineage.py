@@ -36,6 +36,7 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 # ------------------------------------------------------------------------
 from ..common.common_classes import GrampsOptions
 from ..cards import FamilyCard
+from ..services.service_cards import CardPoolService
 from .group_list import CardGroupList
 
 _ = glocale.translation.sgettext
@@ -75,8 +76,10 @@ class PaternalLineageCardGroup(CardGroupList):
         """
         Render lineage with family cards.
         """
+        card_pool = CardPoolService()
         for family in families:
-            couple_widget = FamilyCard(
+            couple_widget = card_pool.get_card(
+                FamilyCard,
                 self.grstate,
                 groptions,
                 family,
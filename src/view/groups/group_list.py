@@ -34,7 +34,7 @@ import pickle
 # GTK Modules
 #
 # ------------------------------------------------------------------------
-from gi.repository import Gdk, Gtk
+from gi.repository import Gdk, GLib, Gtk
 
 # ------------------------------------------------------------------------
 #
@@ -44,6 +44,15 @@ from gi.repository import Gdk, Gtk
 from ..common.common_classes import GrampsConfig, GrampsObject
 from ..common.common_utils import set_dnd_css
 from ..cards.card_object import ObjectCard
+from ..services.service_cards import CardPoolService
+
+# Cards built or released together in a virtualized list
+VIRTUAL_BLOCK_SIZE = 20
+# Estimated card height used until some cards have been measured
+VIRTUAL_CARD_HEIGHT = 64
+# Blocks are built within a page of the viewport and released beyond three
+VIRTUAL_BUILD_MARGIN = 1
+VIRTUAL_RELEASE_MARGIN = 3
 
 
 # ------------------------------------------------------------------------
@@ -68,6 +77,14 @@ class CardGroupList(Gtk.ListBox, GrampsConfig):
         self.row_current = 0
         self.row_previous_provider = None
         self.row_current_provider = None
+        self.card_builders = []
+        self.virtual_blocks = []
+        self.virtual_total = 0
+        self.virtual_height = VIRTUAL_CARD_HEIGHT
+        self.virtual_scroll = None
+        self.virtual_update_id = None
+        self.virtual_scope = None
+        self.enable_drop = enable_drop
         if enable_drop:
             self.connect("drag-data-received", self.on_drag_data_received)
             self.connect("drag-motion", self.on_drag_motion)
@@ -91,6 +108,168 @@ class CardGroupList(Gtk.ListBox, GrampsConfig):
         row.add(self.row_cards[-1])
         self.add(row)
 
+    def __len__(self):
+        """
+        Return the number of cards, including those not yet built.
+        """
+        if self.virtual_blocks:
+            return self.virtual_total
+        return len(self.get_children())
+
+    def add_card_builder(self, builder):
+        """
+        Add a callable that returns a Card object, for build_cards to
+        build at once or when scrolled into view.
+        """
+        self.card_builders.append(builder)
+
+    def build_cards(self):
+        """
+        Build the cards added with add_card_builder. If there are more than
+        the virtual list threshold the list is virtualized, with the cards
+        built in blocks as they come near the visible part of the view and
+        released again as they move far from it. Lists accepting drops are
+        never virtualized as dropping and reordering work on the rows, each
+        holding a single card.
+        """
+        builders = self.card_builders
+        self.card_builders = []
+        threshold = self.grstate.config.get("general.virtual-list-threshold")
+        if (
+            not threshold
+            or len(builders) <= threshold
+            or self.enable_drop
+        ):
+            for builder in builders:
+                self.add_card(builder())
+            return
+        self.virtual_total = len(builders)
+        for start in range(0, len(builders), VIRTUAL_BLOCK_SIZE):
+            block_builders = builders[start : start + VIRTUAL_BLOCK_SIZE]
+            box = Gtk.VBox(vexpand=False)
+            box.set_size_request(
+                -1, len(block_builders) * self.virtual_height
+            )
+            row = Gtk.ListBoxRow(selectable=False)
+            row.add(box)
+            self.add(row)
+            self.virtual_blocks.append([row, box, block_builders, False])
+        if self.grstate.dependencies is not None:
+            self.virtual_scope = self.grstate.dependencies.scope
+        self.connect("map", self.on_virtual_map)
+        self.connect("size-allocate", self.schedule_virtual_update)
+
+    def on_virtual_map(self, *_dummy_args):
+        """
+        Find the scrolled window the list is viewed through.
+        """
+        if self.virtual_scroll:
+            return
+        widget = self.get_parent()
+        while widget and not isinstance(widget, Gtk.ScrolledWindow):
+            widget = widget.get_parent()
+        if not widget:
+            for block in self.virtual_blocks:
+                self.build_virtual_block(block)
+            return
+        self.virtual_scroll = widget
+        widget.get_vadjustment().connect(
+            "value-changed", self.schedule_virtual_update
+        )
+        self.schedule_virtual_update()
+
+    def schedule_virtual_update(self, *_dummy_args):
+        """
+        Schedule an update of the built blocks once the view settles.
+        """
+        if self.virtual_scroll and not self.virtual_update_id:
+            self.virtual_update_id = GLib.idle_add(self.update_virtual_blocks)
+
+    def update_virtual_blocks(self):
+        """
+        Build the blocks near the visible part of the view and release
+        those far from it.
+        """
+        self.virtual_update_id = None
+        content = self.virtual_scroll.get_child()
+        if isinstance(content, Gtk.Viewport):
+            content = content.get_child()
+        adjustment = self.virtual_scroll.get_vadjustment()
+        top = adjustment.get_value()
+        page = adjustment.get_page_size()
+        self.update_virtual_height()
+        for block in self.virtual_blocks:
+            position = block[0].translate_coordinates(content, 0, 0)
+            if position is None:
+                continue
+            start = position[1]
+            end = start + block[0].get_allocated_height()
+            if (
+                end >= top - page * VIRTUAL_BUILD_MARGIN
+                and start <= top + page * (1 + VIRTUAL_BUILD_MARGIN)
+            ):
+                self.build_virtual_block(block)
+            elif block[3] and (
+                end < top - page * VIRTUAL_RELEASE_MARGIN
+                or start > top + page * (1 + VIRTUAL_RELEASE_MARGIN)
+            ):
+                self.release_virtual_block(block)
+        return False
+
+    def update_virtual_height(self):
+        """
+        Estimate the card height from the blocks built so far and size the
+        blocks not built to match.
+        """
+        cards = height = 0
+        for (dummy_row, box, builders, built) in self.virtual_blocks:
+            if built:
+                cards = cards + len(builders)
+                height = height + box.get_allocated_height()
+        if cards and height:
+            self.virtual_height = max(1, height // cards)
+        for (dummy_row, box, builders, built) in self.virtual_blocks:
+            height = len(builders) * self.virtual_height
+            if not built and box.get_size_request()[1] != height:
+                box.set_size_request(-1, height)
+
+    def build_virtual_block(self, block):
+        """
+        Build the cards for a block, recording the objects they depend on
+        with the group they belong to.
+        """
+        if block[3]:
+            return
+        (dummy_row, box, builders, dummy_built) = block
+        dependencies = self.grstate.dependencies
+        previous = None
+        if dependencies is not None and self.virtual_scope is not None:
+            previous = dependencies.open_scope(self.virtual_scope)
+        started = self.grstate.begin_render()
+        try:
+            for builder in builders:
+                box.pack_start(builder(), False, False, 0)
+        finally:
+            if started:
+                self.grstate.end_render()
+            if dependencies is not None and self.virtual_scope is not None:
+                dependencies.close_scope(previous)
+        box.set_size_request(-1, -1)
+        box.show_all()
+        block[3] = True
+
+    def release_virtual_block(self, block):
+        """
+        Release the cards for a block, keeping its height.
+        """
+        (dummy_row, box, dummy_builders, dummy_built) = block
+        height = box.get_allocated_height()
+        card_pool = CardPoolService()
+        for child in box.get_children():
+            card_pool.recycle(child)
+        box.set_size_request(-1, height)
+        block[3] = False
+
     def on_drag_data_received(
         self,
         _dummy_widget,
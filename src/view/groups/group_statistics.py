@@ -67,6 +67,7 @@ from ..services.service_statistics_labels import (
     PRIVATE_LABELS,
     TAG_LABELS,
     BOOKMARK_LABELS,
+    DISTRIBUTION_LABELS,
 )
 
 _ = glocale.translation.sgettext
@@ -520,6 +521,88 @@ def get_private_statistics(data):
     )
 
 
+def get_birth_year_statistics(data):
+    """
+    Return birth year distribution for rendering.
+    """
+    return prepare_distribution(
+        data,
+        "birth_year",
+        lambda start: DISTRIBUTION_LABELS["decade"]
+        % {"start": start, "end": start + 9},
+    )
+
+
+def get_lifespan_statistics(data):
+    """
+    Return lifespan distribution for rendering.
+    """
+    return prepare_distribution(data, "lifespan", format_age_range)
+
+
+def get_marriage_age_statistics(data):
+    """
+    Return age at marriage distribution for rendering.
+    """
+    return prepare_distribution(data, "marriage_age", format_age_range)
+
+
+def get_family_size_statistics(data):
+    """
+    Return children per family distribution for rendering.
+    """
+    return prepare_distribution(data, "family_size", format_children)
+
+
+def format_age_range(start):
+    """
+    Format the range of ages in a bin.
+    """
+    return DISTRIBUTION_LABELS["years"] % {"start": start, "end": start + 4}
+
+
+def format_children(children):
+    """
+    Format the number of children in a bin.
+    """
+    if children == 0:
+        return DISTRIBUTION_LABELS["no_children"]
+    if children == 1:
+        return DISTRIBUTION_LABELS["child"]
+    return DISTRIBUTION_LABELS["children"] % children
+
+
+def prepare_distribution(data, key, format_bin):
+    """
+    Prepare a distribution for rendering.
+    """
+    if "distribution" not in data:
+        return [
+            (
+                DISTRIBUTION_LABELS[key],
+                DISTRIBUTION_LABELS["unavailable"],
+                None,
+            )
+        ]
+    distribution = data["distribution"].get(key)
+    if not distribution or not distribution["total"]:
+        return [(DISTRIBUTION_LABELS[key], _("None"), None)]
+    total = distribution["total"]
+    result = [
+        (DISTRIBUTION_LABELS[key], total, None),
+        (DISTRIBUTION_LABELS["median"], int(distribution["median"]), None),
+    ]
+    for (start, count) in distribution["bins"]:
+        result.append(
+            (
+                "• %s" % format_bin(start),
+                "%s of %s" % (count, total),
+                count * 100 / total,
+            )
+        )
+    return result
+
+
 def prepare_statistics(keys, data, labels):
     """
     Prepare statistics data for rendering.
@@ -570,6 +653,10 @@ PREPARE_GROUP = {
     "person-short": get_person_statistics_short,
     "family": get_family_statistics,
     "child": get_child_statistics,
+    "birthyear": get_birth_year_statistics,
+    "lifespan": get_lifespan_statistics,
+    "marriageage": get_marriage_age_statistics,
+    "familysize": get_family_size_statistics,
     "association": get_association_statistics,
     "event": get_event_statistics,
     "ldsordperson": get_ldsord_person_statistics,
@@ -587,6 +674,53 @@ PREPARE_GROUP = {
     "privacy": get_private_statistics,
 }
 
+ALL_CATEGORIES = (
+    "Person",
+    "Family",
+    "Event",
+    "Place",
+    "Media",
+    "Source",
+    "Citation",
+    "Repository",
+    "Note",
+    "Tag",
+)
+
+GROUP_CATEGORIES = {
+    "person": ("Person",),
+    "person-short": ("Person",),
+    "family": ("Family", "Event"),
+    "child": ("Family",),
+    "birthyear": ("Person",),
+    "lifespan": ("Person",),
+    "marriageage": ("Person", "Family", "Event"),
+    "familysize": ("Family",),
+    "association": ("Person",),
+    "event": ("Event",),
+    "ldsordperson": ("Person",),
+    "ldsordfamily": ("Family",),
+    "participant": ("Person", "Family"),
+    "place": ("Place",),
+    "media": (
+        "Person",
+        "Family",
+        "Event",
+        "Place",
+        "Media",
+        "Source",
+        "Citation",
+    ),
+    "note": ("Note",),
+    "bookmark": (),
+    "tag": ALL_CATEGORIES,
+    "repository": ("Repository",),
+    "source": ("Source",),
+    "citation": ("Citation",),
+    "uncited": ("Person", "Family", "Event", "Place", "Media"),
+    "privacy": ALL_CATEGORIES[:-1],
+}
+
 
 # ------------------------------------------------------------------------
 #
@@ -612,13 +746,38 @@ class StatisticsCardGroup(CardGroupList):
         self.add_card(self.card)
 
         statistics_service = StatisticsService(grstate)
-        statistics_service.connect("statistics-updated", self.load_data)
+        self.callback_ids = [
+            statistics_service.connect("statistics-updated", self.load_data),
+            statistics_service.connect(
+                "statistics-partial", self.load_partial_data
+            ),
+        ]
+        self.connect("destroy", self.cb_destroy)
 
         data = statistics_service.request_data()
         if data:
             self.load_data(data)
         else:
             self.card.load_data([(_("Calculating..."), "")])
+            self.load_partial_data(*statistics_service.get_partial_data())
+
+    def cb_destroy(self, *_dummy_args):
+        """
+        Disconnect from the statistics service so the group can be freed.
+        """
+        statistics_service = StatisticsService()
+        for callback_id in self.callback_ids:
+            statistics_service.disconnect(callback_id)
+
+    def load_partial_data(self, data, categories):
+        """
+        Load card data from a collection in progress once the categories
+        the group depends on are complete.
+        """
+        if data and all(
+            category in categories for category in GROUP_CATEGORIES[self.key]
+        ):
+            self.load_data(data)
 
     def load_data(self, data):
         """
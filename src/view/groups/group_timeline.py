@@ -22,6 +22,13 @@
 TimelineCardGroup
 """
 
+# ------------------------------------------------------------------------
+#
+# Python Modules
+#
+# ------------------------------------------------------------------------
+from functools import partial
+
 # ------------------------------------------------------------------------
 #
 # Gramps Modules
@@ -43,6 +50,7 @@ from ..cards import (
     MediaCard,
     NameCard,
 )
+from ..services.service_cards import CardPoolService
 from .group_list import CardGroupList
 
 _ = glocale.translation.sgettext
@@ -94,6 +102,7 @@ class TimelineCardGroup(CardGroupList):
             self.timeline.set_place(obj.handle)
 
         timeline = self.prepare_timeline(obj)
+        card_pool = CardPoolService()
         for (dummy_sortval, timeline_obj_type, timeline_obj, item) in timeline:
             if timeline_obj_type == "event":
                 (
@@ -107,8 +116,10 @@ class TimelineCardGroup(CardGroupList):
                 obj = event_person
                 if event_family:
                     obj = event_family
-                self.add_card(
-                    EventRefCard(
+                self.add_card_builder(
+                    partial(
+                        card_pool.get_card,
+                        EventRefCard,
                         grstate,
                         groptions,
                         obj,
@@ -117,10 +128,13 @@ class TimelineCardGroup(CardGroupList):
                 )
             elif timeline_obj_type == "media":
                 (media, dummy_media_ref) = item
-                self.add_card(MediaCard(grstate, groptions, media))
+                self.add_card_builder(
+                    partial(MediaCard, grstate, groptions, media)
+                )
             elif timeline_obj_type == "address":
-                self.add_card(
-                    AddressCard(
+                self.add_card_builder(
+                    partial(
+                        AddressCard,
                         grstate,
                         groptions,
                         timeline_obj,
@@ -128,8 +142,9 @@ class TimelineCardGroup(CardGroupList):
                     )
                 )
             elif timeline_obj_type == "name":
-                self.add_card(
-                    NameCard(
+                self.add_card_builder(
+                    partial(
+                        NameCard,
                         grstate,
                         groptions,
                         timeline_obj,
@@ -137,22 +152,25 @@ class TimelineCardGroup(CardGroupList):
                     )
                 )
             elif timeline_obj_type == "citation":
-                self.add_card(
-                    CitationCard(
+                self.add_card_builder(
+                    partial(
+                        CitationCard,
                         grstate,
                         groptions,
                         item,
                     )
                 )
             elif timeline_obj_type == "ldsord":
-                self.add_card(
-                    LDSOrdinanceCard(
+                self.add_card_builder(
+                    partial(
+                        LDSOrdinanceCard,
                         grstate,
                         groptions,
                         timeline_obj,
                         item,
                     )
                 )
+        self.build_cards()
         self.show_all()
 
     def prepare_options(self):
@@ -190,9 +208,7 @@ class TimelineCardGroup(CardGroupList):
         ):
             birth_ref = obj.get_birth_ref()
             if birth_ref:
-                event = self.grstate.dbstate.db.get_event_from_handle(
-                    birth_ref.ref
-                )
+                event = self.grstate.fetch("Event", birth_ref.ref)
                 if event:
                     self.groptions.set_age_base(event.get_date_object())
 
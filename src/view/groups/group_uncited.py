@@ -69,10 +69,9 @@ class UncitedEventsCardGroup(CardGroupList):
         """
         Check for uncited events and add to group if found.
         """
-        db = self.grstate.dbstate.db
         for event_ref in obj.event_ref_list:
-            event = db.get_event_from_handle(event_ref.ref)
-            if not event.citation_list:
+            event = self.grstate.fetch("Event", event_ref.ref)
+            if event and not event.citation_list:
                 card = EventRefCard(
                     self.grstate,
                     options,
@@ -85,5 +84,6 @@ class UncitedEventsCardGroup(CardGroupList):
         """
         Check family events with spouse.
         """
-        family = self.grstate.dbstate.db.get_family_from_handle(family_handle)
-        self.check_events(options, family)
+        family = self.grstate.fetch("Family", family_handle)
+        if family:
+            self.check_events(options, family)
@@ -0,0 +1,251 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+CardPoolService
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+from collections import OrderedDict
+
+# -------------------------------------------------------------------------
+#
+# Gtk Modules
+#
+# -------------------------------------------------------------------------
+from gi.repository import Gtk
+
+
+# -------------------------------------------------------------------------
+#
+# CardPoolService
+#
+# -------------------------------------------------------------------------
+class CardPoolService:
+    """
+    A singleton class that keeps the cards of pages no longer shown, up to
+    the display.card-pool-size option for each card class, so a card for
+    the same object with the same options on a later page is moved there
+    instead of being built again.
+
+    Cards lay themselves out from their object and options as they are
+    built, so a kept card is only reused for the same ones. It is released
+    from the size groups and pointer state of the group it was shown in
+    when kept, and bound to those of the group it is reused in.
+
+    Only cards built on the page view are kept, with the handles recorded
+    while they were built so they can be dropped when any of the objects
+    change. Cards built before the last change to the tree, or with widgets
+    added to them after they were built, are not kept. Each view has a
+    state of its own, and its cards are only reused in the same view.
+    """
+
+    __init = False
+
+    def __new__(cls):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(CardPoolService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            self.pools = {}
+            self.__init = True
+
+    def get_card(self, card_class, grstate, groptions, *args, **kwargs):
+        """
+        Return a kept card for the object and options if there is one,
+        else build a new one.
+        """
+        dependencies = grstate.dependencies
+        if dependencies is None or not grstate.config.get(
+            "display.card-pool-size"
+        ):
+            return card_class(grstate, groptions, *args, **kwargs)
+        try:
+            key = (grstate,) + get_card_key(groptions, args, kwargs)
+        except TypeError:
+            return card_class(grstate, groptions, *args, **kwargs)
+        pool = self.pools.get(card_class)
+        if pool and key in pool:
+            card = pool.pop(key)
+            rebind_cards(card, groptions)
+            dependencies.record_handles(card.pool_handles)
+            card.pool_generation = grstate.render_generation
+            return card
+        previous = dependencies.open_scope()
+        try:
+            card = card_class(grstate, groptions, *args, **kwargs)
+        finally:
+            handles = dependencies.close_scope(previous)
+            dependencies.record_handles(handles)
+        card.pool_key = key
+        card.pool_handles = handles
+        card.pool_generation = grstate.render_generation
+        card.pool_children = card.get_children()
+        return card
+
+    def recycle(self, widget):
+        """
+        Keep the cards in a widget tree that is no longer shown and destroy
+        the rest of it.
+        """
+        kept = [
+            card for card in find_cards(widget, pooled=True) if self.keep(card)
+        ]
+        if widget not in kept:
+            widget.destroy()
+
+    def keep(self, card):
+        """
+        Keep a card for reuse if it is still current. Returns True if kept.
+        """
+        size = card.grstate.config.get("display.card-pool-size")
+        if (
+            not size
+            or card.pool_generation != card.grstate.render_generation
+            or card.get_children() != card.pool_children
+        ):
+            return False
+        parent = card.get_parent()
+        if parent:
+            parent.remove(card)
+        for nested_card in find_cards(card):
+            nested_card.release_card()
+        pool = self.pools.setdefault(card.__class__, OrderedDict())
+        previous = pool.pop(card.pool_key, None)
+        if previous:
+            previous.destroy()
+        pool[card.pool_key] = card
+        while len(pool) > size:
+            pool.popitem(last=False)[1].destroy()
+        return True
+
+    def evict(self, changes, referenced):
+        """
+        Drop the kept cards that depend on a batch of changed objects or
+        for objects they now refer to. If the referenced handles are not
+        known all of them are dropped.
+        """
+        changed = set()
+        for (dummy_obj_type, action, handles) in changes:
+            if action == "rebuild":
+                self.clear()
+                return
+            changed.update(handles)
+        if referenced is None:
+            self.clear()
+            return
+        for pool in self.pools.values():
+            for (key, card) in list(pool.items()):
+                if not card.pool_handles.isdisjoint(changed) or (
+                    card.primary.has_handle
+                    and card.primary.obj.handle in referenced
+                ):
+                    pool.pop(key).destroy()
+
+    def clear(self, grstate=None):
+        """
+        Drop the kept cards for a view, or all of them.
+        """
+        for pool in self.pools.values():
+            for (key, card) in list(pool.items()):
+                if grstate is None or card.grstate is grstate:
+                    pool.pop(key).destroy()
+
+
+def get_card_key(groptions, args, kwargs):
+    """
+    Return a key for the options and arguments a card is built with.
+    """
+    options = {
+        key: value
+        for (key, value) in vars(groptions).items()
+        if key != "size_groups"
+    }
+    return (
+        get_fingerprint(options),
+        get_fingerprint(args),
+        get_fingerprint(kwargs),
+    )
+
+
+def get_fingerprint(value):
+    """
+    Return a hashable fingerprint for a value a card is built with. Table
+    objects are known by their handle and change time, and secondary
+    objects by their serialized data. Raises TypeError if there is none.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple([get_fingerprint(item) for item in value])
+    if isinstance(value, dict):
+        return tuple(
+            sorted(
+                [(key, get_fingerprint(item)) for (key, item) in value.items()]
+            )
+        )
+    handle = getattr(value, "handle", None)
+    if handle and hasattr(value, "change"):
+        return (value.__class__.__name__, handle, value.change)
+    if hasattr(value, "serialize"):
+        return (value.__class__.__name__, str(value.serialize()))
+    raise TypeError(value.__class__.__name__)
+
+
+def find_cards(widget, pooled=False):
+    """
+    Return the cards in a widget tree. If only those built through the
+    pool are wanted the cards nested in them are not returned.
+    """
+    cards = []
+    if hasattr(widget, "size_group_widgets"):
+        if not pooled or hasattr(widget, "pool_key"):
+            cards.append(widget)
+            if pooled:
+                return cards
+    if isinstance(widget, Gtk.Container):
+        for child in widget.get_children():
+            cards.extend(find_cards(child, pooled=pooled))
+    return cards
+
+
+def rebind_cards(card, groptions):
+    """
+    Bind a kept card, and the cards nested in it that share its options,
+    to the options of the group it is reused in.
+    """
+    previous = card.groptions
+    for nested_card in find_cards(card):
+        if nested_card.groptions is previous:
+            nested_card.rebind_card(groptions)
+        else:
+            nested_card.rebind_card(nested_card.groptions)
@@ -0,0 +1,318 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+ChangeHistoryService
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+from heapq import heapify, heappop, heappush, heapreplace, nlargest
+from threading import Event, Thread
+
+# -------------------------------------------------------------------------
+#
+# Gtk Modules
+#
+# -------------------------------------------------------------------------
+from gi.repository import GLib
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.datehandler import format_time
+from gramps.gen.errors import HandleError
+from gramps.gen.utils.callback import Callback
+from gramps.gen.utils.db import navigation_label
+
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# -------------------------------------------------------------------------
+from .service_signals import SignalCoalescerService
+from .service_statistics_worker import (
+    close_readonly_database,
+    iter_raw_objects,
+    open_readonly_database,
+)
+
+# Entries kept for each object type, more than are shown so deleting a
+# few objects does not force a rescan to refill the list.
+HISTORY_DEPTH = 50
+HISTORY_MINIMUM = 20
+
+# Position of the last changed timestamp in the serialized objects
+CHANGE_INDEX = {
+    "Person": 17,
+    "Family": 12,
+    "Event": 10,
+    "Place": 15,
+    "Source": 8,
+    "Citation": 9,
+    "Repository": 7,
+    "Media": 9,
+    "Note": 5,
+    "Tag": 4,
+}
+
+
+# -------------------------------------------------------------------------
+#
+# ChangeHistoryService
+#
+# -------------------------------------------------------------------------
+class ChangeHistoryService(Callback):
+    """
+    A singleton class that tracks the most recently changed objects.
+
+    The history for each object type is a bounded min heap of change
+    timestamp, handle and label tuples. It is built with one pass over the
+    serialized objects in a background thread when a tree is loaded and
+    then kept current from the database signals.
+    """
+
+    __signals__ = {
+        "changes-updated": (),
+    }
+
+    __init = False
+    __init_callback = False
+
+    def __new__(cls, *args):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(ChangeHistoryService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, grstate=None):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            if not self.__init_callback:
+                Callback.__init__(self)
+                self.__init_callback = True
+            if grstate:
+                self.dbstate = grstate.dbstate
+                self.history = {}
+                self.build = None
+                self.pending_changes = []
+                SignalCoalescerService(grstate).connect(
+                    "changes-flushed", self.changes_detected
+                )
+                self.dbstate.connect("database-changed", self.database_changed)
+                self.__init = True
+                if self.dbstate.is_open():
+                    self.spawn_build_history()
+
+    def changes_detected(self, changes):
+        """
+        Apply a batch of changes to the history, or hold them until the
+        history being built is available.
+        """
+        if self.build:
+            self.pending_changes.extend(changes)
+            return
+        rebuild = [
+            obj_type
+            for (obj_type, action, dummy) in changes
+            if action == "rebuild"
+        ]
+        if rebuild:
+            self.spawn_build_history(obj_types=rebuild)
+        for (obj_type, action, handles) in changes:
+            if obj_type not in rebuild:
+                self.apply_changes(obj_type, action, handles)
+        self.emit("changes-updated", ())
+
+    def apply_changes(self, obj_type, action, handles):
+        """
+        Apply changes to the history for an object type.
+        """
+        if action == "rebuild" or obj_type not in self.history:
+            self.spawn_build_history(obj_types=[obj_type])
+            return
+        handles = set(handles)
+        heap = [
+            item for item in self.history[obj_type] if item[1] not in handles
+        ]
+        removed = len(heap) < len(self.history[obj_type])
+        if action == "delete":
+            self.history[obj_type] = heap
+            if removed:
+                heapify(heap)
+                if len(heap) < HISTORY_MINIMUM:
+                    self.spawn_build_history(obj_types=[obj_type])
+            return
+
+        if removed:
+            heapify(heap)
+        db = self.dbstate.db
+        query_method = db.method("get_raw_%s_data", obj_type)
+        for handle in handles:
+            try:
+                data = query_method(handle)
+            except HandleError:
+                data = None
+            if not data:
+                continue
+            heappush(
+                heap,
+                (
+                    data[CHANGE_INDEX[obj_type]],
+                    handle,
+                    get_change_label(db, obj_type, handle),
+                ),
+            )
+            if len(heap) > HISTORY_DEPTH:
+                heappop(heap)
+        self.history[obj_type] = heap
+
+    def spawn_build_history(self, obj_types=None):
+        """
+        Spawn a thread to build the history for the given object types, or
+        all of them, cancelling any build in progress.
+        """
+        dbname = self.dbstate.db.get_dbname()
+        if not dbname:
+            return
+        if self.build:
+            (dummy_dbname, build_types, event) = self.build
+            event.set()
+            if obj_types is None or build_types is None:
+                obj_types = None
+            else:
+                obj_types = list(set(obj_types) | set(build_types))
+        event = Event()
+        self.build = (dbname, obj_types, event)
+        thread = Thread(
+            target=self.build_history, args=(event, dbname, obj_types)
+        )
+        thread.start()
+
+    def build_history(self, event, dbname, obj_types):
+        """
+        Thread to find the most recently changed objects of each type.
+        """
+        history = {}
+        db = open_readonly_database(dbname)
+        try:
+            for obj_type in obj_types or CHANGE_INDEX:
+                index = CHANGE_INDEX[obj_type]
+                heap = []
+                objects = iter_raw_objects(db, obj_type)
+                for (handle, data) in objects:
+                    if event.is_set():
+                        break
+                    item = (data[index], handle)
+                    if len(heap) < HISTORY_DEPTH:
+                        heappush(heap, item)
+                    elif item > heap[0]:
+                        heapreplace(heap, item)
+                objects.close()
+                if event.is_set():
+                    return
+                # Adding the label keeps the heap order as handles are unique
+                history[obj_type] = [
+                    (change, handle, get_change_label(db, obj_type, handle))
+                    for (change, handle) in heap
+                ]
+        finally:
+            close_readonly_database(db)
+        GLib.idle_add(self.history_built, event, history)
+
+    def history_built(self, event, history):
+        """
+        Install a newly built history and apply any changes made meanwhile.
+        """
+        if event.is_set() or not self.build or self.build[2] is not event:
+            return False
+        self.build = None
+        self.history.update(history)
+        pending = self.pending_changes
+        self.pending_changes = []
+        for (obj_type, action, handles) in pending:
+            self.apply_changes(obj_type, action, handles)
+        self.emit("changes-updated", ())
+        return False
+
+    def database_changed(self, *_dummy_args):
+        """
+        Rebuild the history for the new database.
+        """
+        if self.build:
+            self.build[2].set()
+            self.build = None
+        self.history = {}
+        self.pending_changes = []
+        if self.dbstate.is_open():
+            self.spawn_build_history()
+        self.emit("changes-updated", ())
+
+    def get_change_history(self):
+        """
+        Return the most recently changed objects of each type and across all
+        types, newest first, as tuples of the object type, handle, label,
+        change timestamp and formatted change time.
+        """
+        change_history = {}
+        for (obj_type, heap) in self.history.items():
+            change_history[obj_type] = [
+                (obj_type, handle, label, change, format_time(change))
+                for (change, handle, label) in sorted(heap, reverse=True)
+            ]
+        change_history["Global"] = nlargest(
+            HISTORY_DEPTH,
+            [
+                item
+                for obj_history in change_history.values()
+                for item in obj_history
+            ],
+            key=lambda x: x[3],
+        )
+        return change_history
+
+    def recalculate_data(self):
+        """
+        Force the history to be rebuilt.
+        """
+        if self.dbstate.is_open():
+            self.spawn_build_history()
+
+
+def get_change_label(db, obj_type, handle):
+    """
+    Return the label describing an object.
+    """
+    try:
+        if obj_type == "Tag":
+            return db.get_tag_from_handle(handle).get_name()
+        label, dummy_obj = navigation_label(db, obj_type, handle)
+    except HandleError:
+        return ""
+    return label or ""
@@ -0,0 +1,142 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+PrefetchService
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+from queue import Queue
+from threading import Thread
+
+# -------------------------------------------------------------------------
+#
+# Gtk Modules
+#
+# -------------------------------------------------------------------------
+from gi.repository import GLib
+
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# -------------------------------------------------------------------------
+from ..common.common_prefetch import can_read_batches, prefetch_objects
+from .service_statistics_worker import (
+    close_readonly_database,
+    open_readonly_database,
+)
+
+
+# -------------------------------------------------------------------------
+#
+# PrefetchService
+#
+# -------------------------------------------------------------------------
+class PrefetchService:
+    """
+    A singleton class that reads the objects a page is expected to show in
+    a background thread, using a read only connection to the tree of its
+    own, so the main loop is free to show the page header meanwhile.
+
+    Requests are served in order by a single thread which keeps its
+    connection open until the tree changes. Only the latest of several
+    waiting requests is read, the others being answered with what they
+    were given.
+    """
+
+    __init = False
+
+    def __new__(cls, *args):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(PrefetchService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, grstate=None):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            if grstate:
+                self.dbstate = grstate.dbstate
+                self.requests = Queue()
+                self.thread = None
+                self.dbstate.connect("database-changed", self.database_changed)
+                self.__init = True
+
+    def request(self, handles, cache, callback):
+        """
+        Queue a request to read the objects for the handles, and those their
+        cards show, into a copy of the cache. The callback is run from the
+        main loop with the copy once it is ready.
+        """
+        dbname = self.dbstate.db.get_dbname()
+        if not dbname or not can_read_batches(self.dbstate.db):
+            callback(cache)
+            return
+        if not self.thread or not self.thread.is_alive():
+            self.thread = Thread(target=self.serve_requests, daemon=True)
+            self.thread.start()
+        self.requests.put((dbname, handles, dict(cache), callback))
+
+    def serve_requests(self):
+        """
+        Thread to serve the requests.
+        """
+        db = None
+        try:
+            while True:
+                request = self.requests.get()
+                while request and not self.requests.empty():
+                    (dummy_dbname, dummy, cache, callback) = request
+                    GLib.idle_add(callback, cache)
+                    request = self.requests.get()
+                if request is None:
+                    if db:
+                        close_readonly_database(db)
+                        db = None
+                    continue
+                (dbname, handles, cache, callback) = request
+                try:
+                    if db and db.get_dbname() != dbname:
+                        close_readonly_database(db)
+                        db = None
+                    if not db:
+                        db = open_readonly_database(dbname)
+                    prefetch_objects(db, handles, cache)
+                finally:
+                    GLib.idle_add(callback, cache)
+        finally:
+            if db:
+                close_readonly_database(db)
+
+    def database_changed(self, *_dummy_args):
+        """
+        Close the connection to the previous tree.
+        """
+        if self.thread and self.thread.is_alive():
+            self.requests.put(None)
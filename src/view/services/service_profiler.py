@@ -0,0 +1,240 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+ProfilerService
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import json
+import time
+from collections import deque
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.utils.callback import Callback
+
+# Number of page renders kept
+RENDER_HISTORY = 50
+
+# Categories of work timed during a render
+CATEGORIES = ["group", "card", "field", "status"]
+
+
+# -------------------------------------------------------------------------
+#
+# ProfilerService
+#
+# -------------------------------------------------------------------------
+class ProfilerService(Callback):
+    """
+    A singleton class that records where the time goes when pages are
+    rendered, if enabled with the general.render-profiling option.
+
+    A record is kept for each of the last pages rendered with the time
+    taken to build the page, the time taken by each group, card class,
+    calculated field and status plugin, and the number of objects fetched
+    and read from the database. Groups streamed in after the page is shown
+    are counted with the page until the next page is rendered.
+
+    Work is timed by taking a start time and then passing it back with the
+    category and name. Outside a profiled render the start time is None
+    and stopping costs nothing. Group times include the cards built in
+    them, while cards are timed as nested work so the time of a card does
+    not include that of the cards built inside it.
+    """
+
+    __signals__ = {
+        "profile-updated": (),
+    }
+
+    __init = False
+
+    def __new__(cls, *args):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(ProfilerService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, grstate=None):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            Callback.__init__(self)
+            self.grstate = None
+            self.renders = deque(maxlen=RENDER_HISTORY)
+            self.current = None
+            self.baseline = None
+            self.page_start = 0
+            self.nested = 0
+            self.__init = True
+        if grstate:
+            self.grstate = grstate
+
+    def begin_page(self, page_context, cached=False):
+        """
+        Start the record for a page render if profiling is enabled.
+        """
+        self.update_counters()
+        self.current = None
+        if not self.grstate or not self.grstate.config.get(
+            "general.render-profiling"
+        ):
+            return
+        primary = page_context.primary_obj
+        label = page_context.page_type
+        gramps_id = getattr(primary.obj, "gramps_id", None)
+        if gramps_id:
+            label = "%s %s" % (label, gramps_id)
+        self.baseline = self.get_counters()
+        self.current = {
+            "page": label,
+            "started": time.time(),
+            "duration": 0,
+            "cached": cached,
+            "fetches": 0,
+            "database_reads": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "timings": {category: {} for category in CATEGORIES},
+        }
+        self.page_start = time.perf_counter()
+        self.nested = 0
+        self.renders.append(self.current)
+
+    def end_page(self):
+        """
+        Record the time taken to build and show the page.
+        """
+        if self.current is None:
+            return
+        self.current["duration"] = time.perf_counter() - self.page_start
+        self.update_counters()
+        self.emit("profile-updated", ())
+
+    def start(self):
+        """
+        Return the start time for a piece of work, or None if not profiling.
+        """
+        if self.current is None:
+            return None
+        return time.perf_counter()
+
+    def stop(self, start, category, name):
+        """
+        Record the time taken by a piece of work.
+        """
+        if start is None or self.current is None:
+            return
+        self.record(category, name, time.perf_counter() - start)
+
+    def start_nested(self):
+        """
+        Return the start for a piece of work that may contain others of its
+        kind, or None if not profiling.
+        """
+        if self.current is None:
+            return None
+        outer = self.nested
+        self.nested = 0
+        return (time.perf_counter(), outer)
+
+    def stop_nested(self, start, category, name):
+        """
+        Record the time taken by a piece of work less the time taken by the
+        nested work within it.
+        """
+        if start is None:
+            return
+        (started, outer) = start
+        elapsed = time.perf_counter() - started
+        if self.current is not None:
+            self.record(category, name, elapsed - self.nested)
+        self.nested = outer + elapsed
+
+    def record(self, category, name, elapsed):
+        """
+        Add the time taken by a piece of work to the current record.
+        """
+        timings = self.current["timings"][category]
+        timing = timings.get(name)
+        if timing is None:
+            timings[name] = {"count": 1, "seconds": elapsed}
+        else:
+            timing["count"] += 1
+            timing["seconds"] += elapsed
+
+    def get_counters(self):
+        """
+        Return the fetch, cache hit and cache miss counts so far.
+        """
+        (hits, misses) = self.grstate.get_cache_statistics()
+        return (self.grstate.fetch_count, hits, misses)
+
+    def update_counters(self):
+        """
+        Update the fetch counts for the page being recorded.
+        """
+        if self.current is None:
+            return
+        (fetches, hits, misses) = [
+            now - then
+            for (now, then) in zip(self.get_counters(), self.baseline)
+        ]
+        self.current.update(
+            {
+                "fetches": fetches,
+                "database_reads": fetches - hits,
+                "cache_hits": hits,
+                "cache_misses": misses,
+            }
+        )
+
+    def get_renders(self):
+        """
+        Return the recorded renders, oldest first.
+        """
+        self.update_counters()
+        return list(self.renders)
+
+    def clear(self):
+        """
+        Drop the recorded renders.
+        """
+        self.renders.clear()
+        self.current = None
+        self.emit("profile-updated", ())
+
+    def dump(self, filename):
+        """
+        Write the recorded renders to a file as JSON.
+        """
+        with open(filename, "w", encoding="utf-8") as dump_file:
+            json.dump({"renders": self.get_renders()}, dump_file, indent=2)
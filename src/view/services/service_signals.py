@@ -0,0 +1,253 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+SignalCoalescerService
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import time
+
+# -------------------------------------------------------------------------
+#
+# Gtk Modules
+#
+# -------------------------------------------------------------------------
+from gi.repository import GLib
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.utils.callback import Callback
+
+SIGNAL_TYPES = [
+    "Person",
+    "Family",
+    "Event",
+    "Place",
+    "Source",
+    "Citation",
+    "Repository",
+    "Media",
+    "Note",
+    "Tag",
+]
+
+# Milliseconds without a signal after which the changes are flushed
+QUIET_PERIOD = 50
+
+
+# -------------------------------------------------------------------------
+#
+# SignalCoalescerService
+#
+# -------------------------------------------------------------------------
+class SignalCoalescerService(Callback):
+    """
+    A singleton class that sits between the database signals and the
+    views and services that act on them.
+
+    The handles from the add, update and delete signals are merged into
+    sets for each object type and flushed as a single batch once the
+    signals stop for a moment, as they do at the end of a transaction, or
+    once the oldest pending change has waited for the latency budget,
+    whichever comes first. Bulk operations such as imports and batch tools
+    that emit thousands of signals are then handled in a few batches.
+    """
+
+    __signals__ = {
+        "changes-flushed": (list,),
+    }
+
+    __init = False
+    __init_callback = False
+
+    def __new__(cls, *args):
+        """
+        Return the singleton class.
+        """
+        if not hasattr(cls, "instance"):
+            cls.instance = super(SignalCoalescerService, cls).__new__(cls)
+        return cls.instance
+
+    def __init__(self, grstate=None):
+        """
+        Initialize the class if needed.
+        """
+        if not self.__init:
+            if not self.__init_callback:
+                Callback.__init__(self)
+                self.__init_callback = True
+            if grstate:
+                self.dbstate = grstate.dbstate
+                self.latency = grstate.config.get("general.signal-latency")
+                self.pending = {}
+                self.first_signal = 0
+                self.last_signal = 0
+                self.flush_id = None
+                self.signal_map = {}
+                for obj_type in SIGNAL_TYPES:
+                    self.__register_signals(obj_type)
+                self.dbstate.connect("database-changed", self.database_changed)
+                self.__init = True
+                if self.dbstate.is_open():
+                    self.__init_signals()
+
+    def __init_signals(self):
+        """
+        Connect to signals from database.
+        """
+        for sig, callback in self.signal_map.items():
+            self.dbstate.db.connect(sig, callback)
+
+    def __register_signals(self, object_type):
+        """
+        Register signal.
+        """
+        lower_type = object_type.lower()
+        for sig in ["add", "update", "delete", "rebuild"]:
+            self.signal_map[
+                "{}-{}".format(lower_type, sig)
+            ] = self.__make_change_callback(object_type, sig)
+
+    def __make_change_callback(self, object_type, action):
+        """
+        Return a database signal callback bound to an object type and action.
+        """
+
+        def change_callback(*args):
+            handles = args[0] if args else []
+            self.change_detected(object_type, action, handles)
+
+        return change_callback
+
+    def change_detected(self, obj_type, action, handles):
+        """
+        Merge a change into the pending changes and schedule a flush.
+        """
+        pending = self.pending.get(obj_type)
+        if pending is None:
+            pending = {
+                "rebuild": False,
+                "delete": set(),
+                "add": set(),
+                "update": set(),
+            }
+            self.pending[obj_type] = pending
+        merge_change(pending, action, handles)
+
+        if self.latency <= 0:
+            self.flush()
+            return
+        now = time.monotonic()
+        if not self.flush_id:
+            self.first_signal = now
+            self.flush_id = GLib.timeout_add(
+                min(QUIET_PERIOD, self.latency), self.check_flush
+            )
+        self.last_signal = now
+
+    def check_flush(self):
+        """
+        Flush the pending changes if the signals have stopped or the latency
+        budget is spent.
+        """
+        now = time.monotonic()
+        if (now - self.last_signal) * 1000 < QUIET_PERIOD and (
+            now - self.first_signal
+        ) * 1000 < self.latency:
+            return True
+        self.flush_id = None
+        self.flush()
+        return False
+
+    def flush(self):
+        """
+        Emit the pending changes as a list of object type, action and handle
+        list tuples. A rebuild replaces any other changes to a type, and
+        deletes come before adds and updates as when the database emits the
+        signals for a transaction.
+        """
+        if self.flush_id:
+            GLib.source_remove(self.flush_id)
+            self.flush_id = None
+        if not self.pending:
+            return
+        changes = []
+        for obj_type in SIGNAL_TYPES:
+            pending = self.pending.get(obj_type)
+            if not pending:
+                continue
+            if pending["rebuild"]:
+                changes.append((obj_type, "rebuild", []))
+                continue
+            for action in ["delete", "add", "update"]:
+                if pending[action]:
+                    changes.append((obj_type, action, list(pending[action])))
+        self.pending = {}
+        if changes:
+            self.emit("changes-flushed", (changes,))
+
+    def database_changed(self, *_dummy_args):
+        """
+        Drop the pending changes for the previous database.
+        """
+        if self.flush_id:
+            GLib.source_remove(self.flush_id)
+            self.flush_id = None
+        self.pending = {}
+        if self.dbstate.is_open():
+            self.__init_signals()
+
+
+def merge_change(pending, action, handles):
+    """
+    Merge a change into the pending changes for an object type, so each
+    handle is reported once with the net effect of its changes.
+    """
+    if action == "rebuild":
+        pending["rebuild"] = True
+        for key in ["delete", "add", "update"]:
+            pending[key].clear()
+        return
+    if pending["rebuild"]:
+        return
+    for handle in handles:
+        if action == "add":
+            if handle in pending["delete"]:
+                pending["delete"].discard(handle)
+                pending["update"].add(handle)
+            else:
+                pending["add"].add(handle)
+        elif action == "update":
+            if handle not in pending["add"]:
+                pending["update"].add(handle)
+        elif action == "delete":
+            pending["update"].discard(handle)
+            if handle in pending["add"]:
+                pending["add"].discard(handle)
+            else:
+                pending["delete"].add(handle)
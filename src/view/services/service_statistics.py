@@ -31,9 +31,10 @@ StatisticsService
 # -------------------------------------------------------------------------
 import os
 import sys
+import json
 import time
-import pickle
-from subprocess import Popen, PIPE, TimeoutExpired
+from select import select
+from subprocess import Popen, PIPE
 from threading import Event, Lock, Thread
 
 # -------------------------------------------------------------------------
@@ -50,6 +51,7 @@ from gi.repository import GLib
 # -------------------------------------------------------------------------
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.const import USER_PLUGINS
+from gramps.gen.errors import HandleError
 from gramps.gen.utils.callback import Callback
 
 # -------------------------------------------------------------------------
@@ -57,20 +59,39 @@ from gramps.gen.utils.callback import Callback
 # Plugin Modules
 #
 # -------------------------------------------------------------------------
-from .service_statistics_worker import gather_statistics, get_object_list
-
-CATEGORIES = [
-    "Person",
-    "Family",
-    "Event",
-    "Place",
-    "Source",
-    "Citation",
-    "Repository",
-    "Media",
-    "Note",
-    "Tag",
-]
+from .service_statistics_worker import (
+    analyze_bookmarks,
+    analyze_object,
+    build_facts,
+    gather_statistics,
+    ledger_remove,
+    ledger_replace,
+    GLOBAL_PROBES,
+    PROGRESS_INTERVAL,
+)
+from .service_statistics_distributions import share_sample_keys
+from .service_statistics_protocol import (
+    read_frame,
+    FRAME_CANCELLED,
+    FRAME_ERROR,
+    FRAME_PARTIAL,
+    FRAME_RESULT,
+)
+from .service_statistics_snapshot import (
+    get_snapshot_key,
+    load_statistics_snapshot,
+    save_statistics_snapshot,
+)
+from .service_signals import SignalCoalescerService
+from .service_statistics_tuning import (
+    choose_collection_method,
+    load_tuning,
+    probe_object_counts,
+    record_collection,
+    save_tuning,
+)
+
+DAEMON_TIMEOUT = PROGRESS_INTERVAL * 6
 
 _ = glocale.translation.sgettext
 
@@ -87,6 +108,7 @@ class StatisticsService(Callback):
 
     __signals__ = {
         "statistics-updated": (dict,),
+        "statistics-partial": (dict, list),
         "changes-detected": (),
     }
 
@@ -117,51 +139,129 @@ class StatisticsService(Callback):
                 self.all_events = grstate.config.get(
                     "dashboard.summarize-all-events"
                 )
+                self.raw_scan = grstate.config.get("dashboard.raw-scan")
                 self.threads = []
                 self.lock = Lock()
                 self.data = {}
+                self.ledgers = {}
+                self.partial = ({}, [])
+                self.pending_changes = []
+                self.data_stale = False
+                self.tree = (None, None)
                 self.worker = find_statistics_service_worker()
-                self.concurrent = self.determine_collection_method()
-                self.signal_map = {}
-                for obj_type in CATEGORIES:
-                    self.__register_signals(obj_type)
+                self.daemon = None
+                self.daemon_lock = Lock()
+                self.tuning = (None, None)
+                SignalCoalescerService(grstate).connect(
+                    "changes-flushed", self.changes_detected
+                )
                 self.dbstate.connect("database-changed", self.database_changed)
                 self.__init = True
 
-    def __init_signals(self):
+    def changes_detected(self, changes):
         """
-        Connect to signals from database.
+        Apply a batch of changes to the ledgers if possible, otherwise emit
+        change detected signal so a refresh can be requested.
         """
-        for sig, callback in self.signal_map.items():
-            self.dbstate.db.connect(sig, callback)
+        with self.lock:
+            if self.threads:
+                self.pending_changes.extend(changes)
+                return
+            (applied, stale) = self.apply_change_list(changes)
+        if applied:
+            self.emit("statistics-updated", (self.data,))
+        if stale:
+            self.data_stale = True
+            self.emit("changes-detected", ())
 
-    def __register_signals(self, object_type):
+    def apply_change_list(self, changes):
         """
-        Register signal.
+        Apply a list of changes to the ledgers, rebuilding the facts once
+        at the end. Returns whether any were applied and whether any could
+        not be as the data for the category must be collected again.
         """
-        lower_type = object_type.lower()
-        for sig in ["add", "update", "delete", "rebuild"]:
-            self.signal_map[
-                "{}-{}".format(lower_type, sig)
-            ] = self.change_detected
+        applied = stale = False
+        for (obj_type, action, handles) in changes:
+            if action == "rebuild" or obj_type not in self.ledgers:
+                stale = True
+                continue
+            self.apply_changes(obj_type, action, handles)
+            applied = True
+        if applied:
+            db = self.dbstate.db
+            for (probe_type, probe) in GLOBAL_PROBES.items():
+                if probe_type in self.ledgers:
+                    self.ledgers[probe_type]["counters"].update(probe(db))
+            self.data = build_facts(self.ledgers, analyze_bookmarks(db))
+        return applied, stale
 
-    def change_detected(self, *_dummy_args):
+    def apply_changes(self, obj_type, action, handles):
         """
-        Emit change detected signal.
+        Apply the changes to the affected objects to the ledgers.
         """
-        self.emit("changes-detected", ())
+        db = self.dbstate.db
+        args = {"all_events": self.all_events}
+        affected = {obj_type: set(handles)}
+        if action != "delete":
+            for handle in handles:
+                for (dependent_type, dependents) in find_dependents(
+                    db, obj_type, handle
+                ).items():
+                    affected.setdefault(dependent_type, set()).update(
+                        dependents
+                    )
+
+        for (affected_type, affected_handles) in affected.items():
+            ledger = self.ledgers.get(affected_type)
+            if not ledger:
+                continue
+            query_method = db.method("get_%s_from_handle", affected_type)
+            for handle in affected_handles:
+                obj = None
+                if affected_type != obj_type or action != "delete":
+                    try:
+                        obj = query_method(handle)
+                    except HandleError:
+                        obj = None
+                if obj:
+                    ledger_replace(
+                        ledger,
+                        handle,
+                        analyze_object(db, affected_type, obj, args),
+                    )
+                else:
+                    ledger_remove(ledger, handle)
 
     def determine_collection_method(self):
         """
-        Determine based on size what method to try to use.
+        Determine the collection method as (concurrent, workers) along with
+        the object counts for the tree, using the throughput measured for
+        earlier collections or failing that the size of the tree.
         """
-        if self.dbstate.is_open():
-            total, dummy_obj_list = get_object_list(
-                self.dbstate.db.get_dbname()
+        dbname = self.dbstate.db.get_dbname()
+        with self.lock:
+            if self.tuning[0] != dbname:
+                self.tuning = (dbname, load_tuning(dbname))
+            tuning = self.tuning[1]
+            object_counts = probe_object_counts(self.dbstate.db, tuning)
+            method = choose_collection_method(
+                tuning, object_counts, self.threshold, bool(self.worker)
             )
-            if total > self.threshold:
-                return True
-        return False
+        return method, object_counts
+
+    def record_collection_timings(
+        self, dbname, method, object_counts, timings, elapsed
+    ):
+        """
+        Record the time taken to scan each category and the time taken by
+        the whole collection.
+        """
+        with self.lock:
+            if self.tuning[0] == dbname:
+                record_collection(
+                    self.tuning[1], method, object_counts, timings, elapsed
+                )
+                save_tuning(dbname, self.tuning[1])
 
     def emit_statistics_updated(self, thread_dbname):
         """
@@ -174,8 +274,47 @@ class StatisticsService(Callback):
                 if self.dbstate.db.get_dbname() == thread_dbname:
                     self.emit("statistics-updated", (self.data,))
                 del self.threads[index]
+        self.partial = ({}, [])
+        self.apply_pending_changes()
+        return False
+
+    def emit_statistics_partial(self, thread_dbname, facts, categories):
+        """
+        Emit statistics partial signal.
+        """
+        for (dbname, dummy_thread, event) in self.threads:
+            if dbname == thread_dbname and not event.is_set():
+                if self.dbstate.db.get_dbname() == thread_dbname:
+                    self.partial = (facts, categories)
+                    self.emit("statistics-partial", (facts, categories))
         return False
 
+    def category_collected(self, event, dbname, categories, facts):
+        """
+        Schedule emitting the facts collected so far when a category
+        completes.
+        """
+        if not event.is_set():
+            GLib.idle_add(
+                self.emit_statistics_partial, dbname, facts, list(categories)
+            )
+
+    def apply_pending_changes(self):
+        """
+        Apply changes detected while a collection was running.
+        """
+        with self.lock:
+            pending = self.pending_changes
+            self.pending_changes = []
+            if not pending or self.threads:
+                self.pending_changes = pending + self.pending_changes
+                return
+            (dummy_applied, stale) = self.apply_change_list(pending)
+        self.emit("statistics-updated", (self.data,))
+        if stale:
+            self.data_stale = True
+            self.emit("changes-detected", ())
+
     def clean_stale_thread(self, thread_dbname):
         """
         Cleanup aborted thread entry.
@@ -186,55 +325,151 @@ class StatisticsService(Callback):
             if dbname == thread_dbname:
                 del self.threads[index]
 
-    def collect_statistics(self, event, dbname):
+    def collect_statistics(
+        self, event, dbname, snapshot_key, method, object_counts
+    ):
         """
         Thread to handle the statistics collection work.
         """
         s = time.time()
         done = False
-        if self.concurrent and self.worker:
-            args = ["python3", "-u", self.worker, "-t", dbname]
-            if self.all_events:
-                args.append("-a")
+        timings = {}
+        if method[0] and self.worker:
             try:
-                process = Popen(args, stdout=PIPE)
-                finished = False
-                while not finished:
-                    try:
-                        output, dummy_errors = process.communicate(timeout=0.1)
-                        finished = True
-                    except TimeoutExpired:
-                        if event.is_set():
-                            process.terminate()
-                            output, dummy_errors = process.communicate()
-                            finished = True
-                if not event.is_set():
-                    with self.lock:
-                        self.data = pickle.loads(output)
-                print(
-                    "stats collected: %s" % (time.time() - s), file=sys.stderr
+                output = self.request_daemon_collection(
+                    event, dbname, method[1]
                 )
-                done = True
-            except FileNotFoundError:
-                self.worker = None
-            except EOFError:
+                if not output.get("error"):
+                    if not event.is_set() and "facts" in output:
+                        share_sample_keys(output["ledgers"])
+                        with self.lock:
+                            self.data = output["facts"]
+                            self.ledgers = output["ledgers"]
+                        timings = output["timings"]
+                    print(
+                        "stats collected: %s" % (time.time() - s),
+                        file=sys.stderr,
+                    )
+                    done = True
+            except (OSError, EOFError, ValueError):
+                self.stop_worker_daemon()
                 self.worker = None
         if not done:
+            s = time.time()
+            method = (False, 1)
             args = {
                 "all_events": self.all_events,
                 "tree_name": dbname,
                 "serial": True,
+                "ledger": True,
+                "raw": self.raw_scan,
             }
-            dummy_total, data = gather_statistics(args, event=event)
+            categories = []
+
+            def collected(obj_type, ledger, facts):
+                timings[obj_type] = ledger.get("scan_seconds", 0)
+                categories.append(obj_type)
+                self.category_collected(event, dbname, categories, facts)
+
+            dummy_total, data, ledgers = gather_statistics(
+                args, event=event, callback=collected
+            )
             if not event.is_set():
+                share_sample_keys(ledgers)
                 with self.lock:
                     self.data = data
+                    self.ledgers = ledgers
             print("stats collected: %s" % (time.time() - s), file=sys.stderr)
         if not event.is_set():
+            self.record_collection_timings(
+                dbname, method, object_counts, timings, time.time() - s
+            )
+            save_statistics_snapshot(snapshot_key, self.data)
             GLib.idle_add(self.emit_statistics_updated, dbname)
         else:
             GLib.idle_add(self.clean_stale_thread, dbname)
 
+    def get_worker_daemon(self):
+        """
+        Return the worker daemon, starting it if it is not running.
+        """
+        if self.daemon is None or self.daemon.poll() is not None:
+            args = ["python3", "-u", self.worker, "-d"]
+            if self.all_events:
+                args.append("-a")
+            if self.raw_scan:
+                args.append("-r")
+            self.daemon = Popen(args, bufsize=0, stdin=PIPE, stdout=PIPE)
+        return self.daemon
+
+    def stop_worker_daemon(self):
+        """
+        Stop the worker daemon if it is running.
+        """
+        if self.daemon is not None:
+            if self.daemon.poll() is None:
+                self.daemon.kill()
+            self.daemon.wait()
+            self.daemon = None
+
+    def send_daemon_command(self, command):
+        """
+        Send a command to the worker daemon.
+        """
+        self.daemon.stdin.write(("%s\n" % json.dumps(command)).encode())
+        self.daemon.stdin.flush()
+
+    def request_daemon_collection(self, event, dbname, workers):
+        """
+        Ask the worker daemon to collect statistics for a tree and wait for
+        the result, asking it to cancel the collection if the event is set.
+        The ledgers arrive with the partial frames sent as each category
+        completes and are added to the result along with the time taken to
+        scan each category.
+        """
+        with self.daemon_lock:
+            daemon = self.get_worker_daemon()
+            self.send_daemon_command(
+                {
+                    "command": "recollect",
+                    "tree_name": dbname,
+                    "workers": workers,
+                }
+            )
+            ledgers = {}
+            timings = {}
+            cancelled = False
+            last_frame = time.time()
+            while True:
+                ready, dummy_write, dummy_error = select(
+                    [daemon.stdout], [], [], 0.1
+                )
+                if ready:
+                    last_frame = time.time()
+                    frame_type, payload = read_frame(daemon.stdout)
+                    if frame_type == FRAME_RESULT:
+                        payload["ledgers"] = ledgers
+                        payload["timings"] = timings
+                        return payload
+                    if frame_type == FRAME_CANCELLED:
+                        return {"cancelled": True}
+                    if frame_type == FRAME_ERROR:
+                        print(payload.get("message"), file=sys.stderr)
+                        return {"error": True}
+                    if frame_type == FRAME_PARTIAL:
+                        ledgers[payload["category"]] = payload["ledger"]
+                        timings[payload["category"]] = payload["ledger"].get(
+                            "scan_seconds", 0
+                        )
+                        self.category_collected(
+                            event, dbname, list(ledgers), payload["facts"]
+                        )
+                elif time.time() - last_frame > DAEMON_TIMEOUT:
+                    raise EOFError
+                if event.is_set() and not cancelled:
+                    self.send_daemon_command({"command": "cancel"})
+                    cancelled = True
+
     def spawn_collect_statistics(self):
         """
         Spawn statistics collection thread.
@@ -248,15 +483,27 @@ class StatisticsService(Callback):
                 else:
                     event.set()
             if need_collect:
-                self.concurrent = self.determine_collection_method()
+                method, object_counts = self.determine_collection_method()
+                self.tree = (current_dbname, self.dbstate.db.get_save_path())
+                snapshot_key = get_snapshot_key(*self.tree, self.all_events)
                 with self.lock:
-                    self.data.clear()
+                    if not self.data:
+                        self.data = (
+                            load_statistics_snapshot(snapshot_key) or {}
+                        )
+                    self.ledgers.clear()
+                    self.partial = ({}, [])
+                    self.pending_changes.clear()
+                    self.data_stale = False
                     event = Event()
                     thread = Thread(
                         target=self.collect_statistics,
                         args=(
                             event,
                             current_dbname,
+                            snapshot_key,
+                            method,
+                            object_counts,
                         ),
                     )
                     self.threads.append((current_dbname, thread, event))
@@ -266,12 +513,29 @@ class StatisticsService(Callback):
                 event.set()
             with self.lock:
                 self.data.clear()
+                self.ledgers.clear()
+
+    def save_snapshot(self):
+        """
+        Save a snapshot of the current facts if they are complete and
+        reflect all changes made to the tree.
+        """
+        with self.lock:
+            if self.data and self.ledgers and not self.data_stale:
+                if not self.threads and not self.pending_changes:
+                    snapshot_key = get_snapshot_key(
+                        *self.tree, self.all_events
+                    )
+                    save_statistics_snapshot(snapshot_key, self.data)
 
     def database_changed(self, *_dummy_args):
         """
         Rescan the database.
         """
-        self.__init_signals()
+        self.save_snapshot()
+        with self.lock:
+            self.data = {}
+            self.ledgers.clear()
         self.spawn_collect_statistics()
 
     def request_data(self):
@@ -282,8 +546,18 @@ class StatisticsService(Callback):
             if self.data != {}:
                 return self.data
         self.spawn_collect_statistics()
+        with self.lock:
+            if self.data != {}:
+                return self.data
         return None
 
+    def get_partial_data(self):
+        """
+        Return the facts collected so far by a running collection along with
+        the categories they cover.
+        """
+        return self.partial
+
     def recalculate_data(self):
         """
         Force a statistics collection if one not running.
@@ -309,3 +583,28 @@ def find_statistics_service_worker():
                 filepath = os.path.join(root, "service_statistics_worker.py")
                 break
     return filepath
+
+
+def find_dependents(db, obj_type, handle):
+    """
+    Return handles of objects whose contribution depends on a changed object
+    other than the object itself.
+    """
+    dependents = {}
+    if obj_type == "Event":
+        dependents["Person"] = [
+            person_handle
+            for (dummy_class, person_handle) in db.find_backlink_handles(
+                handle, include_classes=["Person"]
+            )
+        ]
+    elif obj_type == "Family":
+        try:
+            family = db.get_family_from_handle(handle)
+        except HandleError:
+            return dependents
+        people = [family.father_handle, family.mother_handle] + [
+            child_ref.ref for child_ref in family.child_ref_list
+        ]
+        dependents["Person"] = [x for x in people if x]
+    return dependents
@@ -0,0 +1,784 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Statistics collection benchmark
+
+Generates synthetic SQLite trees and measures the serial and concurrent
+statistics collection methods against them, recording the time each
+category completed, the peak resident set size and the objects examined
+per second as JSON. Each measurement runs in a fresh process so the peak
+memory figures are not polluted by earlier runs.
+
+    python3 service_statistics_benchmark.py generate -s 10000 100000
+    python3 service_statistics_benchmark.py run -s 10000 -o results.json
+    python3 service_statistics_benchmark.py run -s 10000 -c results.json
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import subprocess
+import tempfile
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.cli.clidbman import CLIDbManager
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import lookup_family_tree, make_database
+from gramps.gen.dbstate import DbState
+from gramps.gen.lib import (
+    ChildRef,
+    Citation,
+    Date,
+    Event,
+    EventRef,
+    EventRoleType,
+    EventType,
+    Family,
+    FamilyRelType,
+    Media,
+    MediaRef,
+    Name,
+    Note,
+    NoteType,
+    Person,
+    Place,
+    PlaceName,
+    PlaceType,
+    RepoRef,
+    Repository,
+    RepositoryType,
+    Source,
+    Surname,
+    Tag,
+)
+from gramps.gen.utils.id import create_id
+
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# -------------------------------------------------------------------------
+try:
+    from .service_statistics_worker import (
+        gather_concurrent_statistics,
+        gather_serial_statistics,
+        get_object_counts,
+        prepare_event_table,
+    )
+except ImportError:
+    from service_statistics_worker import (
+        gather_concurrent_statistics,
+        gather_serial_statistics,
+        get_object_counts,
+        prepare_event_table,
+    )
+
+BENCHMARK_VERSION = 1
+BENCHMARK_SIZES = [10000, 100000, 500000]
+BENCHMARK_TREE = "CardView Benchmark %s"
+REGRESSION_THRESHOLD = 0.1
+
+# Approximate ratios taken from a number of real world trees. Object ratios
+# are relative to the number of people, the others are probabilities.
+RATIOS = {
+    "place": 0.05,
+    "source": 0.02,
+    "repository": 0.002,
+    "media": 0.03,
+    "note": 0.1,
+    "tag": 0.001,
+    "birth": 0.9,
+    "baptism": 0.2,
+    "death": 0.6,
+    "burial": 0.35,
+    "residence": 0.5,
+    "occupation": 0.3,
+    "marriage": 0.7,
+    "event_place": 0.8,
+    "event_date": 0.85,
+    "event_cited": 0.45,
+    "person_media": 0.05,
+    "person_note": 0.1,
+    "private": 0.02,
+    "tagged": 0.05,
+    "single": 0.1,
+}
+MAXIMUM_CHILDREN = 5
+MEDIA_PATH = "benchmark"
+
+GIVEN_NAMES = {
+    Person.MALE: ["John", "William", "James", "George", "Charles", "Thomas"],
+    Person.FEMALE: ["Mary", "Anna", "Elizabeth", "Margaret", "Sarah", "Emma"],
+    Person.UNKNOWN: ["Unknown"],
+}
+SURNAMES = [
+    "Smith",
+    "Johnson",
+    "Brown",
+    "Garner",
+    "Miller",
+    "Davis",
+    "Wilson",
+    "Moore",
+    "Taylor",
+    "Anderson",
+    "Thomas",
+    "Jackson",
+    "White",
+    "Harris",
+    "Martin",
+    "Thompson",
+]
+
+
+# -------------------------------------------------------------------------
+#
+# Tree generation
+#
+# -------------------------------------------------------------------------
+class TreeGenerator:
+    """
+    Populate a tree with synthetic people, families and the objects they
+    reference.
+    """
+
+    def __init__(self, db, trans, people, seed):
+        self.db = db
+        self.trans = trans
+        self.people = people
+        self.random = random.Random(seed)
+        self.added = 0
+        self.tags = []
+        self.places = []
+        self.sources = []
+        self.media = []
+
+    def chance(self, key):
+        """
+        Return True with the probability for a key.
+        """
+        return self.random.random() < RATIOS[key]
+
+    def number(self, key):
+        """
+        Return the number of objects of a type for the tree size.
+        """
+        return max(1, int(self.people * RATIOS[key]))
+
+    def pick(self, objects):
+        """
+        Return a random object handle.
+        """
+        return self.random.choice(objects)
+
+    def mark(self, obj):
+        """
+        Randomly mark an object private or tagged.
+        """
+        if self.chance("private"):
+            obj.set_privacy(True)
+        if self.chance("tagged"):
+            obj.add_tag(self.pick(self.tags))
+
+    def random_date(self, low, high):
+        """
+        Return a random date in a year range.
+        """
+        date = Date()
+        date.set_yr_mon_day(
+            self.random.randint(low, high),
+            self.random.randint(1, 12),
+            self.random.randint(1, 28),
+        )
+        return date
+
+    def generate(self):
+        """
+        Generate the tree.
+        """
+        self.generate_tags()
+        self.generate_sources()
+        self.generate_places()
+        self.generate_media()
+        while self.added < self.people:
+            self.generate_family(self.random.randint(1700, 1950))
+
+    def generate_tags(self):
+        """
+        Generate tags.
+        """
+        for index in range(self.number("tag")):
+            tag = Tag()
+            tag.set_name("Benchmark %s" % index)
+            self.tags.append(self.db.add_tag(tag, self.trans))
+
+    def generate_sources(self):
+        """
+        Generate repositories and the sources held in them.
+        """
+        repositories = []
+        for index in range(self.number("repository")):
+            repository = Repository()
+            repository.set_name("Repository %s" % index)
+            repository.set_type(RepositoryType(RepositoryType.ARCHIVE))
+            self.mark(repository)
+            repositories.append(
+                self.db.add_repository(repository, self.trans)
+            )
+        for index in range(self.number("source")):
+            source = Source()
+            source.set_title("Source %s" % index)
+            if self.random.random() < 0.5:
+                source.set_author(self.pick(SURNAMES))
+            repo_ref = RepoRef()
+            repo_ref.set_reference_handle(self.pick(repositories))
+            source.add_repo_reference(repo_ref)
+            self.mark(source)
+            self.sources.append(self.db.add_source(source, self.trans))
+
+    def generate_places(self):
+        """
+        Generate places.
+        """
+        for index in range(self.number("place")):
+            place = Place()
+            name = PlaceName()
+            name.set_value("Place %s" % index)
+            place.set_name(name)
+            place.set_type(PlaceType(PlaceType.CITY))
+            if self.random.random() < 0.5:
+                place.set_latitude(str(self.random.uniform(-90, 90)))
+                place.set_longitude(str(self.random.uniform(-180, 180)))
+            self.mark(place)
+            self.places.append(self.db.add_place(place, self.trans))
+
+    def generate_media(self):
+        """
+        Generate media objects. The files do not exist so they are also
+        reported as missing.
+        """
+        for index in range(self.number("media")):
+            media = Media()
+            media.set_path(os.path.join(MEDIA_PATH, "%s.jpg" % index))
+            media.set_mime_type("image/jpeg")
+            media.set_description("Media %s" % index)
+            self.mark(media)
+            self.media.append(self.db.add_media(media, self.trans))
+
+    def generate_note(self):
+        """
+        Generate a note and return the handle.
+        """
+        note = Note()
+        note.set("Benchmark note text")
+        note.set_type(NoteType(NoteType.GENERAL))
+        return self.db.add_note(note, self.trans)
+
+    def generate_citation(self):
+        """
+        Generate a citation of a random source and return the handle.
+        """
+        citation = Citation()
+        citation.set_reference_handle(self.pick(self.sources))
+        citation.set_page("Page %s" % self.random.randint(1, 500))
+        citation.set_confidence_level(self.random.randint(0, 4))
+        self.mark(citation)
+        return self.db.add_citation(citation, self.trans)
+
+    def generate_event(self, event_type, year):
+        """
+        Generate an event and return the handle.
+        """
+        event = Event()
+        event.set_type(EventType(event_type))
+        if self.chance("event_date"):
+            event.set_date_object(self.random_date(year, year + 1))
+        if self.chance("event_place"):
+            event.set_place_handle(self.pick(self.places))
+        if self.chance("event_cited"):
+            event.add_citation(self.generate_citation())
+        self.mark(event)
+        return self.db.add_event(event, self.trans)
+
+    def generate_person(self, gender, year):
+        """
+        Generate a person and their events, returning the person.
+        """
+        person = Person()
+        person.set_handle(create_id())
+        person.set_gender(gender)
+        name = Name()
+        name.set_first_name(self.pick(GIVEN_NAMES[gender]))
+        surname = Surname()
+        surname.set_surname(self.pick(SURNAMES))
+        name.add_surname(surname)
+        person.set_primary_name(name)
+
+        for (key, event_type, offset) in [
+            ("birth", EventType.BIRTH, 0),
+            ("baptism", EventType.BAPTISM, 0),
+            ("residence", EventType.RESIDENCE, 25),
+            ("occupation", EventType.OCCUPATION, 25),
+            ("death", EventType.DEATH, 70),
+            ("burial", EventType.BURIAL, 70),
+        ]:
+            if self.chance(key):
+                event_ref = EventRef()
+                event_ref.set_reference_handle(
+                    self.generate_event(event_type, year + offset)
+                )
+                event_ref.set_role(EventRoleType(EventRoleType.PRIMARY))
+                person.add_event_ref(event_ref)
+                if key == "birth":
+                    person.set_birth_ref(event_ref)
+                elif key == "death":
+                    person.set_death_ref(event_ref)
+
+        if self.chance("person_media"):
+            media_ref = MediaRef()
+            media_ref.set_reference_handle(self.pick(self.media))
+            person.add_media_reference(media_ref)
+        if self.chance("person_note"):
+            person.add_note(self.generate_note())
+        self.mark(person)
+        self.added += 1
+        return person
+
+    def generate_family(self, year):
+        """
+        Generate a family with parents and children, or a single person.
+        """
+        if self.chance("single"):
+            gender = self.random.choice(list(GIVEN_NAMES))
+            self.db.add_person(
+                self.generate_person(gender, year), self.trans
+            )
+            return
+
+        family = Family()
+        family.set_handle(create_id())
+        family.set_relationship(FamilyRelType(FamilyRelType.MARRIED))
+        father = self.generate_person(Person.MALE, year)
+        mother = self.generate_person(Person.FEMALE, year + 2)
+        family.set_father_handle(father.handle)
+        family.set_mother_handle(mother.handle)
+        members = [father, mother]
+        for parent in members:
+            parent.add_family_handle(family.handle)
+
+        if self.chance("marriage"):
+            event_ref = EventRef()
+            event_ref.set_reference_handle(
+                self.generate_event(EventType.MARRIAGE, year + 22)
+            )
+            event_ref.set_role(EventRoleType(EventRoleType.FAMILY))
+            family.add_event_ref(event_ref)
+
+        for index in range(self.random.randint(0, MAXIMUM_CHILDREN)):
+            if self.added >= self.people:
+                break
+            gender = self.random.choice([Person.MALE, Person.FEMALE])
+            child = self.generate_person(gender, year + 24 + index * 2)
+            child.add_parent_family_handle(family.handle)
+            child_ref = ChildRef()
+            child_ref.set_reference_handle(child.handle)
+            family.add_child_ref(child_ref)
+            members.append(child)
+
+        self.mark(family)
+        for person in members:
+            self.db.add_person(person, self.trans)
+        self.db.add_family(family, self.trans)
+
+
+def generate_tree(people, seed=0, force=False):
+    """
+    Generate a synthetic tree with the given number of people and return
+    the name, skipping generation if it already exists unless forced.
+    """
+    tree_name = BENCHMARK_TREE % people
+    data = lookup_family_tree(tree_name)
+    if data:
+        if not force:
+            return tree_name
+        CLIDbManager(DbState()).remove_database(tree_name)
+
+    start_time = time.time()
+    manager = CLIDbManager(DbState())
+    path, dummy_title = manager.create_new_db_cli(tree_name, dbid="sqlite")
+    db = make_database("sqlite")
+    db.load(path)
+    try:
+        with DbTxn("Generate benchmark tree", db, batch=True) as trans:
+            TreeGenerator(db, trans, people, seed).generate()
+    except:
+        db.close()
+        manager.remove_database(tree_name)
+        raise
+    db.close()
+    print(
+        "Generated {0} in {1:.1f} seconds".format(
+            tree_name, time.time() - start_time
+        ),
+        file=sys.stderr,
+    )
+    return tree_name
+
+
+# -------------------------------------------------------------------------
+#
+# Measurement
+#
+# -------------------------------------------------------------------------
+def measure(tree_name, mode, options):
+    """
+    Collect the statistics for a tree with the given method and return the
+    measurements.
+    """
+    args = {
+        "tree_name": tree_name,
+        "all_events": options.get("all_events"),
+        "raw": options.get("raw"),
+        "serial": mode == "serial",
+        "ledger": True,
+        "workers": options.get("workers"),
+    }
+    object_counts = get_object_counts(tree_name)
+    obj_list = [x for (x, y) in object_counts]
+    total = sum([y for (x, y) in object_counts])
+
+    start_time = time.time()
+    args = prepare_event_table(args)
+    categories = {}
+    if args.get("event_table") is not None:
+        categories["EventTable"] = {
+            "objects": len(args["event_table"]),
+            "completed": time.time() - start_time,
+        }
+    last_time = [time.time()]
+
+    def collected(obj_type, ledger):
+        now = time.time()
+        result = {
+            "objects": ledger["counters"].get("total", 0),
+            "completed": now - start_time,
+        }
+        if mode == "serial":
+            result["seconds"] = now - last_time[0]
+        last_time[0] = now
+        categories[obj_type] = result
+
+    if mode == "serial":
+        gather_serial_statistics(args, obj_list, callback=collected)
+    else:
+        gather_concurrent_statistics(
+            args, obj_list, object_counts=object_counts, callback=collected
+        )
+    seconds = time.time() - start_time
+
+    return {
+        "tree": tree_name,
+        "mode": mode,
+        "all_events": bool(args.get("all_events")),
+        "raw": bool(args.get("raw")),
+        "objects": total,
+        "seconds": seconds,
+        "objects_per_second": total / seconds if seconds else 0,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "peak_child_rss_kb": resource.getrusage(
+            resource.RUSAGE_CHILDREN
+        ).ru_maxrss,
+        "categories": categories,
+    }
+
+
+def run_measurement(tree_name, mode, options):
+    """
+    Run a measurement in a fresh process and return the results.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output = os.path.join(temp_dir, "result.json")
+        command = [
+            sys.executable,
+            os.path.abspath(__file__),
+            "measure",
+            "-t",
+            tree_name,
+            "-m",
+            mode,
+            "-w",
+            str(options.get("workers") or 0),
+            "-o",
+            output,
+        ]
+        if options.get("all_events"):
+            command.append("-a")
+        if options.get("raw"):
+            command.append("-r")
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        with open(output, "r", encoding="utf-8") as result_file:
+            return json.load(result_file)
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Compare results to a baseline and return a description of each
+    measurement that took longer than allowed.
+    """
+    expected = {}
+    for result in baseline.get("results", []):
+        key = (
+            result["tree"],
+            result["mode"],
+            result["all_events"],
+            result["raw"],
+        )
+        expected[key] = result
+
+    regressions = []
+    for result in results:
+        key = (
+            result["tree"],
+            result["mode"],
+            result["all_events"],
+            result["raw"],
+        )
+        if key not in expected:
+            continue
+        old = expected[key]
+        checks = [("total", old["seconds"], result["seconds"])]
+        for (category, values) in result["categories"].items():
+            if category in old["categories"]:
+                checks.append(
+                    (
+                        category,
+                        old["categories"][category]["completed"],
+                        values["completed"],
+                    )
+                )
+        for (label, old_seconds, new_seconds) in checks:
+            if old_seconds and new_seconds > old_seconds * (1 + threshold):
+                regressions.append(
+                    "{0} {1} {2}: {3:.3f}s to {4:.3f}s".format(
+                        result["tree"],
+                        result["mode"],
+                        label,
+                        old_seconds,
+                        new_seconds,
+                    )
+                )
+    return regressions
+
+
+def run_benchmarks(trees, modes, options):
+    """
+    Measure each tree with each method and return the report.
+    """
+    results = []
+    for tree_name in trees:
+        for mode in modes:
+            for dummy_repeat in range(options.get("repeat") or 1):
+                result = run_measurement(tree_name, mode, options)
+                print(
+                    "{0:<28} {1:<10} {2:8} objects {3:8.3f}s "
+                    "{4:10.0f}/s {5:8} KB".format(
+                        tree_name,
+                        mode,
+                        result["objects"],
+                        result["seconds"],
+                        result["objects_per_second"],
+                        result["peak_rss_kb"],
+                    ),
+                    file=sys.stderr,
+                )
+                results.append(result)
+    return {
+        "version": BENCHMARK_VERSION,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+def main():
+    """
+    Main program.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "command",
+        choices=["generate", "run", "measure"],
+        help="Generate trees, run the benchmarks or take one measurement",
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        dest="sizes",
+        nargs="+",
+        type=int,
+        default=BENCHMARK_SIZES,
+        help="Numbers of people in the synthetic trees",
+    )
+    parser.add_argument(
+        "-t",
+        "--tree",
+        dest="trees",
+        action="append",
+        help="Benchmark an existing tree instead of synthetic ones",
+    )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        dest="modes",
+        action="append",
+        choices=["serial", "concurrent"],
+        help="Collection methods to measure, defaults to both",
+    )
+    parser.add_argument(
+        "-a",
+        "--all",
+        dest="all_events",
+        default=False,
+        action="store_true",
+        help="Examine all person events",
+    )
+    parser.add_argument(
+        "-r",
+        "--raw",
+        dest="raw",
+        default=False,
+        action="store_true",
+        help="Examine serialized objects instead of full objects",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        default=0,
+        type=int,
+        help="Number of worker processes in concurrent mode",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        dest="repeat",
+        default=1,
+        type=int,
+        help="Number of times to repeat each measurement",
+    )
+    parser.add_argument(
+        "--seed",
+        dest="seed",
+        default=0,
+        type=int,
+        help="Random seed for tree generation",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        dest="force",
+        default=False,
+        action="store_true",
+        help="Regenerate synthetic trees that already exist",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        help="File to write the JSON results to instead of standard output",
+    )
+    parser.add_argument(
+        "-c",
+        "--compare",
+        dest="compare",
+        help="Baseline JSON results to check for regressions against",
+    )
+    parser.add_argument(
+        "--threshold",
+        dest="threshold",
+        default=REGRESSION_THRESHOLD,
+        type=float,
+        help="Fraction a time may exceed the baseline by",
+    )
+    parsed_args = parser.parse_args()
+
+    options = {
+        "all_events": parsed_args.all_events,
+        "raw": parsed_args.raw,
+        "workers": parsed_args.workers,
+        "repeat": parsed_args.repeat,
+    }
+    trees = parsed_args.trees
+    if parsed_args.command == "measure":
+        if not trees or not parsed_args.modes:
+            parser.error("measure requires a tree and a mode")
+        report = measure(trees[0], parsed_args.modes[0], options)
+    else:
+        if not trees:
+            trees = [
+                generate_tree(
+                    size, seed=parsed_args.seed, force=parsed_args.force
+                )
+                for size in parsed_args.sizes
+            ]
+        if parsed_args.command == "generate":
+            sys.exit(0)
+        report = run_benchmarks(
+            trees, parsed_args.modes or ["serial", "concurrent"], options
+        )
+
+    if parsed_args.output:
+        with open(parsed_args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if parsed_args.compare:
+        with open(parsed_args.compare, "r", encoding="utf-8") as compare_file:
+            baseline = json.load(compare_file)
+        regressions = find_regressions(
+            report["results"], baseline, parsed_args.threshold
+        )
+        for regression in regressions:
+            print("Regression: %s" % regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Statistics demographic distributions
+
+The analyzers record a row of int32 samples for each object that has
+something to contribute. The handles in a row are replaced by keys as it
+is added to a ledger, a key being the position counting from one of the
+handle in the list kept with the samples, so rows can be found again
+exactly when an object changes and joined across ledgers. The ledgers
+kept by the service share a single list so the joins need no mapping.
+Dates are kept as sort values, which are day numbers, so the
+distributions are reduced from the sample arrays in a single vectorized
+pass including the joins between people, families and marriage events.
+
+NumPy is optional. Without it no samples are recorded and there are no
+distributions.
+
+This module must not import anything from the plugin as it is also loaded
+by the worker when run as a standalone script.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Number of int32 fields in a row of each kind of sample. The first field
+# is always the key of the object the row belongs to.
+SAMPLE_FIELDS = {
+    # person key, birth sort value, death sort value
+    "person": 3,
+    # family key, number of children
+    "family": 2,
+    # family key, event key, father key, mother key
+    "family_event": 4,
+    # event key, marriage sort value
+    "marriage": 2,
+}
+
+# Fields in a row of each kind of sample holding the key of an object.
+KEY_FIELDS = {
+    "person": (0,),
+    "family": (0,),
+    "family_event": (0, 1, 2, 3),
+    "marriage": (0,),
+}
+
+# Share of cleared rows at which an array of samples is compacted
+COMPACT_RATIO = 0.25
+
+DAYS_PER_YEAR = 365.2425
+MAXIMUM_AGE = 150
+
+
+def get_sample_index(ledger):
+    """
+    Return the keys for the handles recorded with the samples in a ledger,
+    rebuilding them from the list of handles after a transfer.
+    """
+    index = ledger.get("sample_index")
+    if index is None:
+        handles = ledger.setdefault("sample_handles", [])
+        index = ledger["sample_index"] = {
+            handle: key for (key, handle) in enumerate(handles, 1)
+        }
+    return index
+
+
+def get_sample_key(ledger, handle, add=True):
+    """
+    Return the key for an object handle in a ledger, recording the handle
+    if needed. The key is zero for no handle, or for a handle not recorded
+    when it is not to be added.
+    """
+    if not handle:
+        return 0
+    index = get_sample_index(ledger)
+    key = index.get(handle)
+    if key is None:
+        if not add:
+            return 0
+        handles = ledger["sample_handles"]
+        handles.append(handle)
+        key = index[handle] = len(handles)
+    return key
+
+
+def encode_sample(ledger, name, row):
+    """
+    Return a row of samples with the handles replaced by their keys.
+    """
+    fields = KEY_FIELDS[name]
+    return [
+        get_sample_key(ledger, value) if field in fields else value
+        for (field, value) in enumerate(row)
+    ]
+
+
+def get_key_map(source, target, add=False):
+    """
+    Return an array mapping the keys of one ledger to the keys for the same
+    handles in another, zero where not found.
+    """
+    keys = [0]
+    keys.extend(
+        [
+            get_sample_key(target, handle, add=add)
+            for handle in source.get("sample_handles") or ()
+        ]
+    )
+    return numpy.array(keys, dtype=numpy.int32)
+
+
+def map_sample_keys(values, name, key_map):
+    """
+    Map the keys in an array of samples in place.
+    """
+    rows = numpy.frombuffer(values, dtype=numpy.int32).reshape(
+        -1, SAMPLE_FIELDS[name]
+    )
+    for field in KEY_FIELDS[name]:
+        rows[:, field] = key_map[rows[:, field]]
+    del rows
+
+
+def share_sample_keys(ledgers):
+    """
+    Make the ledgers share one list of handles, mapping the keys in their
+    samples to it, so the samples are joined across ledgers by key alone.
+    Handles added later are added to the shared list.
+    """
+    shared = None
+    for ledger in ledgers.values():
+        if shared is None:
+            shared = ledger
+            get_sample_index(shared)
+            continue
+        if ledger.get("sample_handles") is shared["sample_handles"]:
+            continue
+        samples = ledger.setdefault("samples", {})
+        if samples:
+            key_map = get_key_map(ledger, shared, add=True)
+            for (name, values) in list(samples.items()):
+                values = samples[name] = load_samples(values)
+                map_sample_keys(values, name, key_map)
+        ledger["sample_handles"] = shared["sample_handles"]
+        ledger["sample_index"] = shared["sample_index"]
+
+
+def get_join_keys(source, target, keys):
+    """
+    Return the keys in one ledger as keys in another, mapping them unless
+    the ledgers share their handles.
+    """
+    if source.get("sample_handles") is target.get("sample_handles"):
+        return keys
+    return get_key_map(source, target)[keys]
+
+
+def get_sample_rows(ledger, name):
+    """
+    Return the rows of samples of a given kind in use in a ledger with the
+    keys replaced by their handles.
+    """
+    handles = [""] + list(ledger.get("sample_handles") or ())
+    fields = KEY_FIELDS[name]
+    samples = iter(load_samples((ledger.get("samples") or {}).get(name, b"")))
+    return [
+        tuple(
+            handles[value] if field in fields else value
+            for (field, value) in enumerate(row)
+        )
+        for row in zip(*[samples] * SAMPLE_FIELDS[name])
+        if row[0]
+    ]
+
+
+def add_sample(stats, name, row):
+    """
+    Add a row of samples to an object contribution, with the handles of
+    the objects in it in place of their keys.
+    """
+    if numpy is not None:
+        stats.setdefault("samples", []).append((name, row))
+
+
+def add_family_samples(stats, handle, children, parents, event_handles):
+    """
+    Add the samples for a family, and for each of its events when there is
+    a parent whose age at the event could be found.
+    """
+    add_sample(stats, "family", (handle, children))
+    if any(parents):
+        (father_handle, mother_handle) = parents
+        for event_handle in event_handles:
+            add_sample(
+                stats,
+                "family_event",
+                (handle, event_handle, father_handle, mother_handle),
+            )
+
+
+def load_samples(values):
+    """
+    Return samples as an array, converting them from bytes after a transfer.
+    """
+    if isinstance(values, array):
+        return values
+    samples = array("i")
+    samples.frombytes(values)
+    return samples
+
+
+def clear_samples(values, name, key):
+    """
+    Clear the rows of samples recorded for an object by its key. Rows are
+    zeroed in place rather than removed, so the array only needs to be
+    rebuilt once many are cleared. Returns True if it should be compacted.
+    """
+    rows = numpy.frombuffer(values, dtype=numpy.int32).reshape(
+        -1, SAMPLE_FIELDS[name]
+    )
+    rows[rows[:, 0] == key] = 0
+    cleared = numpy.count_nonzero(rows[:, 0] == 0)
+    compact = cleared > len(rows) * COMPACT_RATIO
+    del rows
+    return compact
+
+
+def compact_samples(values, name):
+    """
+    Return an array of samples without the cleared rows.
+    """
+    rows = numpy.frombuffer(values, dtype=numpy.int32).reshape(
+        -1, SAMPLE_FIELDS[name]
+    )
+    samples = array("i")
+    samples.frombytes(rows[rows[:, 0] != 0].tobytes())
+    del rows
+    return samples
+
+
+def get_rows(ledgers, obj_type, name):
+    """
+    Return the rows of samples still in use.
+    """
+    ledger = ledgers.get(obj_type) or {}
+    values = (ledger.get("samples") or {}).get(name)
+    if not values:
+        return numpy.zeros((0, SAMPLE_FIELDS[name]), dtype=numpy.int32)
+    rows = numpy.frombuffer(values, dtype=numpy.int32).reshape(
+        -1, SAMPLE_FIELDS[name]
+    )
+    return rows[rows[:, 0] != 0]
+
+
+def get_years(sortvals):
+    """
+    Return the Gregorian years for an array of sort values.
+    """
+    temp = (sortvals.astype(numpy.int64) + 32045) * 4 - 1
+    century = temp // 146097
+    temp = ((temp % 146097) // 4) * 4 + 3
+    years = century * 100 + temp // 1461
+    day_of_year = (temp % 1461) // 4 + 1
+    years = years + ((day_of_year * 5 - 3) // 153 >= 10) - 4800
+    return numpy.where(years <= 0, years - 1, years)
+
+
+def lookup(keys, table_keys, table_values):
+    """
+    Return a mask of the keys found in a table and the values found.
+    """
+    if not table_keys.size:
+        return numpy.zeros(keys.shape, dtype=bool), keys
+    order = numpy.argsort(table_keys, kind="stable")
+    sorted_keys = table_keys[order]
+    index = numpy.minimum(
+        numpy.searchsorted(sorted_keys, keys), sorted_keys.size - 1
+    )
+    return sorted_keys[index] == keys, table_values[order][index]
+
+
+def histogram(values, width):
+    """
+    Return the total, median and non-empty bins of a distribution, each
+    bin being the lower bound and the count.
+    """
+    if not values.size:
+        return {"total": 0, "median": None, "bins": []}
+    bins = values // width
+    low = int(bins.min())
+    counts = numpy.bincount(bins - low)
+    return {
+        "total": int(values.size),
+        "median": float(numpy.median(values)),
+        "bins": [
+            [int((low + index) * width), int(total)]
+            for (index, total) in enumerate(counts.tolist())
+            if total
+        ],
+    }
+
+
+def get_ages(start, end):
+    """
+    Return the ages in whole years between two arrays of sort values.
+    """
+    ages = ((end - start) / DAYS_PER_YEAR).astype(numpy.int64)
+    return ages[(ages >= 0) & (ages <= MAXIMUM_AGE)]
+
+
+def summarize_distributions(ledgers):
+    """
+    Return the distributions that can be reduced from the samples in the
+    ledgers available.
+    """
+    if numpy is None:
+        return {}
+    distributions = {}
+    people = get_rows(ledgers, "Person", "person")
+    births = people[people[:, 1] > 0]
+
+    if "Person" in ledgers:
+        distributions["birth_year"] = histogram(get_years(births[:, 1]), 10)
+        lived = people[(people[:, 1] > 0) & (people[:, 2] > 0)]
+        distributions["lifespan"] = histogram(
+            get_ages(lived[:, 1], lived[:, 2]), 5
+        )
+
+    if all(category in ledgers for category in ("Person", "Family", "Event")):
+        marriages = get_rows(ledgers, "Event", "marriage")
+        family_events = get_rows(ledgers, "Family", "family_event")
+        (found, dates) = lookup(
+            get_join_keys(
+                ledgers["Family"], ledgers["Event"], family_events[:, 1]
+            ),
+            marriages[:, 0],
+            marriages[:, 1],
+        )
+        family_events = family_events[found]
+        dates = dates[found]
+        parent_keys = get_join_keys(
+            ledgers["Family"], ledgers["Person"], family_events[:, 2:4]
+        )
+        ages = []
+        for column in (0, 1):
+            (found, birth_dates) = lookup(
+                parent_keys[:, column],
+                births[:, 0],
+                births[:, 1],
+            )
+            ages.append(get_ages(birth_dates[found], dates[found]))
+        distributions["marriage_age"] = histogram(numpy.concatenate(ages), 5)
+
+    if "Family" in ledgers:
+        families = get_rows(ledgers, "Family", "family")
+        distributions["family_size"] = histogram(families[:, 1], 1)
+
+    if not distributions:
+        return {}
+    return {"distribution": distributions}
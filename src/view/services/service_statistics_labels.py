@@ -279,3 +279,18 @@ BOOKMARK_LABELS = {
     "repository": _("Repository bookmarks"),
     "note": _("Note bookmarks"),
 }
+
+
+DISTRIBUTION_LABELS = {
+    "birth_year": _("People with a birth date"),
+    "lifespan": _("People with birth and death dates"),
+    "marriage_age": _("Spouses with birth and marriage dates"),
+    "family_size": _("Number of families"),
+    "median": _("Median"),
+    "unavailable": _("Requires NumPy"),
+    "decade": _("%(start)s to %(end)s"),
+    "years": _("%(start)s to %(end)s years"),
+    "no_children": _("No children"),
+    "child": _("1 child"),
+    "children": _("%s children"),
+}
@@ -0,0 +1,188 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Statistics media file probing
+
+Media files are probed concurrently using a thread pool as on network
+file systems the time is spent waiting on the server. The results are
+kept in a cache per tree holding the modification time and size of each
+file along with the modification time of the directory it is in. Adding,
+removing or renaming a file changes the directory modification time, so
+the files in a directory that has not changed are not probed again until
+the cached entry expires.
+
+This module must not import anything from the plugin as it is also loaded
+by the worker when run as a standalone script.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import VERSION_DIR
+
+PROBE_WORKERS = 16
+PROBE_CACHE_VERSION = 1
+PROBE_CACHE_MAX_AGE = 86400
+PROBE_CACHE_DIRECTORY = os.path.join(VERSION_DIR, "statistics")
+
+
+def get_probe_cache_path(dbname):
+    """
+    Return the media probe cache file path for a tree.
+    """
+    tree_hash = hashlib.sha1(dbname.encode("utf-8")).hexdigest()
+    return os.path.join(
+        PROBE_CACHE_DIRECTORY, "CardView_media_%s.json" % tree_hash
+    )
+
+
+def load_probe_cache(cache_path):
+    """
+    Return the cached directory entries.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    if cache.get("version") != PROBE_CACHE_VERSION:
+        return {}
+    return cache.get("directories") or {}
+
+
+def save_probe_cache(cache_path, directories):
+    """
+    Update the cache with the probed directory entries. Entries for other
+    directories are kept as other workers may have probed them.
+    """
+    cache = load_probe_cache(cache_path)
+    for (directory, entry) in directories.items():
+        if entry is None:
+            cache.pop(directory, None)
+        else:
+            cache[directory] = entry
+    temp_path = "%s.%s.tmp" % (cache_path, os.getpid())
+    try:
+        if not os.path.isdir(PROBE_CACHE_DIRECTORY):
+            os.makedirs(PROBE_CACHE_DIRECTORY)
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(
+                {"version": PROBE_CACHE_VERSION, "directories": cache},
+                cache_file,
+            )
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+
+def stat_path(path):
+    """
+    Return the modification time and size of a path if it exists.
+    """
+    try:
+        result = os.stat(path)
+    except OSError:
+        return None
+    return (result.st_mtime, result.st_size)
+
+
+def probe_media_files(paths, cache_path=None, workers=PROBE_WORKERS):
+    """
+    Return the size of each file keyed by path, or None if it was not found.
+    """
+    by_directory = {}
+    for path in paths:
+        (directory, name) = os.path.split(path)
+        by_directory.setdefault(directory, set()).add(name)
+    if not by_directory:
+        return {}
+
+    cache = load_probe_cache(cache_path) if cache_path else {}
+    now = time.time()
+    sizes = {}
+    updated = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        directories = list(by_directory)
+        directory_stats = executor.map(
+            stat_path, [directory or os.curdir for directory in directories]
+        )
+        pending = []
+        for (directory, directory_stat) in zip(directories, directory_stats):
+            names = by_directory[directory]
+            if directory_stat is None:
+                for name in names:
+                    sizes[os.path.join(directory, name)] = None
+                updated[directory] = None
+                continue
+
+            entry = cache.get(directory)
+            if (
+                entry
+                and entry.get("mtime") == directory_stat[0]
+                and now - entry.get("checked", 0) < PROBE_CACHE_MAX_AGE
+            ):
+                files = entry.get("files") or {}
+                checked = entry["checked"]
+            else:
+                files = {}
+                checked = now
+            for name in names:
+                if name in files:
+                    file_stat = files[name]
+                    sizes[os.path.join(directory, name)] = (
+                        file_stat[1] if file_stat else None
+                    )
+                else:
+                    pending.append((directory, name))
+            updated[directory] = {
+                "mtime": directory_stat[0],
+                "checked": checked,
+                "files": files,
+            }
+
+        file_stats = executor.map(
+            stat_path,
+            [os.path.join(directory, name) for (directory, name) in pending],
+        )
+        for ((directory, name), file_stat) in zip(pending, file_stats):
+            updated[directory]["files"][name] = file_stat
+            sizes[os.path.join(directory, name)] = (
+                file_stat[1] if file_stat else None
+            )
+
+    if cache_path:
+        save_probe_cache(cache_path, updated)
+    return sizes
@@ -0,0 +1,124 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Statistics worker framed protocol
+
+Every frame is a fixed size header holding a magic marker, the protocol
+version, the frame type and the payload length, followed by the payload.
+Payloads are encoded with marshal, which only supports the builtin value
+types the statistics are made of and unlike pickle never imports modules
+or calls constructors when decoding.
+
+This module must not import anything from the plugin as it is also loaded
+by the worker when run as a standalone script.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import marshal
+import struct
+from threading import Lock
+
+PROTOCOL_MAGIC = b"CVST"
+PROTOCOL_VERSION = 1
+MARSHAL_VERSION = 4
+FRAME_HEADER = struct.Struct("!4sBBI")
+
+FRAME_PROGRESS = 1
+FRAME_PARTIAL = 2
+FRAME_RESULT = 3
+FRAME_CANCELLED = 4
+FRAME_ERROR = 5
+FRAME_TYPES = (
+    FRAME_PROGRESS,
+    FRAME_PARTIAL,
+    FRAME_RESULT,
+    FRAME_CANCELLED,
+    FRAME_ERROR,
+)
+
+
+class ProtocolError(ValueError):
+    """
+    Raised when a stream does not hold a valid frame.
+    """
+
+
+# -------------------------------------------------------------------------
+#
+# FrameWriter
+#
+# -------------------------------------------------------------------------
+class FrameWriter:
+    """
+    Write frames to a binary stream, serializing writers so frames from
+    different threads are never interleaved.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = Lock()
+
+    def write(self, frame_type, payload=None):
+        """
+        Encode and write a frame.
+        """
+        data = marshal.dumps(payload, MARSHAL_VERSION)
+        header = FRAME_HEADER.pack(
+            PROTOCOL_MAGIC, PROTOCOL_VERSION, frame_type, len(data)
+        )
+        with self.lock:
+            self.stream.write(header)
+            self.stream.write(data)
+            self.stream.flush()
+
+
+def read_exactly(stream, size):
+    """
+    Read the given number of bytes from a stream that may return less.
+    """
+    chunks = []
+    while size > 0:
+        chunk = stream.read(size)
+        if not chunk:
+            raise EOFError
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(stream):
+    """
+    Read a frame and return the frame type and payload.
+    """
+    (magic, version, frame_type, size) = FRAME_HEADER.unpack(
+        read_exactly(stream, FRAME_HEADER.size)
+    )
+    if magic != PROTOCOL_MAGIC:
+        raise ProtocolError("Invalid frame marker")
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError("Unsupported protocol version %s" % version)
+    if frame_type not in FRAME_TYPES:
+        raise ProtocolError("Unknown frame type %s" % frame_type)
+    return frame_type, marshal.loads(read_exactly(stream, size))
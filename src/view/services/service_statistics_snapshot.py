@@ -0,0 +1,131 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Statistics snapshot persistence
+
+Snapshots are encoded with marshal like the frames of the worker
+protocol, so loading one never imports modules or calls constructors.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import hashlib
+import marshal
+import os
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import VERSION_DIR
+from gramps.gen.db import DBLOCKFN
+
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# -------------------------------------------------------------------------
+from .service_statistics_protocol import MARSHAL_VERSION
+
+SNAPSHOT_VERSION = 3
+SNAPSHOT_DIRECTORY = os.path.join(VERSION_DIR, "statistics")
+
+
+def get_database_mtime(save_path):
+    """
+    Return the last modification time for the files backing a tree.
+    """
+    sqlite_file = os.path.join(save_path, "sqlite.db")
+    if os.path.isfile(sqlite_file):
+        return os.path.getmtime(sqlite_file)
+    mtime = 0
+    for file_name in os.listdir(save_path):
+        if file_name == DBLOCKFN:
+            continue
+        file_path = os.path.join(save_path, file_name)
+        if os.path.isfile(file_path):
+            mtime = max(mtime, os.path.getmtime(file_path))
+    return mtime
+
+
+def get_snapshot_key(dbname, save_path, all_events):
+    """
+    Return the key a snapshot for a tree must match to be valid.
+    """
+    if not dbname or not save_path:
+        return None
+    try:
+        mtime = get_database_mtime(save_path)
+    except OSError:
+        return None
+    return (SNAPSHOT_VERSION, dbname, mtime, bool(all_events))
+
+
+def get_snapshot_path(dbname):
+    """
+    Return the snapshot file path for a tree.
+    """
+    tree_hash = hashlib.sha1(dbname.encode("utf-8")).hexdigest()
+    return os.path.join(
+        SNAPSHOT_DIRECTORY, "CardView_statistics_%s.marshal" % tree_hash
+    )
+
+
+def load_statistics_snapshot(key):
+    """
+    Return the saved facts if a snapshot matching the key exists.
+    """
+    if not key:
+        return None
+    try:
+        with open(get_snapshot_path(key[1]), "rb") as snapshot_file:
+            snapshot = marshal.load(snapshot_file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("key") != key:
+        return None
+    facts = snapshot.get("facts")
+    if not isinstance(facts, dict):
+        return None
+    return facts
+
+
+def save_statistics_snapshot(key, facts):
+    """
+    Save the facts for a tree along with the key they are valid for.
+    """
+    if not key or not facts:
+        return
+    file_name = get_snapshot_path(key[1])
+    temp_name = "%s.tmp" % file_name
+    try:
+        if not os.path.isdir(SNAPSHOT_DIRECTORY):
+            os.makedirs(SNAPSHOT_DIRECTORY)
+        data = marshal.dumps({"key": key, "facts": facts}, MARSHAL_VERSION)
+        with open(temp_name, "wb") as snapshot_file:
+            snapshot_file.write(data)
+        os.replace(temp_name, file_name)
+    except (OSError, ValueError):
+        pass
@@ -0,0 +1,258 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2022       Christopher Horn
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Statistics collection method tuning
+
+The throughput of each category is measured for every collection and kept
+per tree and machine for each collection method, serial or concurrent with
+a given number of workers, along with the fixed cost of the method such as
+starting the workers, opening the tree and preparing the scans. The method
+with the lowest predicted time for the current object counts is chosen.
+Until any are measured the configured threshold decides, and methods not
+yet measured are tried while the collection is expected to be short
+enough that a poor choice is cheap.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python Modules
+#
+# -------------------------------------------------------------------------
+import hashlib
+import json
+import os
+import platform
+import time
+
+# -------------------------------------------------------------------------
+#
+# Gramps Modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import VERSION_DIR
+
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# -------------------------------------------------------------------------
+from .service_statistics_snapshot import get_database_mtime
+
+TUNING_VERSION = 3
+TUNING_DIRECTORY = os.path.join(VERSION_DIR, "statistics")
+TUNING_MAX_AGE = 7 * 86400
+TUNING_WEIGHT = 0.5
+EXPLORE_LIMIT = 30
+
+COUNT_METHODS = [
+    ("Person", "get_number_of_people"),
+    ("Family", "get_number_of_families"),
+    ("Event", "get_number_of_events"),
+    ("Place", "get_number_of_places"),
+    ("Media", "get_number_of_media"),
+    ("Source", "get_number_of_sources"),
+    ("Citation", "get_number_of_citations"),
+    ("Repository", "get_number_of_repositories"),
+    ("Note", "get_number_of_notes"),
+    ("Tag", "get_number_of_tags"),
+]
+
+
+def get_machine_key():
+    """
+    Return a key identifying the machine the measurements were made on.
+    """
+    return "%s:%s:%s" % (platform.node(), platform.machine(), os.cpu_count())
+
+
+def get_tuning_path(dbname):
+    """
+    Return the tuning file path for a tree on this machine.
+    """
+    tuning_hash = hashlib.sha1(
+        ("%s\n%s" % (dbname, get_machine_key())).encode("utf-8")
+    ).hexdigest()
+    return os.path.join(
+        TUNING_DIRECTORY, "CardView_tuning_%s.json" % tuning_hash
+    )
+
+
+def load_tuning(dbname):
+    """
+    Return the saved measurements for a tree.
+    """
+    tuning = None
+    try:
+        with open(get_tuning_path(dbname), "r", encoding="utf-8") as tfile:
+            tuning = json.load(tfile)
+    except (OSError, ValueError):
+        pass
+    if not isinstance(tuning, dict) or (
+        tuning.get("version") != TUNING_VERSION
+    ):
+        tuning = {"version": TUNING_VERSION, "counts": None, "methods": {}}
+    return tuning
+
+
+def save_tuning(dbname, tuning):
+    """
+    Save the measurements for a tree.
+    """
+    file_name = get_tuning_path(dbname)
+    temp_name = "%s.tmp" % file_name
+    try:
+        if not os.path.isdir(TUNING_DIRECTORY):
+            os.makedirs(TUNING_DIRECTORY)
+        with open(temp_name, "w", encoding="utf-8") as tfile:
+            json.dump(tuning, tfile)
+        os.replace(temp_name, file_name)
+    except OSError:
+        pass
+
+
+def probe_object_counts(db, tuning):
+    """
+    Return object types and counts sorted by descending number of objects,
+    from the tuning record if the tree has not changed since they were
+    counted or else counted using the open database.
+    """
+    try:
+        mtime = get_database_mtime(db.get_save_path())
+    except (OSError, TypeError):
+        mtime = None
+    cached = tuning.get("counts")
+    if mtime is not None and cached and cached.get("mtime") == mtime:
+        return [tuple(item) for item in cached["objects"]]
+    object_counts = [
+        (obj_type, getattr(db, method)())
+        for (obj_type, method) in COUNT_METHODS
+    ]
+    object_counts.sort(key=lambda x: x[1], reverse=True)
+    if mtime is not None:
+        tuning["counts"] = {"mtime": mtime, "objects": object_counts}
+    return object_counts
+
+
+def get_collection_methods(concurrent):
+    """
+    Return the candidate collection methods as (concurrent, workers).
+    """
+    methods = [(False, 1)]
+    if concurrent:
+        cpus = os.cpu_count() or 1
+        workers = cpus
+        while workers > 1:
+            methods.append((True, workers))
+            workers = workers // 2
+    return methods
+
+
+def get_method_key(method):
+    """
+    Return the key the measurements for a method are kept under.
+    """
+    if method[0]:
+        return "concurrent-%s" % method[1]
+    return "serial"
+
+
+def predict_collection_time(tuning, method, object_counts):
+    """
+    Return the predicted collection time for a method, or None if it has
+    not been measured for all the categories present.
+
+    Serial collection handles one category after another so the times add
+    up, while concurrent collection takes as long as the slowest category.
+    The fixed cost measured for the method is added to either.
+    """
+    measured = tuning["methods"].get(get_method_key(method))
+    if not measured or time.time() - measured["updated"] > TUNING_MAX_AGE:
+        return None
+    times = []
+    for (obj_type, object_count) in object_counts:
+        if object_count:
+            rate = measured["rates"].get(obj_type)
+            if not rate:
+                return None
+            times.append(object_count / rate)
+    if not times:
+        return 0
+    if method[0]:
+        return measured.get("overhead", 0) + max(times)
+    return measured.get("overhead", 0) + sum(times)
+
+
+def choose_collection_method(tuning, object_counts, threshold, concurrent):
+    """
+    Return the collection method as (concurrent, workers) to use next.
+    """
+    methods = get_collection_methods(concurrent)
+    predictions = [
+        (predict_collection_time(tuning, method, object_counts), method)
+        for method in methods
+    ]
+    measured = [item for item in predictions if item[0] is not None]
+    if not measured:
+        total = sum([y for (x, y) in object_counts])
+        if len(methods) > 1 and total > threshold:
+            return methods[1]
+        return methods[0]
+    (best_time, best_method) = min(measured)
+    if best_time < EXPLORE_LIMIT:
+        for (predicted, method) in predictions:
+            if predicted is None:
+                return method
+    return best_method
+
+
+def record_collection(tuning, method, object_counts, timings, elapsed):
+    """
+    Record the throughput for each category from the time taken to scan
+    it, and the fixed cost of the method as the rest of the elapsed time,
+    blending them with earlier measurements.
+    """
+    counts = dict(object_counts)
+    key = get_method_key(method)
+    measured = tuning["methods"].get(key)
+    if not measured or time.time() - measured["updated"] > TUNING_MAX_AGE:
+        measured = {"rates": {}}
+    for (obj_type, duration) in timings.items():
+        if not counts.get(obj_type) or duration <= 0:
+            continue
+        rate = counts[obj_type] / duration
+        previous = measured["rates"].get(obj_type)
+        if previous:
+            rate = previous * (1 - TUNING_WEIGHT) + rate * TUNING_WEIGHT
+        measured["rates"][obj_type] = rate
+    durations = [duration for duration in timings.values() if duration > 0]
+    if durations:
+        if method[0]:
+            overhead = max(elapsed - max(durations), 0)
+        else:
+            overhead = max(elapsed - sum(durations), 0)
+        previous = measured.get("overhead")
+        if previous is not None:
+            overhead = (
+                previous * (1 - TUNING_WEIGHT) + overhead * TUNING_WEIGHT
+            )
+        measured["overhead"] = overhead
+    measured["updated"] = time.time()
+    tuning["methods"][key] = measured
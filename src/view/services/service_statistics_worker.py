@@ -29,13 +29,16 @@ Statistics service worker
 # Python Modules
 #
 # -------------------------------------------------------------------------
-import io
 import os
 import sys
+import json
 import time
-import pickle
 import argparse
-from multiprocessing import Process, Queue
+from array import array
+from multiprocessing import Event, Process, Queue
+from queue import Queue as RequestQueue
+from threading import Event as ThreadEvent
+from threading import Thread
 
 # -------------------------------------------------------------------------
 #
@@ -49,702 +52,1559 @@ from gramps.gen.db.utils import (
     make_database,
     write_lock_file,
 )
-from gramps.gen.lib import Citation, Person, EventType, EventRoleType
+from gramps.gen.lib import Citation, Date, Person, EventType, EventRoleType
 from gramps.gen.utils.alive import probably_alive
 from gramps.gen.utils.file import media_path_full
 
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# The worker also runs as a standalone script so the protocol, media and
+# distribution modules are loaded from the same directory when there is no
+# parent package.
+#
+# -------------------------------------------------------------------------
+try:
+    from .service_statistics_protocol import (
+        FrameWriter,
+        FRAME_CANCELLED,
+        FRAME_ERROR,
+        FRAME_PARTIAL,
+        FRAME_PROGRESS,
+        FRAME_RESULT,
+    )
+    from .service_statistics_media import (
+        get_probe_cache_path,
+        probe_media_files,
+    )
+    from .service_statistics_distributions import (
+        add_family_samples,
+        add_sample,
+        clear_samples,
+        compact_samples,
+        encode_sample,
+        get_key_map,
+        get_sample_key,
+        get_sample_rows,
+        load_samples,
+        map_sample_keys,
+        summarize_distributions,
+    )
+except ImportError:
+    from service_statistics_protocol import (
+        FrameWriter,
+        FRAME_CANCELLED,
+        FRAME_ERROR,
+        FRAME_PARTIAL,
+        FRAME_PROGRESS,
+        FRAME_RESULT,
+    )
+    from service_statistics_media import (
+        get_probe_cache_path,
+        probe_media_files,
+    )
+    from service_statistics_distributions import (
+        add_family_samples,
+        add_sample,
+        clear_samples,
+        compact_samples,
+        encode_sample,
+        get_key_map,
+        get_sample_key,
+        get_sample_rows,
+        load_samples,
+        map_sample_keys,
+        summarize_distributions,
+    )
+
+MINIMUM_SHARD_SIZE = 10000
+PROGRESS_INTERVAL = 5
+BOOKMARK_METADATA = [
+    "bookmarks",
+    "family_bookmarks",
+    "event_bookmarks",
+    "source_bookmarks",
+    "citation_bookmarks",
+    "repo_bookmarks",
+    "media_bookmarks",
+    "place_bookmarks",
+    "note_bookmarks",
+]
+DATABASE_CACHE = {}
 
-def examine_people(args, queue=None, thread_event=None):
+
+# -------------------------------------------------------------------------
+#
+# Contribution ledger
+#
+# A ledger holds the folded counters for a category and optionally the
+# contribution each object made to them keyed by handle, so a change to a
+# single object can be applied by subtracting the old contribution and
+# adding the new one instead of rescanning the whole category.
+#
+# -------------------------------------------------------------------------
+def create_ledger(track=True):
     """
-    Parse and analyze people.
+    Return a new empty ledger.
     """
+    return {
+        "counters": {},
+        "entries": {} if track else None,
+        "pool": {},
+        "samples": {},
+        "sample_handles": [],
+        "scan_seconds": 0,
+    }
 
-    def get_gender_stats(gender_stats, gender):
-        """
-        Return gender statistics.
-        """
-        if gender not in gender_stats:
-            gender_stats[gender] = {
-                "total": 0,
-                "private": 0,
-                "tagged": 0,
-                "uncited": 0,
-                "living": 0,
-                "living_not_private": 0,
-            }
-        return gender_stats[gender]
-
-    gender_stats = {}
-    media, media_refs, missing_region = 0, 0, 0
-    incomplete_names, alternate_names, no_families, total_living = 0, 0, 0, 0
-    names_private, names_uncited = 0, 0
-    association_types = {}
-    association, association_refs = 0, 0
-    association_private, association_uncited = 0, 0
-    participant_roles = {}
-    participant, participant_refs, participant_private = 0, 0, 0
-    ldsord_people, ldsord_refs, ldsord_private, ldsord_uncited = 0, 0, 0, 0
-    no_temple, no_status, no_date, no_place, no_family = 0, 0, 0, 0, 0
-
-    no_birth, no_birth_date, no_birth_place = 0, 0, 0
-    births_uncited, births_private = 0, 0
-    no_baptism, no_baptism_date, no_baptism_place = 0, 0, 0
-    baptisms_private = 0
-    no_death, no_death_date, no_death_place = 0, 0, 0
-    deaths_uncited, deaths_private = 0, 0
-    no_burial, no_burial_date, no_burial_place = 0, 0, 0
-    burials_private = 0
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_people = db.get_number_of_people()
-    all_events = args.get("all_events")
 
-    for person in db.iter_people():
-        if thread_event and thread_event.is_set():
-            break
+def count(stats, key, value=1):
+    """
+    Increment a counter in an object contribution.
+    """
+    stats[key] = stats.get(key, 0) + value
 
-        length = len(person.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-            for media_ref in person.media_list:
-                if not media_ref.rect:
-                    missing_region += 1
-
-        if person.alternate_names:
-            alternate_names += 1
-        for name in [person.primary_name] + person.alternate_names:
-            if name.private:
-                names_private += 1
-            if not name.citation_list:
-                names_uncited += 1
-            if name.first_name.strip() == "":
-                incomplete_names += 1
-            else:
-                if name.get_surname_list():
-                    for surname in name.get_surname_list():
-                        if surname.get_surname().strip() == "":
-                            incomplete_names += 1
-                else:
-                    incomplete_names += 1
-
-        if not person.parent_family_list and not person.family_list:
-            no_families += 1
-
-        gender = get_gender_stats(gender_stats, person.get_gender())
-        gender["total"] += 1
-        if person.private:
-            gender["private"] += 1
-        if person.tag_list:
-            gender["tagged"] += 1
-        if not person.citation_list:
-            gender["uncited"] += 1
-
-        living = True
-        birth_ref = person.get_birth_ref()
-        death_ref = person.get_death_ref()
-        has_birth, has_baptism = False, False
-        has_death, has_burial = False, False
-
-        if person.event_ref_list:
-            participant += 1
-            if all_events:
-                for event_ref in person.event_ref_list:
-                    participant_refs += 1
-                    role = event_ref.get_role()
-                    role_key = role.serialize()
-                    if role_key not in participant_roles:
-                        participant_roles[role_key] = 0
-                    participant_roles[role_key] += 1
-                    if event_ref.private:
-                        participant_private += 1
-
-                    if role == EventRoleType.PRIMARY:
-                        event = db.get_event_from_handle(event_ref.ref)
-                        if birth_ref and event.handle == birth_ref.ref:
-                            has_birth = True
-                            birth_ref = None
-                            if not get_date(event):
-                                no_birth_date += 1
-                            if not event.place:
-                                no_birth_place += 1
-                            if not event.citation_list:
-                                births_uncited += 1
-                            if event.private:
-                                births_private += 1
-                            continue
-                        if death_ref and event.handle == death_ref.ref:
-                            has_death = True
-                            death_ref = None
-                            if not get_date(event):
-                                no_death_date += 1
-                            if not event.place:
-                                no_death_place += 1
-                            if not event.citation_list:
-                                deaths_uncited += 1
-                            if event.private:
-                                deaths_private += 1
-                            living = False
-                            continue
-                        event_type = event.get_type()
-                        if event_type in [
-                            EventType.BAPTISM,
-                            EventType.CHRISTEN,
-                        ]:
-                            has_baptism = True
-                            if not get_date(event):
-                                no_baptism_date += 1
-                            if not event.place:
-                                no_baptism_place += 1
-                            if event.private:
-                                baptisms_private += 1
-                            continue
-                        if event_type in [
-                            EventType.BURIAL,
-                            EventType.CREMATION,
-                        ]:
-                            has_burial = True
-                            if not get_date(event):
-                                no_burial_date += 1
-                            if not event.place:
-                                no_burial_place += 1
-                            if event.private:
-                                burials_private += 1
-                            living = False
-                            continue
-                        if event_type in [
-                            EventType.CAUSE_DEATH,
-                            EventType.PROBATE,
-                        ]:
-                            living = False
+
+def add_counters(counters, entry, sign=1):
+    """
+    Add or subtract an entry of counter contributions.
+    """
+    for (key, value) in entry:
+        total = counters.get(key, 0) + (value * sign)
+        if total:
+            counters[key] = total
+        else:
+            counters.pop(key, None)
+
+
+def get_ledger_samples(ledger, name):
+    """
+    Return the array of samples of a given kind in a ledger.
+    """
+    samples = ledger.setdefault("samples", {})
+    values = samples.get(name)
+    if values is None:
+        values = samples[name] = load_samples(b"")
+    elif not isinstance(values, array):
+        values = samples[name] = load_samples(values)
+    return values
+
+
+def ledger_add(ledger, handle, stats):
+    """
+    Record and apply the contribution of an object. Samples are kept apart
+    from the entry so entries can still be shared through the pool.
+    """
+    for (name, row) in stats.pop("samples", ()):
+        get_ledger_samples(ledger, name).extend(
+            encode_sample(ledger, name, row)
+        )
+    entries = ledger["entries"]
+    if entries is None:
+        add_counters(ledger["counters"], stats.items())
+        return
+    entry = tuple(stats.items())
+    pool = ledger.get("pool")
+    if pool is None:
+        pool = {value: value for value in entries.values()}
+        ledger["pool"] = pool
+    entry = pool.setdefault(entry, entry)
+    entries[handle] = entry
+    add_counters(ledger["counters"], entry)
+
+
+def ledger_remove(ledger, handle):
+    """
+    Remove the recorded contribution of an object.
+    """
+    entry = ledger["entries"].pop(handle, None)
+    if entry:
+        add_counters(ledger["counters"], entry, sign=-1)
+    if ledger.get("samples"):
+        key = get_sample_key(ledger, handle, add=False)
+        if key:
+            for name in ledger["samples"]:
+                values = get_ledger_samples(ledger, name)
+                if clear_samples(values, name, key):
+                    ledger["samples"][name] = compact_samples(values, name)
+
+
+def ledger_replace(ledger, handle, stats):
+    """
+    Replace the recorded contribution of an object.
+    """
+    ledger_remove(ledger, handle)
+    ledger_add(ledger, handle, stats)
+
+
+def merge_ledgers(one, two):
+    """
+    Merge a partial ledger into another by summing the counters. The keys
+    in the samples of the partial ledger are mapped to those of the other.
+    Partial ledgers are scanned at the same time so the longest scan time
+    is kept.
+    """
+    add_counters(one["counters"], two["counters"].items())
+    one["scan_seconds"] = max(
+        one.get("scan_seconds", 0), two.get("scan_seconds", 0)
+    )
+    if two.get("samples"):
+        key_map = get_key_map(two, one, add=True)
+        for (name, values) in two["samples"].items():
+            values = load_samples(values)
+            map_sample_keys(values, name, key_map)
+            get_ledger_samples(one, name).extend(values)
+    if one["entries"] is not None and two["entries"] is not None:
+        one["entries"].update(two["entries"])
+        one["pool"] = None
+    return one
+
+
+def ledger_export(ledger):
+    """
+    Return ledger stripped of the entry pool and sample keys for transfer,
+    with the samples as bytes as arrays can not be marshalled.
+    """
+    return {
+        "counters": ledger["counters"],
+        "entries": ledger["entries"],
+        "samples": {
+            name: bytes(values)
+            for (name, values) in (ledger.get("samples") or {}).items()
+        },
+        "sample_handles": ledger.get("sample_handles") or [],
+        "scan_seconds": ledger.get("scan_seconds", 0),
+    }
+
+
+def collect_types(counters, type_key, total):
+    """
+    Collect the counters for a typed breakdown.
+    """
+    result = {}
+    for key, value in counters.items():
+        if isinstance(key, tuple) and key[0] == type_key:
+            result[key[1]] = (value, total)
+    return result
+
+
+# -------------------------------------------------------------------------
+#
+# Object analyzers
+#
+# -------------------------------------------------------------------------
+def analyze_ldsords(stats, obj, prefix="ldsord"):
+    """
+    Analyze the LDS ordinances for a person or family.
+    """
+    if obj.lds_ord_list:
+        count(stats, prefix)
+        for ldsord in obj.lds_ord_list:
+            count(stats, "%s_refs" % prefix)
+            if ldsord.private:
+                count(stats, "%s_private" % prefix)
+            if not ldsord.citation_list:
+                count(stats, "%s_uncited" % prefix)
+            if not get_date(ldsord):
+                count(stats, "%s_no_date" % prefix)
+            if not ldsord.place:
+                count(stats, "%s_no_place" % prefix)
+            if not ldsord.temple:
+                count(stats, "%s_no_temple" % prefix)
+            if not ldsord.status:
+                count(stats, "%s_no_status" % prefix)
+            if not ldsord.famc:
+                count(stats, "%s_no_family" % prefix)
+
+
+def analyze_media_refs(stats, obj):
+    """
+    Analyze the media references for an object.
+    """
+    length = len(obj.media_list)
+    if length > 0:
+        count(stats, "media")
+        count(stats, "media_refs", length)
+
+
+# -------------------------------------------------------------------------
+#
+# Event attributes
+#
+# The person analysis only needs a few attributes of the events a person
+# participates in. When examining all person events these are gathered for
+# every event in a single cursor pass up front so the person pass can look
+# them up in memory instead of reading each referenced event.
+#
+# -------------------------------------------------------------------------
+def has_raw_date(date):
+    """
+    Return True if a serialized date would display as a non-empty string.
+    """
+    if not date:
+        return False
+    if date[1] == Date.MOD_TEXTONLY:
+        return bool(date[4])
+    return tuple(date[3][0:4]) != Date.EMPTY
+
+
+def get_event_attributes(data):
+    """
+    Return the type, has date, has place, citation count, privacy and date
+    sort value attributes for a serialized event.
+    """
+    return (
+        data[2][0],
+        has_raw_date(data[3]),
+        bool(data[5]),
+        len(data[6]),
+        data[12],
+        data[3][5] if data[3] else 0,
+    )
+
+
+def build_event_table(db):
+    """
+    Return the attributes for all events keyed by handle.
+    """
+    table = {}
+    with db.get_event_cursor() as cursor:
+        for (dummy_key, data) in cursor:
+            table[data[0]] = get_event_attributes(data)
+    return table
+
+
+def prepare_event_table(args):
+    """
+    Build the event attribute table for a run if the person pass will
+    examine all events.
+    """
+    if args.get("all_events") and "event_table" not in args:
+        cached = args.get("daemon")
+        db = acquire_database(args.get("tree_name"), cached=cached)
+        args["event_table"] = build_event_table(db)
+        release_database(db, cached=cached)
+    return args
+
+
+def lookup_event(db, handle, args):
+    """
+    Return the attributes for an event, reading it if not in the table.
+    """
+    table = args.get("event_table")
+    if table:
+        attributes = table.get(handle)
+        if attributes:
+            return attributes
+    return get_event_attributes(db.get_raw_event_data(handle))
+
+
+def analyze_vital_event(stats, event, prefix, cited=True):
+    """
+    Analyze the attributes of a vital event for a person.
+    """
+    (dummy_type, has_date, has_place, citations, private) = event[:5]
+    if not has_date:
+        count(stats, "no_%s_date" % prefix)
+    if not has_place:
+        count(stats, "no_%s_place" % prefix)
+    if cited and not citations:
+        count(stats, "%s_uncited" % prefix)
+    if private:
+        count(stats, "%s_private" % prefix)
+
+
+def analyze_person(db, person, args):
+    """
+    Analyze a person and return their contribution.
+    """
+    stats = {"total": 1}
+    all_events = args.get("all_events")
+
+    length = len(person.media_list)
+    if length > 0:
+        count(stats, "media")
+        count(stats, "media_refs", length)
+        for media_ref in person.media_list:
+            if not media_ref.rect:
+                count(stats, "missing_region")
+
+    if person.alternate_names:
+        count(stats, "alternate_names")
+    for name in [person.primary_name] + person.alternate_names:
+        if name.private:
+            count(stats, "names_private")
+        if not name.citation_list:
+            count(stats, "names_uncited")
+        if name.first_name.strip() == "":
+            count(stats, "incomplete_names")
+        else:
+            if name.get_surname_list():
+                for surname in name.get_surname_list():
+                    if surname.get_surname().strip() == "":
+                        count(stats, "incomplete_names")
             else:
-                if birth_ref:
-                    event = db.get_event_from_handle(birth_ref.ref)
-                    has_birth = True
-                    if not get_date(event):
-                        no_birth_date += 1
-                    if not event.place:
-                        no_birth_place += 1
-                    if not event.citation_list:
-                        births_uncited += 1
-                    if event.private:
-                        births_private += 1
-                if death_ref:
-                    event = db.get_event_from_handle(death_ref.ref)
-                    has_death = True
-                    if not get_date(event):
-                        no_death_date += 1
-                    if not event.place:
-                        no_death_place += 1
-                    if not event.citation_list:
-                        deaths_uncited += 1
-                    if event.private:
-                        deaths_private += 1
-                    living = False
-
-        if not has_birth:
-            no_birth += 1
-        if not has_baptism:
-            no_baptism += 1
-
-        if living:
-            if not probably_alive(person, db):
+                count(stats, "incomplete_names")
+
+    if not person.parent_family_list and not person.family_list:
+        count(stats, "no_families")
+
+    gender = person.get_gender()
+    count(stats, ("gender", gender, "total"))
+    if person.private:
+        count(stats, ("gender", gender, "private"))
+    if person.tag_list:
+        count(stats, ("gender", gender, "tagged"))
+    if not person.citation_list:
+        count(stats, ("gender", gender, "uncited"))
+
+    living = True
+    birth_ref = person.get_birth_ref()
+    death_ref = person.get_death_ref()
+    has_birth, has_baptism = False, False
+    has_death, has_burial = False, False
+    birth_date, death_date = 0, 0
+
+    if person.event_ref_list:
+        count(stats, "participant")
+        if all_events:
+            for event_ref in person.event_ref_list:
+                count(stats, "participant_refs")
+                role = event_ref.get_role()
+                count(stats, ("participant_roles", role.serialize()))
+                if event_ref.private:
+                    count(stats, "participant_private")
+
+                if role == EventRoleType.PRIMARY:
+                    event = lookup_event(db, event_ref.ref, args)
+                    if birth_ref and event_ref.ref == birth_ref.ref:
+                        has_birth = True
+                        birth_ref = None
+                        birth_date = event[5]
+                        analyze_vital_event(stats, event, "birth")
+                        continue
+                    if death_ref and event_ref.ref == death_ref.ref:
+                        has_death = True
+                        death_ref = None
+                        death_date = event[5]
+                        analyze_vital_event(stats, event, "death")
+                        living = False
+                        continue
+                    event_type = event[0]
+                    if event_type in [
+                        EventType.BAPTISM,
+                        EventType.CHRISTEN,
+                    ]:
+                        has_baptism = True
+                        analyze_vital_event(
+                            stats, event, "baptism", cited=False
+                        )
+                        continue
+                    if event_type in [
+                        EventType.BURIAL,
+                        EventType.CREMATION,
+                    ]:
+                        has_burial = True
+                        analyze_vital_event(
+                            stats, event, "burial", cited=False
+                        )
+                        living = False
+                        continue
+                    if event_type in [
+                        EventType.CAUSE_DEATH,
+                        EventType.PROBATE,
+                    ]:
+                        living = False
+        else:
+            if birth_ref:
+                event = lookup_event(db, birth_ref.ref, args)
+                has_birth = True
+                birth_date = event[5]
+                analyze_vital_event(stats, event, "birth")
+            if death_ref:
+                event = lookup_event(db, death_ref.ref, args)
+                has_death = True
+                death_date = event[5]
+                analyze_vital_event(stats, event, "death")
                 living = False
+
+    if not has_birth:
+        count(stats, "no_birth")
+    if not has_baptism:
+        count(stats, "no_baptism")
+
+    if living:
+        if not probably_alive(person, db):
+            living = False
+        else:
+            count(stats, "living")
+            count(stats, ("gender", gender, "living"))
+            if not person.private:
+                count(stats, ("gender", gender, "living_not_private"))
+
+    if not living:
+        if not has_death:
+            count(stats, "no_death")
+        if not has_burial:
+            count(stats, "no_burial")
+
+    if person.person_ref_list:
+        count(stats, "association")
+        for person_ref in person.person_ref_list:
+            count(stats, "association_refs")
+            if person_ref.private:
+                count(stats, "association_private")
+            if not person_ref.citation_list:
+                count(stats, "association_uncited")
+            count(stats, ("association_types", person_ref.rel))
+
+    if birth_date or death_date:
+        add_sample(
+            stats,
+            "person",
+            (person.handle, birth_date, death_date),
+        )
+
+    analyze_ldsords(stats, person)
+    return stats
+
+
+def analyze_family(_dummy_db, family, _dummy_args):
+    """
+    Analyze a family and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_media_refs(stats, family)
+
+    if not family.father_handle and not family.mother_handle:
+        count(stats, "missing_both")
+    elif not family.father_handle or not family.mother_handle:
+        count(stats, "missing_one")
+
+    count(stats, ("relations", family.type.serialize()))
+
+    if not family.citation_list:
+        count(stats, "uncited")
+    if family.private:
+        count(stats, "private")
+    if family.tag_list:
+        count(stats, "tagged")
+
+    if not family.event_ref_list:
+        count(stats, "no_events")
+    else:
+        count(stats, "participant")
+        for event_ref in family.event_ref_list:
+            count(stats, "participant_refs")
+            count(
+                stats, ("participant_roles", event_ref.get_role().serialize())
+            )
+            if event_ref.private:
+                count(stats, "participant_private")
+
+    add_family_samples(
+        stats,
+        family.handle,
+        len(family.child_ref_list),
+        (family.father_handle, family.mother_handle),
+        [event_ref.ref for event_ref in family.event_ref_list],
+    )
+
+    if not family.child_ref_list:
+        count(stats, "no_child")
+    else:
+        for child_ref in family.child_ref_list:
+            count(stats, "child")
+            if child_ref.private:
+                count(stats, "child_private")
+            if not child_ref.citation_list:
+                count(stats, "child_uncited")
+            count(stats, ("mother_relations", child_ref.mrel.serialize()))
+            count(stats, ("father_relations", child_ref.frel.serialize()))
+
+    analyze_ldsords(stats, family)
+    return stats
+
+
+def analyze_event(_dummy_db, event, _dummy_args):
+    """
+    Analyze an event and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_media_refs(stats, event)
+
+    if not event.citation_list:
+        count(stats, "uncited")
+    if not event.place:
+        count(stats, "no_place")
+    if not get_date(event):
+        count(stats, "no_date")
+    if not event.get_description():
+        count(stats, "no_description")
+    if event.private:
+        count(stats, "private")
+    if event.tag_list:
+        count(stats, "tagged")
+
+    event_type = event.get_type()
+    if event_type == EventType.MARRIAGE:
+        count(stats, "marriages")
+        if not event.place:
+            count(stats, "no_marriage_place")
+        if not get_date(event):
+            count(stats, "no_marriage_date")
+        if event.private:
+            count(stats, "marriage_private")
+        sortval = event.get_date_object().sortval
+        if sortval:
+            add_sample(stats, "marriage", (event.handle, sortval))
+
+    event_key = event_type.serialize()
+    count(stats, ("types", event_key))
+    if not event.citation_list:
+        count(stats, ("uncited_events", event_key))
+    return stats
+
+
+def analyze_place(_dummy_db, place, _dummy_args):
+    """
+    Analyze a place and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_media_refs(stats, place)
+
+    count(stats, ("types", place.get_type().serialize()))
+
+    if not place.name:
+        count(stats, "no_name")
+    if not place.lat:
+        count(stats, "no_latitude")
+    if not place.long:
+        count(stats, "no_longitude")
+    if not place.code:
+        count(stats, "no_code")
+    if not place.citation_list:
+        count(stats, "uncited")
+    if place.private:
+        count(stats, "private")
+    if place.tag_list:
+        count(stats, "tagged")
+    return stats
+
+
+def lookup_media_size(fullname, args):
+    """
+    Return the size of a media file, or None if it was not found, from the
+    probe results if available.
+    """
+    media_sizes = args.get("media_sizes")
+    if media_sizes and fullname in media_sizes:
+        return media_sizes[fullname]
+    try:
+        return os.path.getsize(fullname)
+    except OSError:
+        return None
+
+
+def analyze_media(db, media, args):
+    """
+    Analyze a media object and return its contribution.
+    """
+    stats = {"total": 1}
+    if not media.desc:
+        count(stats, "no_desc")
+    if not get_date(media):
+        count(stats, "no_date")
+    if not media.mime:
+        count(stats, "no_mime")
+    if media.private:
+        count(stats, "private")
+    if media.tag_list:
+        count(stats, "tagged")
+    if not media.path:
+        count(stats, "no_path")
+    else:
+        fullname = media_path_full(db, media.path)
+        size = lookup_media_size(fullname, args)
+        if size is None:
+            count(stats, ("not_found", media.path))
+        else:
+            count(stats, "size_bytes", size)
+    return stats
+
+
+def analyze_source(_dummy_db, source, _dummy_args):
+    """
+    Analyze a source and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_media_refs(stats, source)
+
+    if not source.title:
+        count(stats, "no_title")
+    if not source.author:
+        count(stats, "no_author")
+    if not source.pubinfo:
+        count(stats, "no_pubinfo")
+    if not source.abbrev:
+        count(stats, "no_abbrev")
+    if not source.reporef_list:
+        count(stats, "no_repository")
+    else:
+        count(stats, "repos_refs", len(source.reporef_list))
+        for repo_ref in source.reporef_list:
+            if not repo_ref.call_number:
+                count(stats, "no_call_number")
+            count(stats, ("types", repo_ref.media_type.serialize()))
+    if source.private:
+        count(stats, "private")
+    if source.tag_list:
+        count(stats, "tagged")
+    return stats
+
+
+CONFIDENCE_KEYS = {
+    Citation.CONF_VERY_LOW: "very_low",
+    Citation.CONF_LOW: "low",
+    Citation.CONF_NORMAL: "normal",
+    Citation.CONF_HIGH: "high",
+    Citation.CONF_VERY_HIGH: "very_high",
+}
+
+
+def analyze_citation(_dummy_db, citation, _dummy_args):
+    """
+    Analyze a citation and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_media_refs(stats, citation)
+
+    if not get_date(citation):
+        count(stats, "no_date")
+    if not citation.source_handle:
+        count(stats, "no_source")
+    if not citation.page:
+        count(stats, "no_page")
+    if citation.private:
+        count(stats, "private")
+    if citation.tag_list:
+        count(stats, "tagged")
+    if citation.confidence in CONFIDENCE_KEYS:
+        count(stats, CONFIDENCE_KEYS[citation.confidence])
+    return stats
+
+
+def analyze_repository(_dummy_db, repository, _dummy_args):
+    """
+    Analyze a repository and return its contribution.
+    """
+    stats = {"total": 1}
+    count(stats, ("types", repository.get_type().serialize()))
+
+    if not repository.name:
+        count(stats, "no_name")
+    if not repository.address_list:
+        count(stats, "no_address")
+    if repository.private:
+        count(stats, "private")
+    if repository.tag_list:
+        count(stats, "tagged")
+    return stats
+
+
+def analyze_note(_dummy_db, note, _dummy_args):
+    """
+    Analyze a note and return its contribution.
+    """
+    stats = {"total": 1}
+    count(stats, ("types", note.get_type().serialize()))
+
+    if not note.get():
+        count(stats, "no_text")
+    if note.private:
+        count(stats, "private")
+    if note.tag_list:
+        count(stats, "tagged")
+    return stats
+
+
+def analyze_tag(_dummy_db, _dummy_tag, _dummy_args):
+    """
+    Analyze a tag and return its contribution.
+    """
+    return {"total": 1}
+
+
+# -------------------------------------------------------------------------
+#
+# Raw object analyzers
+#
+# These mirror the object analyzers above but read the fields they need by
+# position from the serialized tuples, avoiding the cost of building the
+# full objects. They must produce identical contributions, which can be
+# checked against a tree with the --parity option.
+#
+# -------------------------------------------------------------------------
+def get_raw_ref(event_ref_list, index):
+    """
+    Return serialized event reference at index if valid.
+    """
+    if 0 <= index < len(event_ref_list):
+        return event_ref_list[index]
+    return None
+
+
+def analyze_raw_ldsords(stats, lds_ord_list, prefix="ldsord"):
+    """
+    Analyze the serialized LDS ordinances for a person or family.
+    """
+    if lds_ord_list:
+        count(stats, prefix)
+        for ldsord in lds_ord_list:
+            count(stats, "%s_refs" % prefix)
+            if ldsord[8]:
+                count(stats, "%s_private" % prefix)
+            if not ldsord[0]:
+                count(stats, "%s_uncited" % prefix)
+            if not has_raw_date(ldsord[2]):
+                count(stats, "%s_no_date" % prefix)
+            if not ldsord[4]:
+                count(stats, "%s_no_place" % prefix)
+            if not ldsord[6]:
+                count(stats, "%s_no_temple" % prefix)
+            if not ldsord[7]:
+                count(stats, "%s_no_status" % prefix)
+            if not ldsord[5]:
+                count(stats, "%s_no_family" % prefix)
+
+
+def analyze_raw_media_refs(stats, media_list):
+    """
+    Analyze the serialized media references for an object.
+    """
+    length = len(media_list)
+    if length > 0:
+        count(stats, "media")
+        count(stats, "media_refs", length)
+
+
+def analyze_raw_person(db, data, args):
+    """
+    Analyze a serialized person and return their contribution.
+    """
+    stats = {"total": 1}
+    all_events = args.get("all_events")
+
+    media_list = data[10]
+    length = len(media_list)
+    if length > 0:
+        count(stats, "media")
+        count(stats, "media_refs", length)
+        for media_ref in media_list:
+            if not media_ref[5]:
+                count(stats, "missing_region")
+
+    alternate_names = data[4]
+    if alternate_names:
+        count(stats, "alternate_names")
+    for name in [data[3]] + list(alternate_names):
+        if name[0]:
+            count(stats, "names_private")
+        if not name[1]:
+            count(stats, "names_uncited")
+        if name[4].strip() == "":
+            count(stats, "incomplete_names")
+        else:
+            if name[5]:
+                for surname in name[5]:
+                    if surname[0].strip() == "":
+                        count(stats, "incomplete_names")
             else:
-                total_living += 1
-                gender["living"] += 1
-                if not person.private:
-                    gender["living_not_private"] += 1
-
-        if not living:
-            if not has_death:
-                no_death += 1
-            if not has_burial:
-                no_burial += 1
-
-        if person.person_ref_list:
-            association += 1
-            for person_ref in person.person_ref_list:
-                association_refs += 1
-                if person_ref.private:
-                    association_private += 1
-                if not person_ref.citation_list:
-                    association_uncited += 1
-                if person_ref.rel not in association_types:
-                    association_types[person_ref.rel] = 0
-                association_types[person_ref.rel] += 1
-
-        if person.lds_ord_list:
-            ldsord_people += 1
-            for ldsord in person.lds_ord_list:
-                ldsord_refs += 1
-                if ldsord.private:
-                    ldsord_private += 1
-                if not ldsord.citation_list:
-                    ldsord_uncited += 1
-                if not get_date(ldsord):
-                    no_date += 1
-                if not ldsord.place:
-                    no_place += 1
-                if not ldsord.famc:
-                    no_family += 1
-                if not ldsord.temple:
-                    no_temple += 1
-                if not ldsord.status:
-                    no_status += 1
-    close_readonly_database(db)
-
-    for key in participant_roles:
-        participant_roles[key] = (participant_roles[key], participant_refs)
-    for key in association_types:
-        association_types[key] = (association_types[key], association_refs)
-
-    with_birth = total_people - no_birth
-    with_baptism = total_people - no_baptism
-    dead_people = total_people - total_living
-    with_death = dead_people - no_death
-    with_burial = dead_people - no_burial
+                count(stats, "incomplete_names")
+
+    if not data[9] and not data[8]:
+        count(stats, "no_families")
+
+    gender = data[2]
+    count(stats, ("gender", gender, "total"))
+    if data[19]:
+        count(stats, ("gender", gender, "private"))
+    if data[18]:
+        count(stats, ("gender", gender, "tagged"))
+    if not data[15]:
+        count(stats, ("gender", gender, "uncited"))
+
+    living = True
+    event_ref_list = data[7]
+    birth_ref = get_raw_ref(event_ref_list, data[6])
+    death_ref = get_raw_ref(event_ref_list, data[5])
+    has_birth, has_baptism = False, False
+    has_death, has_burial = False, False
+    birth_date, death_date = 0, 0
+
+    if event_ref_list:
+        count(stats, "participant")
+        if all_events:
+            for event_ref in event_ref_list:
+                count(stats, "participant_refs")
+                role = tuple(event_ref[5])
+                count(stats, ("participant_roles", role))
+                if event_ref[0]:
+                    count(stats, "participant_private")
+
+                if role[0] == EventRoleType.PRIMARY:
+                    event = lookup_event(db, event_ref[4], args)
+                    if birth_ref and event_ref[4] == birth_ref[4]:
+                        has_birth = True
+                        birth_ref = None
+                        birth_date = event[5]
+                        analyze_vital_event(stats, event, "birth")
+                        continue
+                    if death_ref and event_ref[4] == death_ref[4]:
+                        has_death = True
+                        death_ref = None
+                        death_date = event[5]
+                        analyze_vital_event(stats, event, "death")
+                        living = False
+                        continue
+                    event_type = event[0]
+                    if event_type in [
+                        EventType.BAPTISM,
+                        EventType.CHRISTEN,
+                    ]:
+                        has_baptism = True
+                        analyze_vital_event(
+                            stats, event, "baptism", cited=False
+                        )
+                        continue
+                    if event_type in [
+                        EventType.BURIAL,
+                        EventType.CREMATION,
+                    ]:
+                        has_burial = True
+                        analyze_vital_event(
+                            stats, event, "burial", cited=False
+                        )
+                        living = False
+                        continue
+                    if event_type in [
+                        EventType.CAUSE_DEATH,
+                        EventType.PROBATE,
+                    ]:
+                        living = False
+        else:
+            if birth_ref:
+                event = lookup_event(db, birth_ref[4], args)
+                has_birth = True
+                birth_date = event[5]
+                analyze_vital_event(stats, event, "birth")
+            if death_ref:
+                event = lookup_event(db, death_ref[4], args)
+                has_death = True
+                death_date = event[5]
+                analyze_vital_event(stats, event, "death")
+                living = False
+
+    if not has_birth:
+        count(stats, "no_birth")
+    if not has_baptism:
+        count(stats, "no_baptism")
+
+    if living:
+        if not probably_alive(Person().unserialize(data), db):
+            living = False
+        else:
+            count(stats, "living")
+            count(stats, ("gender", gender, "living"))
+            if not data[19]:
+                count(stats, ("gender", gender, "living_not_private"))
+
+    if not living:
+        if not has_death:
+            count(stats, "no_death")
+        if not has_burial:
+            count(stats, "no_burial")
+
+    person_ref_list = data[20]
+    if person_ref_list:
+        count(stats, "association")
+        for person_ref in person_ref_list:
+            count(stats, "association_refs")
+            if person_ref[0]:
+                count(stats, "association_private")
+            if not person_ref[1]:
+                count(stats, "association_uncited")
+            count(stats, ("association_types", person_ref[4]))
+
+    if birth_date or death_date:
+        add_sample(
+            stats,
+            "person",
+            (data[0], birth_date, death_date),
+        )
+
+    analyze_raw_ldsords(stats, data[14])
+    return stats
+
+
+def analyze_raw_family(_dummy_db, data, _dummy_args):
+    """
+    Analyze a serialized family and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_raw_media_refs(stats, data[7])
+
+    if not data[2] and not data[3]:
+        count(stats, "missing_both")
+    elif not data[2] or not data[3]:
+        count(stats, "missing_one")
+
+    count(stats, ("relations", tuple(data[5])))
+
+    if not data[10]:
+        count(stats, "uncited")
+    if data[14]:
+        count(stats, "private")
+    if data[13]:
+        count(stats, "tagged")
+
+    if not data[6]:
+        count(stats, "no_events")
+    else:
+        count(stats, "participant")
+        for event_ref in data[6]:
+            count(stats, "participant_refs")
+            count(stats, ("participant_roles", tuple(event_ref[5])))
+            if event_ref[0]:
+                count(stats, "participant_private")
+
+    add_family_samples(
+        stats,
+        data[0],
+        len(data[4]),
+        (data[2], data[3]),
+        [event_ref[4] for event_ref in data[6]],
+    )
+
+    if not data[4]:
+        count(stats, "no_child")
+    else:
+        for child_ref in data[4]:
+            count(stats, "child")
+            if child_ref[0]:
+                count(stats, "child_private")
+            if not child_ref[1]:
+                count(stats, "child_uncited")
+            count(stats, ("mother_relations", tuple(child_ref[5])))
+            count(stats, ("father_relations", tuple(child_ref[4])))
+
+    analyze_raw_ldsords(stats, data[9])
+    return stats
+
+
+def analyze_raw_event(_dummy_db, data, _dummy_args):
+    """
+    Analyze a serialized event and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_raw_media_refs(stats, data[8])
+
+    has_date = has_raw_date(data[3])
+    if not data[6]:
+        count(stats, "uncited")
+    if not data[5]:
+        count(stats, "no_place")
+    if not has_date:
+        count(stats, "no_date")
+    if not data[4]:
+        count(stats, "no_description")
+    if data[12]:
+        count(stats, "private")
+    if data[11]:
+        count(stats, "tagged")
+
+    event_key = tuple(data[2])
+    if event_key[0] == EventType.MARRIAGE:
+        count(stats, "marriages")
+        if not data[5]:
+            count(stats, "no_marriage_place")
+        if not has_date:
+            count(stats, "no_marriage_date")
+        if data[12]:
+            count(stats, "marriage_private")
+        if data[3] and data[3][5]:
+            add_sample(stats, "marriage", (data[0], data[3][5]))
+
+    count(stats, ("types", event_key))
+    if not data[6]:
+        count(stats, ("uncited_events", event_key))
+    return stats
+
+
+def analyze_raw_place(_dummy_db, data, _dummy_args):
+    """
+    Analyze a serialized place and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_raw_media_refs(stats, data[12])
+
+    count(stats, ("types", tuple(data[8])))
+
+    if not data[6]:
+        count(stats, "no_name")
+    if not data[4]:
+        count(stats, "no_latitude")
+    if not data[3]:
+        count(stats, "no_longitude")
+    if not data[9]:
+        count(stats, "no_code")
+    if not data[13]:
+        count(stats, "uncited")
+    if data[17]:
+        count(stats, "private")
+    if data[16]:
+        count(stats, "tagged")
+    return stats
+
+
+def analyze_raw_media(db, data, args):
+    """
+    Analyze a serialized media object and return its contribution.
+    """
+    stats = {"total": 1}
+    if not data[4]:
+        count(stats, "no_desc")
+    if not has_raw_date(data[10]):
+        count(stats, "no_date")
+    if not data[3]:
+        count(stats, "no_mime")
+    if data[12]:
+        count(stats, "private")
+    if data[11]:
+        count(stats, "tagged")
+    if not data[2]:
+        count(stats, "no_path")
+    else:
+        fullname = media_path_full(db, data[2])
+        size = lookup_media_size(fullname, args)
+        if size is None:
+            count(stats, ("not_found", data[2]))
+        else:
+            count(stats, "size_bytes", size)
+    return stats
+
+
+def analyze_raw_source(_dummy_db, data, _dummy_args):
+    """
+    Analyze a serialized source and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_raw_media_refs(stats, data[6])
+
+    if not data[2]:
+        count(stats, "no_title")
+    if not data[3]:
+        count(stats, "no_author")
+    if not data[4]:
+        count(stats, "no_pubinfo")
+    if not data[7]:
+        count(stats, "no_abbrev")
+    if not data[10]:
+        count(stats, "no_repository")
+    else:
+        count(stats, "repos_refs", len(data[10]))
+        for repo_ref in data[10]:
+            if not repo_ref[2]:
+                count(stats, "no_call_number")
+            count(stats, ("types", tuple(repo_ref[3])))
+    if data[12]:
+        count(stats, "private")
+    if data[11]:
+        count(stats, "tagged")
+    return stats
+
+
+def analyze_raw_citation(_dummy_db, data, _dummy_args):
+    """
+    Analyze a serialized citation and return its contribution.
+    """
+    stats = {"total": 1}
+    analyze_raw_media_refs(stats, data[7])
+
+    if not has_raw_date(data[2]):
+        count(stats, "no_date")
+    if not data[5]:
+        count(stats, "no_source")
+    if not data[3]:
+        count(stats, "no_page")
+    if data[11]:
+        count(stats, "private")
+    if data[10]:
+        count(stats, "tagged")
+    if data[4] in CONFIDENCE_KEYS:
+        count(stats, CONFIDENCE_KEYS[data[4]])
+    return stats
+
+
+def analyze_raw_repository(_dummy_db, data, _dummy_args):
+    """
+    Analyze a serialized repository and return its contribution.
+    """
+    stats = {"total": 1}
+    count(stats, ("types", tuple(data[2])))
+
+    if not data[3]:
+        count(stats, "no_name")
+    if not data[5]:
+        count(stats, "no_address")
+    if data[9]:
+        count(stats, "private")
+    if data[8]:
+        count(stats, "tagged")
+    return stats
+
+
+def analyze_raw_note(_dummy_db, data, _dummy_args):
+    """
+    Analyze a serialized note and return its contribution.
+    """
+    stats = {"total": 1}
+    count(stats, ("types", tuple(data[4])))
+
+    if not data[2][0]:
+        count(stats, "no_text")
+    if data[7]:
+        count(stats, "private")
+    if data[6]:
+        count(stats, "tagged")
+    return stats
+
+
+RAW_ANALYZERS = {
+    "Person": analyze_raw_person,
+    "Family": analyze_raw_family,
+    "Event": analyze_raw_event,
+    "Place": analyze_raw_place,
+    "Media": analyze_raw_media,
+    "Source": analyze_raw_source,
+    "Citation": analyze_raw_citation,
+    "Repository": analyze_raw_repository,
+    "Note": analyze_raw_note,
+    "Tag": analyze_tag,
+}
+
+
+def probe_family_globals(db):
+    """
+    Return family counters not attributable to a single object.
+    """
+    return {"surname_total": len(set(db.surname_list))}
+
+
+def prepare_media_sizes(db, args, shard=None):
+    """
+    Probe the files for all media objects, or for those in a shard, ahead of
+    analysis.
+    """
+    if shard:
+        objects = iter_shard_objects(db, "Media", shard, raw=True)
+    else:
+        objects = iter_raw_objects(db, "Media")
+    paths = [
+        media_path_full(db, data[2]) for (dummy_handle, data) in objects
+        if data[2]
+    ]
+    cache_path = None
+    if args.get("tree_name"):
+        cache_path = get_probe_cache_path(args["tree_name"])
+    return {"media_sizes": probe_media_files(paths, cache_path=cache_path)}
+
+
+# -------------------------------------------------------------------------
+#
+# Category summaries
+#
+# -------------------------------------------------------------------------
+def summarize_people(counters):
+    """
+    Prepare people payload from the folded counters.
+    """
+    value = counters.get
+    total_people = value("total", 0)
+    media_refs = value("media_refs", 0)
+    association_refs = value("association_refs", 0)
+    participant_refs = value("participant_refs", 0)
+    ldsord_refs = value("ldsord_refs", 0)
+
+    with_birth = total_people - value("no_birth", 0)
+    with_baptism = total_people - value("no_baptism", 0)
+    dead_people = total_people - value("living", 0)
+    with_death = dead_people - value("no_death", 0)
+    with_burial = dead_people - value("no_burial", 0)
 
     payload = {
         "person": {
             "total": (total_people, None),
-            "incomplete_names": (incomplete_names, total_people),
-            "alternate_names": (alternate_names, total_people),
-            "no_family_connection": (no_families, total_people),
-            "no_birth": (no_birth, total_people),
-            "no_birth_date": (no_birth_date, with_birth),
-            "no_birth_place": (no_birth_place, with_birth),
-            "no_baptism": (no_baptism, total_people),
-            "no_baptism_date": (no_baptism_date, with_baptism),
-            "no_baptism_place": (no_baptism_place, with_baptism),
-            "no_death": (no_death, dead_people),
-            "no_death_date": (no_death_date, with_death),
-            "no_death_place": (no_death_place, with_death),
-            "no_burial": (no_burial, dead_people),
-            "no_burial_date": (no_burial_date, with_burial),
-            "no_burial_place": (no_burial_place, with_burial),
+            "incomplete_names": (value("incomplete_names", 0), total_people),
+            "alternate_names": (value("alternate_names", 0), total_people),
+            "no_family_connection": (value("no_families", 0), total_people),
+            "no_birth": (value("no_birth", 0), total_people),
+            "no_birth_date": (value("no_birth_date", 0), with_birth),
+            "no_birth_place": (value("no_birth_place", 0), with_birth),
+            "no_baptism": (value("no_baptism", 0), total_people),
+            "no_baptism_date": (value("no_baptism_date", 0), with_baptism),
+            "no_baptism_place": (value("no_baptism_place", 0), with_baptism),
+            "no_death": (value("no_death", 0), dead_people),
+            "no_death_date": (value("no_death_date", 0), with_death),
+            "no_death_place": (value("no_death_place", 0), with_death),
+            "no_burial": (value("no_burial", 0), dead_people),
+            "no_burial_date": (value("no_burial_date", 0), with_burial),
+            "no_burial_place": (value("no_burial_place", 0), with_burial),
         },
         "media": {
-            "person": (media, total_people),
+            "person": (value("media", 0), total_people),
             "person_refs": (media_refs, None),
-            "person_missing_region": (missing_region, media_refs),
+            "person_missing_region": (value("missing_region", 0), media_refs),
         },
         "ldsord_person": {
-            "ldsord": (ldsord_people, total_people),
+            "ldsord": (value("ldsord", 0), total_people),
             "ldsord_refs": (ldsord_refs, None),
-            "no_temple": (no_temple, ldsord_refs),
-            "no_status": (no_status, ldsord_refs),
-            "no_date": (no_date, ldsord_refs),
-            "no_place": (no_place, ldsord_refs),
-            "no_family": (no_family, ldsord_refs),
+            "no_temple": (value("ldsord_no_temple", 0), ldsord_refs),
+            "no_status": (value("ldsord_no_status", 0), ldsord_refs),
+            "no_date": (value("ldsord_no_date", 0), ldsord_refs),
+            "no_place": (value("ldsord_no_place", 0), ldsord_refs),
+            "no_family": (value("ldsord_no_family", 0), ldsord_refs),
         },
         "association": {
-            "total": (association, total_people),
+            "total": (value("association", 0), total_people),
             "refs": (association_refs, None),
-            "types": association_types,
+            "types": collect_types(
+                counters, "association_types", association_refs
+            ),
         },
         "participant": {
-            "person_total": (participant, total_people),
+            "person_total": (value("participant", 0), total_people),
             "person_refs": (participant_refs, None),
-            "person_roles": participant_roles,
+            "person_roles": collect_types(
+                counters, "participant_roles", participant_refs
+            ),
         },
         "uncited": {
-            "association": (association_uncited, association_refs),
-            "ldsord_person": (ldsord_uncited, ldsord_refs),
-            "names": (names_uncited, None),
-            "preferred_births": (births_uncited, with_birth),
-            "preferred_deaths": (deaths_uncited, with_death),
+            "association": (
+                value("association_uncited", 0),
+                association_refs,
+            ),
+            "ldsord_person": (value("ldsord_uncited", 0), ldsord_refs),
+            "names": (value("names_uncited", 0), None),
+            "preferred_births": (value("birth_uncited", 0), with_birth),
+            "preferred_deaths": (value("death_uncited", 0), with_death),
         },
         "privacy": {
-            "names": (names_private, None),
-            "baptism": (baptisms_private, with_baptism),
-            "preferred_births": (births_private, with_birth),
-            "preferred_deaths": (deaths_private, with_death),
-            "burial": (burials_private, with_burial),
-            "ldsord_person": (ldsord_private, ldsord_refs),
-            "association": (association_private, association_refs),
-            "participant": (participant_private, participant_refs),
+            "names": (value("names_private", 0), None),
+            "baptism": (value("baptism_private", 0), with_baptism),
+            "preferred_births": (value("birth_private", 0), with_birth),
+            "preferred_deaths": (value("death_private", 0), with_death),
+            "burial": (value("burial_private", 0), with_burial),
+            "ldsord_person": (value("ldsord_private", 0), ldsord_refs),
+            "association": (
+                value("association_private", 0),
+                association_refs,
+            ),
+            "participant": (
+                value("participant_private", 0),
+                participant_refs,
+            ),
         },
         "tag": {},
     }
 
-    for gender in gender_stats:
+    genders = {
+        key[1]
+        for key in counters
+        if isinstance(key, tuple) and key[0] == "gender"
+    }
+    for gender in sorted(genders):
         if gender == Person.MALE:
             prefix = "male"
         elif gender == Person.FEMALE:
             prefix = "female"
         else:
             prefix = "unknown"
-        data = gender_stats[gender]
-        total_gender = data["total"]
+        total_gender = value(("gender", gender, "total"), 0)
+        living = value(("gender", gender, "living"), 0)
         payload["person"].update(
             {
                 "%s_total" % prefix: (total_gender, total_people),
-                "%s_living" % prefix: (data["living"], total_gender),
+                "%s_living" % prefix: (living, total_gender),
             }
         )
-        payload["tag"].update({prefix: (data["tagged"], total_gender)})
-        payload["uncited"].update({prefix: (data["uncited"], total_gender)})
+        payload["tag"].update(
+            {prefix: (value(("gender", gender, "tagged"), 0), total_gender)}
+        )
+        payload["uncited"].update(
+            {prefix: (value(("gender", gender, "uncited"), 0), total_gender)}
+        )
         payload["privacy"].update(
             {
-                prefix: (data["private"], total_gender),
+                prefix: (
+                    value(("gender", gender, "private"), 0),
+                    total_gender,
+                ),
                 "%s_living_not_private"
-                % prefix: (data["living_not_private"], data["living"]),
+                % prefix: (
+                    value(("gender", gender, "living_not_private"), 0),
+                    living,
+                ),
             }
         )
-    return post_processing(args, "People", total_people, queue, payload)
+    return payload
 
 
-def examine_families(args, queue=None, thread_event=None):
+def summarize_families(counters):
     """
-    Parse and analyze families.
+    Prepare families payload from the folded counters.
     """
-    media, media_refs = 0, 0
-    missing_one, missing_both = 0, 0
-    family_relations = {}
-    uncited, no_events, private, tagged = 0, 0, 0, 0
-    child, no_child, child_private, child_uncited = 0, 0, 0, 0
-    child_mother_relations, child_father_relations = {}, {}
-    ldsord_families, ldsord_refs, ldsord_private, ldsord_uncited = 0, 0, 0, 0
-    no_temple, no_status, no_date, no_place = 0, 0, 0, 0
-    participant_roles = {}
-    participant, participant_refs, participant_private = 0, 0, 0
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_families = db.get_number_of_families()
-    total_surnames = len(set(db.surname_list))
-
-    for family in db.iter_families():
-        if thread_event and thread_event.is_set():
-            break
-
-        length = len(family.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        if not family.father_handle and not family.mother_handle:
-            missing_both += 1
-        elif not family.father_handle or not family.mother_handle:
-            missing_one += 1
-
-        family_type = family.type.serialize()
-        if family_type not in family_relations:
-            family_relations[family_type] = 0
-        family_relations[family_type] += 1
-
-        if not family.citation_list:
-            uncited += 1
-        if family.private:
-            private += 1
-        if family.tag_list:
-            tagged += 1
-
-        if not family.event_ref_list:
-            no_events += 1
-        else:
-            participant += 1
-            for event_ref in family.event_ref_list:
-                participant_refs += 1
-                role = event_ref.get_role().serialize()
-                if role not in participant_roles:
-                    participant_roles[role] = 0
-                participant_roles[role] += 1
-                if event_ref.private:
-                    participant_private += 1
-
-        if not family.child_ref_list:
-            no_child += 1
-        else:
-            for child_ref in family.child_ref_list:
-                child += 1
-                if child_ref.private:
-                    child_private += 1
-                if not child_ref.citation_list:
-                    child_uncited += 1
-                mother_relation = child_ref.mrel.serialize()
-                if mother_relation not in child_mother_relations:
-                    child_mother_relations[mother_relation] = 0
-                child_mother_relations[mother_relation] += 1
-                father_relation = child_ref.frel.serialize()
-                if father_relation not in child_father_relations:
-                    child_father_relations[father_relation] = 0
-                child_father_relations[father_relation] += 1
-
-        if family.lds_ord_list:
-            ldsord_families += 1
-            for ldsord in family.lds_ord_list:
-                ldsord_refs += 1
-                if ldsord.private:
-                    ldsord_private += 1
-                if not ldsord.citation_list:
-                    ldsord_uncited += 1
-                if not get_date(ldsord):
-                    no_date += 1
-                if not ldsord.place:
-                    no_place += 1
-                if not ldsord.temple:
-                    no_temple += 1
-                if not ldsord.status:
-                    no_status += 1
-    close_readonly_database(db)
-
-    for key in family_relations:
-        family_relations[key] = (family_relations[key], total_families)
-    for key in child_mother_relations:
-        child_mother_relations[key] = (child_mother_relations[key], child)
-    for key in child_father_relations:
-        child_father_relations[key] = (child_father_relations[key], child)
-    for key in participant_roles:
-        participant_roles[key] = (participant_roles[key], participant_refs)
-
-    payload = {
+    value = counters.get
+    total_families = value("total", 0)
+    child = value("child", 0)
+    ldsord_refs = value("ldsord_refs", 0)
+    participant_refs = value("participant_refs", 0)
+    return {
         "family": {
             "total": (total_families, None),
-            "surname_total": (total_surnames, None),
-            "missing_one": (missing_one, total_families),
-            "missing_both": (missing_both, total_families),
-            "no_child": (no_child, total_families),
-            "no_events": (no_events, total_families),
-            "relations": family_relations,
+            "surname_total": (value("surname_total", 0), None),
+            "missing_one": (value("missing_one", 0), total_families),
+            "missing_both": (value("missing_both", 0), total_families),
+            "no_child": (value("no_child", 0), total_families),
+            "no_events": (value("no_events", 0), total_families),
+            "relations": collect_types(counters, "relations", total_families),
         },
         "ldsord_family": {
-            "ldsord": (ldsord_families, total_families),
+            "ldsord": (value("ldsord", 0), total_families),
             "ldsord_refs": (ldsord_refs, None),
-            "no_temple": (no_temple, ldsord_refs),
-            "no_status": (no_status, ldsord_refs),
-            "no_date": (no_date, ldsord_refs),
-            "no_place": (no_place, ldsord_refs),
+            "no_temple": (value("ldsord_no_temple", 0), ldsord_refs),
+            "no_status": (value("ldsord_no_status", 0), ldsord_refs),
+            "no_date": (value("ldsord_no_date", 0), ldsord_refs),
+            "no_place": (value("ldsord_no_place", 0), ldsord_refs),
         },
         "uncited": {
-            "family": (uncited, total_families),
-            "child": (child_uncited, child),
-            "ldsord_family": (ldsord_uncited, ldsord_refs),
+            "family": (value("uncited", 0), total_families),
+            "child": (value("child_uncited", 0), child),
+            "ldsord_family": (value("ldsord_uncited", 0), ldsord_refs),
         },
         "privacy": {
-            "family": (private, total_families),
-            "child": (child_private, child),
-            "family_participant": (participant_private, None),
-            "ldsord_family": (ldsord_private, ldsord_refs),
+            "family": (value("private", 0), total_families),
+            "child": (value("child_private", 0), child),
+            "family_participant": (value("participant_private", 0), None),
+            "ldsord_family": (value("ldsord_private", 0), ldsord_refs),
         },
         "tag": {
-            "family": (tagged, total_families),
+            "family": (value("tagged", 0), total_families),
         },
         "children": {
             "refs": (child, None),
-            "mother_relations": child_mother_relations,
-            "father_relations": child_father_relations,
+            "mother_relations": collect_types(
+                counters, "mother_relations", child
+            ),
+            "father_relations": collect_types(
+                counters, "father_relations", child
+            ),
         },
         "participant": {
-            "family_total": participant,
+            "family_total": value("participant", 0),
             "family_refs": participant_refs,
-            "family_roles": participant_roles,
+            "family_roles": collect_types(
+                counters, "participant_roles", participant_refs
+            ),
         },
         "media": {
-            "family": (media, total_families),
-            "family_refs": (media_refs, None),
+            "family": (value("media", 0), total_families),
+            "family_refs": (value("media_refs", 0), None),
         },
     }
-    return post_processing(args, "Families", total_families, queue, payload)
 
 
-def examine_events(args, queue=None, thread_event=None):
+def summarize_events(counters):
     """
-    Parse and analyze events.
+    Prepare events payload from the folded counters.
     """
-    media, media_refs = 0, 0
-    no_date, no_place, no_description = 0, 0, 0
-    uncited, private, tagged, marriages = 0, 0, 0, 0
-    event_types = {}
+    value = counters.get
+    total_events = value("total", 0)
+    marriages = value("marriages", 0)
+    event_types = collect_types(counters, "types", total_events)
     uncited_events = {}
-    no_marriage_date, no_marriage_place, marriage_private = 0, 0, 0
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_events = db.get_number_of_events()
-
-    for event in db.iter_events():
-        if thread_event and thread_event.is_set():
-            break
-
-        length = len(event.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        if not event.citation_list:
-            uncited += 1
-        if not event.place:
-            no_place += 1
-        if not get_date(event):
-            no_date += 1
-        if not event.get_description():
-            no_description += 1
-        if event.private:
-            private += 1
-        if event.tag_list:
-            tagged += 1
-
-        event_type = event.get_type()
-        if event_type == EventType.MARRIAGE:
-            marriages += 1
-            if not event.place:
-                no_marriage_place += 1
-            if not get_date(event):
-                no_marriage_date += 1
-            if event.private:
-                marriage_private += 1
-
-        event_key = event_type.serialize()
-        if event_key not in event_types:
-            event_types[event_key] = 0
-            uncited_events[event_key] = 0
-        event_types[event_key] += 1
-        if not event.citation_list:
-            uncited_events[event_key] += 1
-    close_readonly_database(db)
-
-    for key in uncited_events:
-        uncited_events[key] = (uncited_events[key], event_types[key])
-    for key in event_types:
-        event_types[key] = (event_types[key], total_events)
-
-    payload = {
+    for key, (type_total, dummy_total) in event_types.items():
+        uncited_events[key] = (value(("uncited_events", key), 0), type_total)
+    return {
         "event": {
             "total": (total_events, None),
-            "no_place": (no_place, total_events),
-            "no_date": (no_date, total_events),
-            "no_description": (no_description, total_events),
+            "no_place": (value("no_place", 0), total_events),
+            "no_date": (value("no_date", 0), total_events),
+            "no_description": (value("no_description", 0), total_events),
             "types": event_types,
         },
         "family": {
-            "no_marriage_date": (no_marriage_date, marriages),
-            "no_marriage_place": (no_marriage_place, marriages),
+            "no_marriage_date": (value("no_marriage_date", 0), marriages),
+            "no_marriage_place": (value("no_marriage_place", 0), marriages),
         },
         "uncited": {
-            "event": (uncited, total_events),
+            "event": (value("uncited", 0), total_events),
             "events": uncited_events,
         },
         "privacy": {
-            "event": (private, total_events),
-            "marriage": (marriage_private, marriages),
+            "event": (value("private", 0), total_events),
+            "marriage": (value("marriage_private", 0), marriages),
         },
         "tag": {
-            "event": (tagged, total_events),
+            "event": (value("tagged", 0), total_events),
         },
         "media": {
-            "event": (media, total_events),
-            "event_refs": (media_refs, None),
+            "event": (value("media", 0), total_events),
+            "event_refs": (value("media_refs", 0), None),
         },
     }
-    return post_processing(args, "Events", total_events, queue, payload)
 
 
-def examine_places(args, queue=None, thread_event=None):
+def summarize_places(counters):
     """
-    Parse and analyze places.
+    Prepare places payload from the folded counters.
     """
-    media, media_refs = 0, 0
-    no_name, no_latitude, no_longitude, no_code = 0, 0, 0, 0
-    uncited, private, tagged = 0, 0, 0
-    place_types = {}
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_places = db.get_number_of_places()
-
-    for place in db.iter_places():
-        if thread_event and thread_event.is_set():
-            break
-
-        length = len(place.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        place_type = place.get_type().serialize()
-        if place_type not in place_types:
-            place_types[place_type] = 0
-        place_types[place_type] += 1
-
-        if not place.name:
-            no_name += 1
-        if not place.lat:
-            no_latitude += 1
-        if not place.long:
-            no_longitude += 1
-        if not place.code:
-            no_code += 1
-        if not place.citation_list:
-            uncited += 1
-        if place.private:
-            private += 1
-        if place.tag_list:
-            tagged += 1
-    close_readonly_database(db)
-
-    for key in place_types:
-        place_types[key] = (place_types[key], total_places)
-
-    payload = {
+    value = counters.get
+    total_places = value("total", 0)
+    return {
         "place": {
             "total": (total_places, None),
-            "no_name": (no_name, total_places),
-            "no_latitude": (no_latitude, total_places),
-            "no_longitude": (no_longitude, total_places),
-            "no_code": (no_code, total_places),
-            "types": place_types,
+            "no_name": (value("no_name", 0), total_places),
+            "no_latitude": (value("no_latitude", 0), total_places),
+            "no_longitude": (value("no_longitude", 0), total_places),
+            "no_code": (value("no_code", 0), total_places),
+            "types": collect_types(counters, "types", total_places),
         },
         "uncited": {
-            "place": (uncited, total_places),
+            "place": (value("uncited", 0), total_places),
         },
         "privacy": {
-            "place": (private, total_places),
+            "place": (value("private", 0), total_places),
         },
         "tag": {
-            "place": (tagged, total_places),
+            "place": (value("tagged", 0), total_places),
         },
         "media": {
-            "place": (media, total_places),
-            "place_refs": (media_refs, None),
+            "place": (value("media", 0), total_places),
+            "place_refs": (value("media_refs", 0), None),
         },
     }
-    return post_processing(args, "Places", total_places, queue, payload)
 
 
-def examine_media(args, queue=None, thread_event=None):
+def summarize_media(counters):
     """
-    Parse and analyze media objects.
+    Prepare media payload from the folded counters.
     """
-    no_desc, no_date, no_path, no_mime = 0, 0, 0, 0
-    uncited, private, tagged, size_bytes = 0, 0, 0, 0
-    not_found = []
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_media = db.get_number_of_media()
-
-    for media in db.iter_media():
-        if thread_event and thread_event.is_set():
-            break
-
-        if not media.desc:
-            no_desc += 1
-        if not get_date(media):
-            no_date += 1
-        if not media.mime:
-            no_mime += 1
-        if media.private:
-            private += 1
-        if media.tag_list:
-            tagged += 1
-        if not media.path:
-            no_path += 1
-        else:
-            fullname = media_path_full(db, media.path)
-            try:
-                size_bytes += os.path.getsize(fullname)
-            except OSError:
-                if media.path not in not_found:
-                    not_found.append(media.path)
-    close_readonly_database(db)
+    value = counters.get
+    total_media = value("total", 0)
+    no_path = value("no_path", 0)
+    size_bytes = value("size_bytes", 0)
+    not_found = sorted(collect_types(counters, "not_found", None))
 
     if not int(size_bytes / 1024):
         size_string = "%s bytes" % size_bytes
@@ -753,295 +1613,298 @@ def examine_media(args, queue=None, thread_event=None):
     else:
         size_string = "%s MB" % int(size_bytes / 1048576)
 
-    payload = {
+    return {
         "media": {
             "total": (total_media, None),
             "size": (size_string, None),
             "no_path": (no_path, total_media),
             "no_file": (len(not_found), total_media - no_path),
             "not_found": not_found,
-            "no_description": (no_desc, total_media),
-            "no_date": (no_date, total_media),
-            "no_mime": (no_mime, total_media),
+            "no_description": (value("no_desc", 0), total_media),
+            "no_date": (value("no_date", 0), total_media),
+            "no_mime": (value("no_mime", 0), total_media),
         },
         "uncited": {
-            "media": (uncited, total_media),
+            "media": (value("uncited", 0), total_media),
         },
         "privacy": {
-            "media": (private, total_media),
+            "media": (value("private", 0), total_media),
         },
         "tag": {
-            "media": (tagged, total_media),
+            "media": (value("tagged", 0), total_media),
         },
     }
-    return post_processing(args, "Media", total_media, queue, payload)
 
 
-def examine_sources(args, queue=None, thread_event=None):
+def summarize_sources(counters):
     """
-    Parse and analyze sources.
+    Prepare sources payload from the folded counters.
     """
-    media, media_refs = 0, 0
-    no_title, no_author, no_pubinfo, no_abbrev = 0, 0, 0, 0
-    no_repository, repos_refs, no_call_number, private, tagged = 0, 0, 0, 0, 0
-    media_types = {}
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_sources = db.get_number_of_sources()
-
-    for source in db.iter_sources():
-        if thread_event and thread_event.is_set():
-            break
-
-        length = len(source.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        if not source.title:
-            no_title += 1
-        if not source.author:
-            no_author += 1
-        if not source.pubinfo:
-            no_pubinfo += 1
-        if not source.abbrev:
-            no_abbrev += 1
-        if not source.reporef_list:
-            no_repository += 1
-        else:
-            repos_refs += len(source.reporef_list)
-            for repo_ref in source.reporef_list:
-                if not repo_ref.call_number:
-                    no_call_number += 1
-                media_type = repo_ref.media_type.serialize()
-                if media_type not in media_types:
-                    media_types[media_type] = 0
-                media_types[media_type] += 1
-        if source.private:
-            private += 1
-        if source.tag_list:
-            tagged += 1
-    close_readonly_database(db)
-
-    for key in media_types:
-        media_types[key] = (media_types[key], repos_refs)
-
-    payload = {
+    value = counters.get
+    total_sources = value("total", 0)
+    repos_refs = value("repos_refs", 0)
+    return {
         "source": {
             "total": (total_sources, None),
-            "no_title": (no_title, total_sources),
-            "no_author": (no_author, total_sources),
-            "no_pubinfo": (no_pubinfo, total_sources),
-            "no_abbrev": (no_abbrev, total_sources),
-            "no_repository": (no_repository, total_sources),
+            "no_title": (value("no_title", 0), total_sources),
+            "no_author": (value("no_author", 0), total_sources),
+            "no_pubinfo": (value("no_pubinfo", 0), total_sources),
+            "no_abbrev": (value("no_abbrev", 0), total_sources),
+            "no_repository": (value("no_repository", 0), total_sources),
             "repository_refs": (repos_refs, None),
-            "no_call_number": (no_call_number, repos_refs),
-            "types": media_types,
+            "no_call_number": (value("no_call_number", 0), repos_refs),
+            "types": collect_types(counters, "types", repos_refs),
         },
         "privacy": {
-            "source": (private, total_sources),
+            "source": (value("private", 0), total_sources),
         },
         "tag": {
-            "source": (tagged, total_sources),
+            "source": (value("tagged", 0), total_sources),
         },
         "media": {
-            "source": (media, total_sources),
-            "source_refs": (media_refs, None),
+            "source": (value("media", 0), total_sources),
+            "source_refs": (value("media_refs", 0), None),
         },
     }
-    return post_processing(args, "Sources", total_sources, queue, payload)
 
 
-def examine_citations(args, queue=None, thread_event=None):
+def summarize_citations(counters):
     """
-    Parse and analyze citation objects.
+    Prepare citations payload from the folded counters.
     """
-    media, media_refs = 0, 0
-    no_source, no_page, no_date, private, tagged = 0, 0, 0, 0, 0
-    very_low, low, normal, high, very_high = 0, 0, 0, 0, 0
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_citations = db.get_number_of_citations()
-
-    for citation in db.iter_citations():
-        if thread_event and thread_event.is_set():
-            break
-
-        length = len(citation.media_list)
-        if length > 0:
-            media += 1
-            media_refs += length
-
-        if not get_date(citation):
-            no_date += 1
-        if not citation.source_handle:
-            no_source += 1
-        if not citation.page:
-            no_page += 1
-        if citation.private:
-            private += 1
-        if citation.tag_list:
-            tagged += 1
-        if citation.confidence == Citation.CONF_VERY_LOW:
-            very_low += 1
-        elif citation.confidence == Citation.CONF_LOW:
-            low += 1
-        elif citation.confidence == Citation.CONF_NORMAL:
-            normal += 1
-        elif citation.confidence == Citation.CONF_HIGH:
-            high += 1
-        elif citation.confidence == Citation.CONF_VERY_HIGH:
-            very_high += 1
-    close_readonly_database(db)
-
+    value = counters.get
+    total_citations = value("total", 0)
     payload = {
         "citation": {
             "total": (total_citations, None),
-            "no_source": (no_source, total_citations),
-            "no_date": (no_date, total_citations),
-            "no_page": (no_page, total_citations),
+            "no_source": (value("no_source", 0), total_citations),
+            "no_date": (value("no_date", 0), total_citations),
+            "no_page": (value("no_page", 0), total_citations),
             "confidence": {},
         },
         "privacy": {
-            "citation": (private, total_citations),
+            "citation": (value("private", 0), total_citations),
         },
         "tag": {
-            "citation": (tagged, total_citations),
+            "citation": (value("tagged", 0), total_citations),
         },
         "media": {
-            "citation": (media, total_citations),
-            "citation_refs": (media_refs, None),
+            "citation": (value("media", 0), total_citations),
+            "citation_refs": (value("media_refs", 0), None),
         },
     }
     if total_citations:
-        payload["citation"]["confidence"].update(
-            {
-                "very_low": (very_low, total_citations),
-                "low": (low, total_citations),
-                "normal": (normal, total_citations),
-                "high": (high, total_citations),
-                "very_high": (very_high, total_citations),
-            }
-        )
-    return post_processing(args, "Citations", total_citations, queue, payload)
+        for key in CONFIDENCE_KEYS.values():
+            payload["citation"]["confidence"][key] = (
+                value(key, 0),
+                total_citations,
+            )
+    return payload
 
 
-def examine_repositories(args, queue=None, thread_event=None):
+def summarize_repositories(counters):
     """
-    Parse and analyze repositories.
+    Prepare repositories payload from the folded counters.
     """
-    no_name, no_address, private, tagged = 0, 0, 0, 0
-    repository_types = {}
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_repositories = db.get_number_of_repositories()
-
-    for repository in db.iter_repositories():
-        if thread_event and thread_event.is_set():
-            break
-
-        repository_type = repository.get_type().serialize()
-        if repository_type not in repository_types:
-            repository_types[repository_type] = 0
-        repository_types[repository_type] += 1
-
-        if not repository.name:
-            no_name += 1
-        if not repository.address_list:
-            no_address += 1
-        if repository.private:
-            private += 1
-        if repository.tag_list:
-            tagged += 1
-    close_readonly_database(db)
-
-    for key in repository_types:
-        repository_types[key] = (repository_types[key], total_repositories)
-
-    payload = {
+    value = counters.get
+    total_repositories = value("total", 0)
+    return {
         "repository": {
             "total": (total_repositories, None),
-            "no_name": (no_name, total_repositories),
-            "no_address": (no_address, total_repositories),
-            "types": repository_types,
+            "no_name": (value("no_name", 0), total_repositories),
+            "no_address": (value("no_address", 0), total_repositories),
+            "types": collect_types(counters, "types", total_repositories),
         },
         "privacy": {
-            "repository": (private, total_repositories),
+            "repository": (value("private", 0), total_repositories),
         },
         "tag": {
-            "repository": (tagged, total_repositories),
+            "repository": (value("tagged", 0), total_repositories),
         },
     }
-    return post_processing(
-        args, "Repositories", total_repositories, queue, payload
-    )
 
 
-def examine_notes(args, queue=None, thread_event=None):
+def summarize_notes(counters):
     """
-    Parse and analyze notes.
+    Prepare notes payload from the folded counters.
     """
-    no_text, private, tagged = 0, 0, 0
-    note_types = {}
-
-    db = open_readonly_database(args.get("tree_name"))
-    total_notes = db.get_number_of_notes()
-
-    for note in db.iter_notes():
-        if thread_event and thread_event.is_set():
-            break
-
-        note_type = note.get_type().serialize()
-        if note_type not in note_types:
-            note_types[note_type] = 0
-        note_types[note_type] += 1
-
-        if not note.text:
-            no_text += 1
-        if note.private:
-            private += 1
-        if note.tag_list:
-            tagged += 1
-    close_readonly_database(db)
-
-    for key in note_types:
-        note_types[key] = (note_types[key], total_notes)
-
-    payload = {
+    value = counters.get
+    total_notes = value("total", 0)
+    return {
         "note": {
             "total": (total_notes, None),
-            "no_text": (no_text, total_notes),
-            "types": note_types,
+            "no_text": (value("no_text", 0), total_notes),
+            "types": collect_types(counters, "types", total_notes),
         },
         "privacy": {
-            "note": (private, total_notes),
+            "note": (value("private", 0), total_notes),
         },
         "tag": {
-            "note": (tagged, total_notes),
+            "note": (value("tagged", 0), total_notes),
         },
     }
-    return post_processing(args, "Notes", total_notes, queue, payload)
 
 
-def examine_tags(args, queue=None, thread_event=None):
+def summarize_tags(counters):
     """
-    Parse and analyze tags.
+    Prepare tags payload from the folded counters.
     """
-    db = open_readonly_database(args.get("tree_name"))
-    total_tags = db.get_number_of_tags()
-    close_readonly_database(db)
-
-    payload = {
-        "tag": {"total": (total_tags, None)},
+    return {
+        "tag": {"total": (counters.get("total", 0), None)},
     }
-    return post_processing(args, "Tags", total_tags, queue, payload)
 
 
-def examine_bookmarks(args):
+# -------------------------------------------------------------------------
+#
+# Category handlers
+#
+# -------------------------------------------------------------------------
+CATEGORY_HANDLERS = {
+    "Person": ("People", "iter_people", analyze_person, summarize_people),
+    "Family": (
+        "Families",
+        "iter_families",
+        analyze_family,
+        summarize_families,
+    ),
+    "Event": ("Events", "iter_events", analyze_event, summarize_events),
+    "Place": ("Places", "iter_places", analyze_place, summarize_places),
+    "Media": ("Media", "iter_media", analyze_media, summarize_media),
+    "Source": ("Sources", "iter_sources", analyze_source, summarize_sources),
+    "Citation": (
+        "Citations",
+        "iter_citations",
+        analyze_citation,
+        summarize_citations,
+    ),
+    "Repository": (
+        "Repositories",
+        "iter_repositories",
+        analyze_repository,
+        summarize_repositories,
+    ),
+    "Note": ("Notes", "iter_notes", analyze_note, summarize_notes),
+    "Tag": ("Tags", "iter_tags", analyze_tag, summarize_tags),
+}
+
+GLOBAL_PROBES = {
+    "Family": probe_family_globals,
+}
+
+PREPARE_STAGES = {
+    "Media": prepare_media_sizes,
+}
+
+
+def analyze_object(db, obj_type, obj, args):
     """
-    Parse and analyze bookmarks.
+    Analyze a single object and return its contribution.
+    """
+    return CATEGORY_HANDLERS[obj_type][2](db, obj, args)
+
+
+def summarize_category(obj_type, ledger):
+    """
+    Prepare the payload for a category from its ledger.
+    """
+    return CATEGORY_HANDLERS[obj_type][3](ledger["counters"])
+
+
+def examine_objects(obj_type, args, queue=None, thread_event=None, shard=None):
+    """
+    Parse and analyze all objects of a given type, or if a shard tuple of
+    the shard index and number of shards is provided only those in that
+    shard.
+    """
+    (label, iterator, analyzer, dummy_summarizer) = CATEGORY_HANDLERS[
+        obj_type
+    ]
+    raw = args.get("raw")
+    if raw:
+        analyzer = RAW_ANALYZERS[obj_type]
+    ledger = create_ledger(track=args.get("ledger"))
+
+    cached = args.get("daemon") and not queue
+    db = acquire_database(args.get("tree_name"), cached=cached)
+    if obj_type in PREPARE_STAGES:
+        args = dict(args, **PREPARE_STAGES[obj_type](db, args, shard=shard))
+    if shard:
+        objects = iter_shard_objects(db, obj_type, shard, raw=raw)
+        label = "%s %s/%s" % (label, shard[0] + 1, shard[1])
+    elif raw:
+        objects = iter_raw_objects(db, obj_type)
+    else:
+        objects = (
+            (obj.handle, obj) for obj in getattr(db, iterator)()
+        )
+    scan_start = time.perf_counter()
+    for (handle, obj) in objects:
+        if thread_event and thread_event.is_set():
+            break
+        ledger_add(ledger, handle, analyzer(db, obj, args))
+    objects.close()
+    ledger["scan_seconds"] = time.perf_counter() - scan_start
+    if obj_type in GLOBAL_PROBES and (not shard or shard[0] == 0):
+        ledger["counters"].update(GLOBAL_PROBES[obj_type](db))
+    release_database(db, cached=cached)
+
+    total = ledger["counters"].get("total", 0)
+    payload = ledger_export(ledger)
+    if queue:
+        payload = (obj_type, payload)
+    return post_processing(args, label, total, queue, payload)
+
+
+def iter_raw_objects(db, obj_type):
+    """
+    Iterate over the handles and serialized objects using a cursor.
+    """
+    with db.method("get_%s_cursor", obj_type)() as cursor:
+        for (dummy_key, data) in cursor:
+            yield (data[0], data)
+
+
+def iter_shard_objects(db, obj_type, shard, raw=False):
+    """
+    Iterate over the handles and objects in a contiguous range of sorted
+    handles.
+    """
+    (index, shards) = shard
+    handles = sorted(db.method("iter_%s_handles", obj_type)())
+    size = -(-len(handles) // shards)
+    if raw:
+        query_method = db.method("get_raw_%s_data", obj_type)
+    else:
+        query_method = db.method("get_%s_from_handle", obj_type)
+    for handle in handles[index * size : (index + 1) * size]:
+        yield (handle, query_method(handle))
+
+
+def plan_shards(object_counts, workers):
+    """
+    Plan the number of shards for each category so the work is spread
+    evenly across the available workers.
+    """
+    total = sum(object_count for (dummy_type, object_count) in object_counts)
+    target = max(total / max(workers, 1), MINIMUM_SHARD_SIZE)
+    plan = []
+    for (obj_type, object_count) in object_counts:
+        shards = max(1, min(workers, round(object_count / target)))
+        if shards == 1:
+            plan.append((obj_type, None, object_count))
+        else:
+            for index in range(shards):
+                plan.append(
+                    (obj_type, (index, shards), object_count / shards)
+                )
+    plan.sort(key=lambda x: x[2], reverse=True)
+    return [(obj_type, shard) for (obj_type, shard, dummy_size) in plan]
+
+
+def analyze_bookmarks(db):
+    """
+    Analyze bookmarks and return the payload.
     """
-    db = open_readonly_database(args.get("tree_name"))
     person_bookmarks = len(db.get_bookmarks().bookmarks)
     family_bookmarks = len(db.get_family_bookmarks().bookmarks)
     event_bookmarks = len(db.get_event_bookmarks().bookmarks)
@@ -1062,7 +1925,7 @@ def examine_bookmarks(args):
         + repository_bookmarks
         + note_bookmarks
     )
-    payload = {
+    return {
         "bookmark": {
             "total": (total_bookmarks, None),
             "person": (person_bookmarks, total_bookmarks),
@@ -1076,7 +1939,17 @@ def examine_bookmarks(args):
             "note": (note_bookmarks, total_bookmarks),
         }
     }
-    close_readonly_database(db)
+
+
+def examine_bookmarks(args):
+    """
+    Parse and analyze bookmarks.
+    """
+    cached = args.get("daemon")
+    db = acquire_database(args.get("tree_name"), cached=cached)
+    payload = analyze_bookmarks(db)
+    release_database(db, cached=cached)
+    total_bookmarks = payload["bookmark"]["total"][0]
     return post_processing(args, "Bookmarks", total_bookmarks, None, payload)
 
 
@@ -1104,6 +1977,45 @@ def close_readonly_database(db):
         write_lock_file(save_dir)
 
 
+def acquire_database(dbname, cached=False):
+    """
+    Return a read only database, reusing the connection kept open for the
+    tree if cached.
+    """
+    if not cached:
+        return open_readonly_database(dbname)
+    if dbname not in DATABASE_CACHE:
+        DATABASE_CACHE[dbname] = open_readonly_database(dbname)
+    return DATABASE_CACHE[dbname]
+
+
+def release_database(db, cached=False):
+    """
+    Close a read only database unless it is being kept open.
+    """
+    if not cached:
+        close_readonly_database(db)
+
+
+def refresh_readonly_database(db):
+    """
+    Reload the metadata a database caches when it is loaded so a connection
+    kept open across collections sees changes made since.
+    """
+    db.surname_list = db.get_surname_list()
+    for name in BOOKMARK_METADATA:
+        getattr(db, name).load(db._get_metadata(name))
+
+
+def close_cached_databases():
+    """
+    Close all the read only databases being kept open.
+    """
+    for db in DATABASE_CACHE.values():
+        close_readonly_database(db)
+    DATABASE_CACHE.clear()
+
+
 def post_processing(args, obj_type, total, queue, payload):
     """
     Handle collection post processing.
@@ -1125,7 +2037,16 @@ def get_object_list(dbname):
     """
     Prepare object list based on descending number of objects.
     """
-    db = open_readonly_database(dbname)
+    object_counts = get_object_counts(dbname)
+    total = sum([y for (x, y) in object_counts])
+    return total, [x for (x, y) in object_counts]
+
+
+def get_object_counts(dbname, cached=False):
+    """
+    Return object types and counts sorted by descending number of objects.
+    """
+    db = acquire_database(dbname, cached=cached)
     object_list = [
         ("Person", db.get_number_of_people()),
         ("Family", db.get_number_of_families()),
@@ -1138,10 +2059,9 @@ def get_object_list(dbname):
         ("Note", db.get_number_of_notes()),
         ("Tag", db.get_number_of_tags()),
     ]
-    close_readonly_database(db)
+    release_database(db, cached=cached)
     object_list.sort(key=lambda x: x[1], reverse=True)
-    total = sum([y for (x, y) in object_list])
-    return total, [x for (x, y) in object_list]
+    return object_list
 
 
 def fold(one, two):
@@ -1157,62 +2077,89 @@ def fold(one, two):
                     one[key].update({subkey: two[key][subkey]})
 
 
-TASK_HANDLERS = {
-    "Person": examine_people,
-    "Family": examine_families,
-    "Event": examine_events,
-    "Place": examine_places,
-    "Media": examine_media,
-    "Source": examine_sources,
-    "Citation": examine_citations,
-    "Repository": examine_repositories,
-    "Note": examine_notes,
-    "Tag": examine_tags,
-}
+def build_facts(ledgers, bookmarks):
+    """
+    Fold the category summaries and the distributions into the facts
+    presented to the dashboard.
+    """
+    facts = {}
+    fold(facts, bookmarks)
+    for obj_type, ledger in ledgers.items():
+        fold(facts, summarize_category(obj_type, ledger))
+    fold(facts, summarize_distributions(ledgers))
+    return facts
 
 
-def gather_serial_statistics(args, obj_list, event=None):
+def gather_serial_statistics(args, obj_list, event=None, callback=None):
     """
-    Gather statistics using non-concurrent serial mode.
+    Gather statistics using non-concurrent serial mode, calling the callback
+    with the ledger for each category as it completes. The smaller
+    categories are examined first so their results are available sooner.
     """
-    facts = examine_bookmarks(args)
-    for obj_type in obj_list:
-        results = TASK_HANDLERS[obj_type](args, thread_event=event)
-        if event.is_set():
+    ledgers = {}
+    for obj_type in reversed(obj_list):
+        ledger = examine_objects(obj_type, args, thread_event=event)
+        if event and event.is_set():
             break
-        fold(facts, results)
-    return facts
+        ledgers[obj_type] = ledger
+        if callback:
+            callback(obj_type, ledger)
+    return ledgers
 
 
-def gather_concurrent_statistics(args, obj_list, event=None):
+def gather_concurrent_statistics(
+    args, obj_list, event=None, object_counts=None, callback=None
+):
     """
-    Gather statistics using multiprocessing mode.
+    Gather statistics using multiprocessing mode, splitting the larger
+    categories into shards when the object counts are known. The callback
+    is called with the ledger for each category as it completes.
     """
-    workers = {}
-    queues = {}
-    for obj_type in obj_list:
-        queues[obj_type] = Queue()
-        workers[obj_type] = Process(
-            target=TASK_HANDLERS[obj_type],
-            args=(args, queues[obj_type], event),
+    if object_counts:
+        tasks = plan_shards(
+            object_counts, args.get("workers") or os.cpu_count() or 1
         )
-        workers[obj_type].start()
-
-    facts = examine_bookmarks(args)
-    obj_list.reverse()
-    for obj_type in obj_list:
-        result_set = queues[obj_type].get()
-        workers[obj_type].join()
-        fold(facts, result_set)
-    return facts
+    else:
+        tasks = [(obj_type, None) for obj_type in obj_list]
+
+    queue = Queue()
+    workers = []
+    remaining = {}
+    for (obj_type, shard) in tasks:
+        worker = Process(
+            target=examine_objects,
+            args=(obj_type, args, queue, event, shard),
+        )
+        worker.start()
+        workers.append(worker)
+        remaining[obj_type] = remaining.get(obj_type, 0) + 1
+
+    ledgers = {}
+    for dummy_task in tasks:
+        (obj_type, ledger) = queue.get()
+        if obj_type in ledgers:
+            merge_ledgers(ledgers[obj_type], ledger)
+        else:
+            ledgers[obj_type] = ledger
+        remaining[obj_type] -= 1
+        if callback and remaining[obj_type] == 0:
+            if not event or not event.is_set():
+                callback(obj_type, ledgers[obj_type])
+    for worker in workers:
+        worker.join()
+    return ledgers
 
 
-def gather_statistics(args, event=None):
+def gather_statistics(args, event=None, callback=None):
     """
-    Gather tree statistics.
+    Gather tree statistics. If provided the callback is called as each
+    category completes with the category, its ledger, and the facts for
+    the categories completed so far.
     """
     try:
-        total, obj_list = get_object_list(args.get("tree_name"))
+        object_counts = get_object_counts(
+            args.get("tree_name"), cached=args.get("daemon")
+        )
     except TypeError:
         print(
             "Error: Problem finding and loading tree: %s"
@@ -1221,11 +2168,227 @@ def gather_statistics(args, event=None):
         )
         sys.exit(1)
 
+    total = sum([y for (x, y) in object_counts])
+    obj_list = [x for (x, y) in object_counts]
+
+    bookmarks = examine_bookmarks(args)
+    if "Person" in obj_list:
+        args = prepare_event_table(dict(args))
+
+    category_callback = None
+    if callback:
+        completed = {}
+
+        def category_callback(obj_type, ledger):
+            completed[obj_type] = ledger
+            callback(obj_type, ledger, build_facts(completed, bookmarks))
+
     if args.get("serial"):
-        facts = gather_serial_statistics(args, obj_list, event=event)
+        ledgers = gather_serial_statistics(
+            args, obj_list, event=event, callback=category_callback
+        )
     else:
-        facts = gather_concurrent_statistics(args, obj_list, event=event)
-    return total, facts
+        ledgers = gather_concurrent_statistics(
+            args,
+            obj_list,
+            event=event,
+            object_counts=object_counts,
+            callback=category_callback,
+        )
+    return total, build_facts(ledgers, bookmarks), ledgers
+
+
+def send_progress(writer, tree_name, completed, finished):
+    """
+    Periodically write a progress frame until the collection finishes, so
+    the reader can tell a long running collection from a stalled worker.
+    """
+    start_time = time.time()
+    while not finished.wait(PROGRESS_INTERVAL):
+        writer.write(
+            FRAME_PROGRESS,
+            {
+                "tree_name": tree_name,
+                "elapsed": time.time() - start_time,
+                "completed": list(completed),
+            },
+        )
+
+
+def daemon_collector(args, requests, cancel, writer):
+    """
+    Service collection requests one at a time. All database access in the
+    daemon happens in this thread so the connections kept open for each
+    tree are only ever used by the thread that opened them.
+
+    A partial frame with the ledger and facts so far is written as each
+    category completes, so the final result frame only holds the facts.
+    """
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        cancel.clear()
+        request_args = dict(args, **request)
+        tree_name = request_args.get("tree_name")
+        completed = []
+
+        def send_partial(obj_type, ledger, facts):
+            completed.append(obj_type)
+            writer.write(
+                FRAME_PARTIAL,
+                {
+                    "tree_name": tree_name,
+                    "category": obj_type,
+                    "ledger": ledger,
+                    "facts": facts,
+                },
+            )
+
+        finished = ThreadEvent()
+        progress = Thread(
+            target=send_progress,
+            args=(writer, tree_name, completed, finished),
+        )
+        progress.start()
+        try:
+            refresh_readonly_database(acquire_database(tree_name, cached=True))
+            if request_args.get("time"):
+                request_args["start_time"] = time.time()
+            dummy_total, facts, dummy_ledgers = gather_statistics(
+                request_args, event=cancel, callback=send_partial
+            )
+            if cancel.is_set():
+                frame = (FRAME_CANCELLED, {"tree_name": tree_name})
+            else:
+                frame = (
+                    FRAME_RESULT,
+                    {"tree_name": tree_name, "facts": facts},
+                )
+        except (SystemExit, TypeError):
+            # gather_statistics exits if the tree can not be loaded
+            frame = (
+                FRAME_ERROR,
+                {
+                    "tree_name": tree_name,
+                    "message": "Problem finding and loading tree",
+                },
+            )
+        finished.set()
+        progress.join()
+        writer.write(*frame)
+    close_cached_databases()
+
+
+def run_daemon(args):
+    """
+    Run as a long lived worker accepting commands on standard input, one
+    JSON object per line, and writing progress, partial and final frames
+    for each collection request to standard output.
+
+    {"command": "recollect", "tree_name": name} collects the statistics
+    for a tree, cancelling any collection in progress. Other keys, such as
+    "workers", override the daemon arguments for that collection.
+    {"command": "cancel"} cancels the collection in progress.
+    {"command": "quit"} exits, as does closing standard input.
+    """
+    args = dict(args, daemon=True, ledger=True)
+    # Keep the frame stream clean by sending anything else written to
+    # standard output on to standard error.
+    sys.stdout.flush()
+    writer = FrameWriter(os.fdopen(os.dup(sys.stdout.fileno()), "wb"))
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    # Worker processes close standard input when they start, which blocks
+    # while the command loop is waiting on it, so read from a copy.
+    commands = os.fdopen(os.dup(sys.stdin.fileno()), "r")
+    sys.stdin = open(os.devnull, "r")
+
+    requests = RequestQueue()
+    cancel = Event()
+    collector = Thread(
+        target=daemon_collector,
+        args=(args, requests, cancel, writer),
+    )
+    collector.start()
+
+    for line in commands:
+        try:
+            command = json.loads(line)
+        except ValueError:
+            print("Invalid command: %s" % line.strip(), file=sys.stderr)
+            continue
+        action = command.pop("command", None)
+        if action == "cancel":
+            cancel.set()
+        elif action == "recollect":
+            cancel.set()
+            requests.put(command)
+        elif action == "quit":
+            break
+
+    cancel.set()
+    requests.put(None)
+    collector.join()
+
+
+def check_parity(args):
+    """
+    Collect ledgers serially using both the object and raw paths and report
+    any object whose contribution differs. Returns the number of mismatches.
+    """
+    try:
+        object_counts = get_object_counts(args.get("tree_name"))
+    except TypeError:
+        print(
+            "Error: Problem finding and loading tree: %s"
+            % args.get("tree_name"),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    obj_list = [x for (x, y) in object_counts]
+    args = prepare_event_table(dict(args, ledger=True))
+    objects = gather_serial_statistics(dict(args, raw=False), obj_list)
+    raws = gather_serial_statistics(dict(args, raw=True), obj_list)
+
+    mismatches = 0
+    for obj_type in obj_list:
+        object_entries = objects[obj_type]["entries"]
+        raw_entries = raws[obj_type]["entries"]
+        for handle in set(object_entries) | set(raw_entries):
+            one = dict(object_entries.get(handle) or ())
+            two = dict(raw_entries.get(handle) or ())
+            if one != two:
+                mismatches += 1
+                print(
+                    "{0:<12} {1} object={2} raw={3}".format(
+                        obj_type, handle, one, two
+                    ),
+                    file=sys.stderr,
+                )
+        if objects[obj_type]["counters"] != raws[obj_type]["counters"]:
+            mismatches += 1
+            print(
+                "{0:<12} counters differ".format(obj_type), file=sys.stderr
+            )
+        names = set(objects[obj_type].get("samples") or {})
+        names.update(raws[obj_type].get("samples") or {})
+        for name in names:
+            rows = [
+                sorted(get_sample_rows(ledger, name))
+                for ledger in (objects[obj_type], raws[obj_type])
+            ]
+            if rows[0] != rows[1]:
+                mismatches += 1
+                print(
+                    "{0:<12} {1} samples differ".format(obj_type, name),
+                    file=sys.stderr,
+                )
+    print(
+        "Parity check found {0} mismatches".format(mismatches),
+        file=sys.stderr,
+    )
+    return mismatches
 
 
 def main():
@@ -1245,8 +2408,7 @@ def main():
         "-t",
         "--tree",
         dest="tree_name",
-        required=True,
-        help="Tree name",
+        help="Tree name, required unless running as a daemon",
     )
     parser.add_argument(
         "-T",
@@ -1264,6 +2426,46 @@ def main():
         action="store_true",
         help="Serial mode",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        default=0,
+        type=int,
+        help="Number of worker processes in concurrent mode",
+    )
+    parser.add_argument(
+        "-r",
+        "--raw",
+        dest="raw",
+        default=False,
+        action="store_true",
+        help="Examine serialized objects instead of full objects",
+    )
+    parser.add_argument(
+        "-p",
+        "--parity",
+        dest="parity",
+        default=False,
+        action="store_true",
+        help="Compare the raw and object results and report differences",
+    )
+    parser.add_argument(
+        "-d",
+        "--daemon",
+        dest="daemon",
+        default=False,
+        action="store_true",
+        help="Run as a daemon accepting commands on standard input",
+    )
+    parser.add_argument(
+        "-l",
+        "--ledger",
+        dest="ledger",
+        default=False,
+        action="store_true",
+        help="Include per object contribution ledgers in output",
+    )
     parser.add_argument(
         "-y",
         "--yaml",
@@ -1273,18 +2475,29 @@ def main():
         help="Dump statistics in YAML format if YAML support available",
     )
     parsed_args = parser.parse_args()
+    if not parsed_args.tree_name and not parsed_args.daemon:
+        parser.error("the following arguments are required: -t/--tree")
 
     args = {
         "all_events": parsed_args.all_events,
         "tree_name": parsed_args.tree_name,
         "time": parsed_args.time,
         "serial": parsed_args.serial,
+        "ledger": parsed_args.ledger,
+        "workers": parsed_args.workers,
+        "raw": parsed_args.raw,
     }
     if parsed_args.time:
         args["start_time"] = time.time()
         print("Run started", file=sys.stderr)
 
-    total, facts = gather_statistics(args)
+    if parsed_args.daemon:
+        run_daemon(args)
+        sys.exit(0)
+    if parsed_args.parity:
+        sys.exit(1 if check_parity(args) else 0)
+
+    total, facts, ledgers = gather_statistics(args)
 
     if parsed_args.yaml:
         try:
@@ -1294,13 +2507,16 @@ def main():
         except ModuleNotFoundError:
             print("YAML support not available", file=sys.stderr)
     else:
-        # https://stackoverflow.com/questions/38029058/sending-pickled-data-to-a-server
-        sys.stdout = io.TextIOWrapper(sys.stdout.detach(), encoding="latin-1")
-        print(pickle.dumps(facts).decode("latin-1"), end="", flush=True)
+        if parsed_args.ledger:
+            output = {"facts": facts, "ledgers": ledgers}
+        else:
+            output = facts
+        sys.stdout.flush()
+        FrameWriter(sys.stdout.buffer).write(FRAME_RESULT, output)
     if parsed_args.time:
         print(
             "{0:<12} {1:6} {2}".format(
-                "Run complete", total, time.time() - args.start_time
+                "Run complete", total, time.time() - args["start_time"]
             ),
             file=sys.stderr,
         )
@@ -30,6 +30,13 @@ StatusIndicatorService
 from gramps.gen.plug import BasePluginManager
 from gramps.gui.pluginmanager import GuiPluginManager
 
+# -------------------------------------------------------------------------
+#
+# Plugin Modules
+#
+# -------------------------------------------------------------------------
+from .service_profiler import ProfilerService
+
 
 # -------------------------------------------------------------------------
 #
@@ -106,8 +113,11 @@ class StatusIndicatorService:
         results = []
         obj_type = type(obj).__name__
         if obj_type in self.status_checks:
+            profiler = ProfilerService()
             for status_check in self.status_checks[obj_type]:
+                start = profiler.start()
                 status = status_check(grstate, obj, size)
+                profiler.stop(start, "status", status_check.__module__)
                 if status:
                     results = results + status
         return results
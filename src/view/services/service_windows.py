@@ -54,6 +54,7 @@ from gramps.gui.managedwindow import ManagedWindow
 #
 # -------------------------------------------------------------------------
 from view.groups.group_window import CardGroupWindow
+from view.services.service_signals import SignalCoalescerService
 from view.views.view_builder import view_builder
 
 _ = glocale.translation.sgettext
@@ -196,6 +197,9 @@ class WindowService:
         """
         self.group_windows = {}
         self.page_windows = {}
+        SignalCoalescerService().connect(
+            "changes-flushed", self.changes_flushed
+        )
 
     def launch_view_window(self, grstate, grcontext, hint=None):
         """
@@ -286,6 +290,12 @@ class WindowService:
         self.refresh_page_windows()
         self.refresh_group_windows()
 
+    def changes_flushed(self, *_dummy_args):
+        """
+        Refresh all the windows after a batch of database changes.
+        """
+        self.refresh_all_windows()
+
 
 def reload_single_window(windows, max_windows, *args):
     """
@@ -27,6 +27,7 @@ GrampsObjectView
 # Python Modules
 #
 # -------------------------------------------------------------------------
+import time
 from abc import abstractmethod
 
 # -------------------------------------------------------------------------
@@ -34,7 +35,7 @@ from abc import abstractmethod
 # GTK Modules
 #
 # -------------------------------------------------------------------------
-from gi.repository import Gtk
+from gi.repository import GLib, Gtk
 
 # -------------------------------------------------------------------------
 #
@@ -51,8 +52,15 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 # -------------------------------------------------------------------------
 from ..bars.bar_media import MediaBarGroup
 from ..common.common_const import GROUP_LABELS
-from ..common.common_utils import make_scrollable
-from ..groups.group_builder import group_builder
+from ..common.common_prefetch import can_prefetch, plan_page
+from ..common.common_utils import (
+    make_scrollable,
+    replace_widget,
+    set_style,
+)
+from ..groups.group_builder import get_group_count, group_builder
+from ..groups.group_expander import LazyCardGroup
+from ..services.service_prefetch import PrefetchService
 
 _ = glocale.translation.sgettext
 
@@ -77,6 +85,18 @@ class GrampsObjectView(Gtk.VBox):
         self.view_body = Gtk.HBox(vexpand=False)
         self.view_object = None
         self.view_focus = None
+        self.group_widgets = {}
+        self.dependencies = grstate.dependencies
+        if self.dependencies and self.dependencies.scope is None:
+            self.dependencies = None
+        self.stream_budget = 0
+        if self.dependencies is not None:
+            self.stream_budget = grstate.config.get("general.render-budget")
+        self.stream_queue = []
+        self.stream_request = None
+        self.stream_id = None
+        self.stream_cache = None
+        self.stream_generation = None
         self.render_view()
 
     def render_view(self):
@@ -146,20 +166,18 @@ class GrampsObjectView(Gtk.VBox):
         scheme = global_config.get("colors.scheme")
         background = self.grstate.config.get("display.focal-object-color")
         card = Gtk.Frame()
-        css = "".join(
-            (
-                ".frame { border: 0px; padding: 3px; ",
-                "background-image: none; background-color: ",
-                background[scheme],
-                "; }",
-            )
+        set_style(
+            card,
+            "".join(
+                (
+                    "border: 0px; padding: 3px; ",
+                    "background-image: none; background-color: ",
+                    background[scheme],
+                    ";",
+                )
+            ),
+            extra_class="frame",
         )
-        css = css.encode("utf-8")
-        provider = Gtk.CssProvider()
-        provider.load_from_data(css)
-        context = card.get_style_context()
-        context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-        context.add_class("frame")
         card.add(focal_widget)
         return card
 
@@ -181,14 +199,160 @@ class GrampsObjectView(Gtk.VBox):
         args = {"page_type": self.grcontext.page_type.lower()}
         if age_base:
             args["age_base"] = age_base
+        layout = self.grstate.config.get_space(space)
+        lazy = layout.tabbed
         object_groups = {}
         for group in groups:
-            if self.grstate.config.get("%s.%s.visible" % (space, group)):
+            if layout[group, "visible"]:
                 object_groups.update(
-                    {group: group_builder(self.grstate, group, obj, args)}
+                    {group: self.prepare_group(group, obj, args, lazy=lazy)}
                 )
         return object_groups
 
+    def prepare_group(self, group, obj, args, lazy=False):
+        """
+        Build a group, or if lazy a placeholder that builds it when first
+        shown, or if streaming a placeholder that is built once the page
+        is shown. Groups known to be empty are built at once so they are
+        left out as usual, as are groups on tabs that can not be counted
+        without building them so no empty tab is shown. A streamed group
+        that turns out to be empty hides its placeholder and column.
+        """
+        if lazy or self.stream_budget:
+            count = get_group_count(self.grstate, group, obj)
+            if count != 0 and not (lazy and count is None):
+                placeholder = LazyCardGroup(
+                    lambda: self.build_group(group, obj, args),
+                    count=count,
+                    on_map=lazy,
+                )
+                if not lazy:
+                    self.stream_queue.append(placeholder)
+                return placeholder
+        return self.build_group(group, obj, args)
+
+    def start_stream(self):
+        """
+        Start streaming in the groups not yet built. The objects they are
+        expected to show are read in the background first, then the groups
+        are built in chunks each taking about the time budget so the page
+        stays responsive.
+        """
+        self.stream_queue = [
+            placeholder
+            for placeholder in self.stream_queue
+            if placeholder.builder
+        ]
+        if not self.stream_queue or self.stream_request:
+            return
+        request = object()
+        self.stream_request = request
+        self.stream_generation = self.grstate.render_generation
+
+        def prefetch_ready(cache):
+            if self.stream_request is request:
+                self.begin_stream(cache)
+            return False
+
+        if not can_prefetch(self.grcontext):
+            prefetch_ready({})
+            return
+        primary = self.grcontext.primary_obj
+        PrefetchService(self.grstate).request(
+            plan_page(self.grstate.config, self.grcontext),
+            {(primary.obj_type, primary.obj.handle): primary.obj},
+            prefetch_ready,
+        )
+
+    def begin_stream(self, cache):
+        """
+        Schedule the groups to be built once the objects were read, unless
+        they changed meanwhile.
+        """
+        if self.stream_generation != self.grstate.render_generation:
+            cache = {}
+            self.stream_generation = self.grstate.render_generation
+        self.stream_cache = cache
+        self.stream_id = GLib.idle_add(self.stream_groups)
+
+    def stream_groups(self):
+        """
+        Build groups until the time budget is spent.
+        """
+        if self.stream_generation != self.grstate.render_generation:
+            self.stream_cache = {}
+            self.stream_generation = self.grstate.render_generation
+        start = time.time()
+        started = self.grstate.begin_render(self.stream_cache)
+        try:
+            while self.stream_queue:
+                self.stream_queue.pop(0).build_group()
+                if (time.time() - start) * 1000 >= self.stream_budget:
+                    break
+        finally:
+            if started:
+                self.grstate.end_render()
+        if self.stream_queue:
+            return True
+        self.stream_request = None
+        self.stream_id = None
+        self.stream_cache = None
+        return False
+
+    def stop_stream(self):
+        """
+        Stop streaming in groups, leaving the rest to be built if the view
+        is shown again.
+        """
+        if self.stream_id:
+            GLib.source_remove(self.stream_id)
+        self.stream_request = None
+        self.stream_id = None
+        self.stream_cache = None
+
+    def build_group(self, group, obj, args):
+        """
+        Build a group, recording the handles it depends on if this is the
+        page being rendered so it can be refreshed on its own. A group built
+        on its own is a render pass of its own.
+        """
+        dependencies = self.dependencies
+        started = self.grstate.begin_render()
+        previous = None
+        if dependencies is not None:
+            previous = dependencies.open_scope()
+        try:
+            widget = group_builder(self.grstate, group, obj, args)
+        finally:
+            if dependencies is not None:
+                handles = dependencies.close_scope(previous)
+            if started:
+                self.grstate.end_render()
+        if dependencies is None:
+            return widget
+        if widget:
+            self.group_widgets[group] = widget
+            dependencies.add_group(
+                group,
+                handles,
+                lambda: self.refresh_group(group, obj, args),
+            )
+        return widget
+
+    def refresh_group(self, group, obj, args):
+        """
+        Rebuild a group in place. Returns False if the group is not shown
+        or would be empty, as the page layout would then change.
+        """
+        old_widget = self.group_widgets.get(group)
+        if not old_widget or not old_widget.get_parent():
+            return False
+        new_widget = self.build_group(group, obj, args)
+        if not new_widget:
+            return False
+        replace_widget(old_widget, new_widget)
+        return True
+
     def render_group_view(self, obj_groups, space_override=None):
         """
         Identify format for the group view and call method to prepare it.
@@ -230,16 +394,21 @@ class GrampsObjectView(Gtk.VBox):
                 widget.pack_start(mediabar, False, False, 0)
 
 
-def add_to_title(title, group):
+def add_to_title(title, group, widget=None):
     """
-    Add group label to title.
+    Add group label to title, with the number of items if known before
+    the group is built.
     """
+    label = GROUP_LABELS[group]
+    count = getattr(widget, "count", None)
+    if count is not None:
+        label = "%s (%s)" % (label, count)
     if not title:
-        title = GROUP_LABELS[group]
+        title = label
     else:
         if " & " in title:
             title = title.replace(" &", ",")
-        title = "%s & %s" % (title, GROUP_LABELS[group])
+        title = "%s & %s" % (title, label)
     return title
 
 
@@ -263,6 +432,7 @@ def prepare_untabbed_groups(obj_groups, groupings, scrolled):
     Generate the untabbed full page view for the groups.
     """
     container = Gtk.HBox(spacing=3, hexpand=True, vexpand=False)
+    container.group_container = True
     for grouping in groupings:
         if len(grouping) == 1:
             pack_container(container, scrolled, obj_groups[grouping[0]])
@@ -284,14 +454,18 @@ def prepare_tabbed_groups(obj_groups, groupings, scrolled):
     for grouping in groupings:
         title = ""
         if len(grouping) == 1:
-            label = Gtk.Label(label=add_to_title(title, grouping[0]))
+            label = Gtk.Label(
+                label=add_to_title(
+                    title, grouping[0], obj_groups[grouping[0]]
+                )
+            )
             notebook.append_page(
                 make_scrollable(obj_groups[grouping[0]]), tab_label=label
             )
         else:
             box = Gtk.HBox(spacing=3, vexpand=False)
             for group in grouping:
-                title = add_to_title(title, group)
+                title = add_to_title(title, group, obj_groups[group])
                 pack_container(box, scrolled, obj_groups[group])
             label = Gtk.Label(label=title)
             notebook.append_page(
@@ -29,6 +29,7 @@ GrampsObjectView factory and builder functions
 # -------------------------------------------------------------------------
 from ..common.common_exceptions import FactoryException
 from .view_attribute import AttributeObjectView
+from .view_changes import ChangesObjectView
 from .view_citation import CitationObjectView
 from .view_event import EventObjectView
 from .view_family import FamilyObjectView
@@ -78,6 +79,8 @@ def view_factory(grcontext, hint=None):
         cls = TagObjectView
     elif hint == "Statistics":
         cls = StatisticsObjectView
+    elif hint == "Changes":
+        cls = ChangesObjectView
     else:
         raise FactoryException(
             "Attempt to create unknown ObjectView class: "
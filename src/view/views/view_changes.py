@@ -62,7 +62,8 @@ from gramps.gui.views.tags import EditTag
 #
 # -------------------------------------------------------------------------
 from .view_base import GrampsObjectView
-from ..services.service_statistics import StatisticsService
+from ..common.common_utils import set_style
+from ..services.service_changes import ChangeHistoryService
 
 try:
     _trans = glocale.get_addon_translator(__file__)
@@ -125,8 +126,11 @@ class ChangesObjectView(GrampsObjectView):
 
     def __init__(self, grstate, grcontext):
         GrampsObjectView.__init__(self, grstate, grcontext)
-        self.change_service = StatisticsService(grstate)
-        self.change_service.connect("changes-updated", self.load_data)
+        self.change_service = ChangeHistoryService(grstate)
+        self.callback_id = self.change_service.connect(
+            "changes-updated", self.load_data
+        )
+        self.connect("destroy", self.cb_destroy)
         self.change_history = {}
         self.stack = None
         self.stack_state = None
@@ -140,6 +144,13 @@ class ChangesObjectView(GrampsObjectView):
         """
         self.view_body = Gtk.Box()
 
+    def cb_destroy(self, *_dummy_args):
+        """
+        Disconnect from the change history service so the view can be
+        freed.
+        """
+        self.change_service.disconnect(self.callback_id)
+
     def load_data(self, *_dummy_args):
         """
         Fetch record change history and render.
@@ -429,12 +440,13 @@ class LastChangedView(Gtk.Bin):
     Render the graphical view.
     """
 
-    __slots__ = "uistate", "callback", "widgets"
+    __slots__ = "uistate", "callback", "widgets", "style_class"
 
     def __init__(self, uistate):
         Gtk.Bin.__init__(self)
         self.uistate = uistate
         self.callback = None
+        self.style_class = None
         self.widgets = LastChangedWidgets()
         self.__build_layout(self.widgets)
         self.widgets.events.connect("button-press-event", self.clicked)
@@ -473,18 +485,12 @@ class LastChangedView(Gtk.Bin):
         """
         Adjust the frame styling.
         """
-        css = "".join(
-            (
-                ".frame { border: solid; border-radius: 5px; border-width: ",
-                str(border),
-                "px; }",
-            )
-        ).encode("utf-8")
-        provider = Gtk.CssProvider()
-        provider.load_from_data(css)
-        context = self.widgets.frame.get_style_context()
-        context.add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_USER)
-        context.add_class("frame")
+        self.style_class = set_style(
+            self.widgets.frame,
+            "border: solid; border-radius: 5px; border-width: %spx;" % border,
+            self.style_class,
+            extra_class="frame",
+        )
 
     def connect(self, callback):
         """
@@ -53,8 +53,8 @@ class CitationObjectView(GrampsObjectView):
             age_base = citation.obj.get_date_object()
 
         if citation.obj.source_handle:
-            source = self.grstate.dbstate.db.get_source_from_handle(
-                citation.obj.source_handle
+            source = self.grstate.fetch(
+                "Source", citation.obj.source_handle
             )
             groptions = GrampsOptions("active.source")
             source_card = CARD_MAP["Source"](self.grstate, groptions, source)
@@ -108,9 +108,7 @@ class FamilyObjectView(GrampsObjectView):
         if person:
             primary_handle = person.get_main_parents_family_handle()
             if primary_handle:
-                family = self.grstate.dbstate.db.get_family_from_handle(
-                    primary_handle
-                )
+                family = self.grstate.fetch("Family", primary_handle)
                 groptions = GrampsOptions(
                     "active.parent", size_groups=size_groups
                 )
@@ -55,9 +55,7 @@ class PersonObjectView(GrampsObjectView):
         age_base = None
         birth_ref = person.get_birth_ref()
         if birth_ref is not None:
-            event = self.grstate.dbstate.db.get_event_from_handle(
-                birth_ref.ref
-            )
+            event = self.grstate.fetch("Event", birth_ref.ref)
             if event:
                 age_base = event.get_date_object()
 
@@ -79,9 +77,7 @@ class PersonObjectView(GrampsObjectView):
         """
         primary_handle = person.get_main_parents_family_handle()
         if primary_handle:
-            family = self.grstate.dbstate.db.get_family_from_handle(
-                primary_handle
-            )
+            family = self.grstate.fetch("Family", primary_handle)
             groptions = GrampsOptions("active.parent")
             groptions.set_relation(person)
             groptions.set_vertical(False)